@@ -0,0 +1 @@
+"""Single-deployment entry point mounting several function packages."""
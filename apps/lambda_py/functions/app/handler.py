@@ -0,0 +1,42 @@
+"""Single-deployment ("lambdalith") Lambda entry point.
+
+Mounts the HTTP handlers of several functions behind one route table so
+their traffic shares a pool of warm containers. Mounted handlers are
+imported on their first request; each keeps its own powertools decorators.
+The functions packaged alongside this entry point are listed under
+``bundle`` in ``deploy-config.json``.
+"""
+
+from typing import Any, Dict
+
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from shared.router import Router
+from shared.snapstart import register_warmup
+from shared.warmup import warmup_handler
+
+router = Router()
+router.mount("functions.hello.handler.handler", [("GET", "/hello")])
+router.mount("functions.leaderboard.handler.handler", [("GET", "/leaderboard")])
+router.mount("functions.history.handler.handler", [("GET", "/games/{gameId}/replay")])
+router.mount(
+    "functions.user.handler.handler",
+    [("POST", "/users"), ("GET", "/users"), ("GET", "/users/{userId}")],
+)
+
+register_warmup(router.preload)
+
+
+@warmup_handler
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Route an API Gateway event to the mounted function handler.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    return router.dispatch(event, context)
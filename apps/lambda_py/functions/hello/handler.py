@@ -1,19 +1,28 @@
 """Hello World Lambda function."""
 
+from datetime import datetime
 from typing import Any, Dict
 
-from aws_lambda_powertools import Logger, Metrics, Tracer
+from aws_lambda_powertools import Metrics, Tracer
 from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from shared.logs import buffered_logging, create_logger
 from shared.utils import create_response
+from shared.warmup import mark, warmup_handler
 
-logger = Logger(service="hello-lambda")
+mark("imports")
+
+logger = create_logger("hello-lambda")
 tracer = Tracer(service="hello-lambda")
 metrics = Metrics(namespace="GuanDanOS", service="hello-lambda")
 
+mark("clients")
+
 
+@warmup_handler
 @logger.inject_lambda_context
+@buffered_logging(logger)
 @tracer.capture_lambda_handler
 @metrics.log_metrics(capture_cold_start_metric=True)
 def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
@@ -44,7 +53,7 @@ def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
         200,
         {
             "message": message,
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(),
             "requestId": context.request_id,
         },
     )
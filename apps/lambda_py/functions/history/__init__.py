@@ -0,0 +1 @@
+"""Game history Lambda function package."""
@@ -0,0 +1,180 @@
+"""Game history Lambda function.
+
+Archives completed games delivered through SQS and serves
+``GET /games/{gameId}/replay`` from the archive.
+
+Each SQS message body is a game serialized with
+:func:`shared.history.game_to_dict`. The games of one invocation are
+written together as one S3 object (split at 8 MiB), so the queue's batch
+size and batching window control how many games share a write. Games
+that fail validation would fail again, so they are logged and dropped;
+if the write itself fails, every record in the batch is reported for
+retry.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import BotoCoreError, ClientError
+
+from shared.history import (
+    GameArchiver,
+    GameHistory,
+    GameLog,
+    GameNotFoundError,
+    game_from_dict,
+)
+from shared.logs import buffered_logging, create_logger
+from shared.router import Router
+from shared.utils import create_response
+from shared.warmup import mark, warmup_handler
+
+mark("imports")
+
+logger = create_logger("history-lambda")
+tracer = Tracer(service="history-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="history-lambda")
+
+history = GameHistory()
+
+mark("clients")
+
+router = Router()
+
+
+@tracer.capture_method
+def archive_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Archive the games in a batch of SQS records as one object.
+
+    Args:
+        records: SQS records
+
+    Returns:
+        Partial batch response with ``batchItemFailures``
+    """
+    games: List[GameLog] = []
+    message_ids: List[str] = []
+    rejected = 0
+
+    for record in records:
+        try:
+            games.append(game_from_dict(json.loads(record.get("body") or "")))
+            message_ids.append(record["messageId"])
+        except ValueError as e:
+            rejected += 1
+            logger.warning(
+                "Rejected game record",
+                extra={"message_id": record.get("messageId"), "error": str(e)},
+            )
+
+    # A batch larger than the archiver's limit is split over several objects
+    archiver = GameArchiver()
+    failed: List[str] = []
+    keys: List[Optional[str]] = []
+    try:
+        for game in games:
+            keys.append(archiver.add(game))
+        keys.append(archiver.flush())
+    except (BotoCoreError, ClientError):
+        logger.exception("Archive write failed", extra={"games": len(message_ids)})
+        failed = message_ids
+
+    archived = len(message_ids) - len(failed)
+    metrics.add_metric(name="GamesArchived", unit=MetricUnit.Count, value=archived)
+    if rejected:
+        metrics.add_metric(name="GamesRejected", unit=MetricUnit.Count, value=rejected)
+    logger.info(
+        "Archived game batch",
+        extra={
+            "archive_keys": [k for k in keys if k],
+            "archived": archived,
+            "rejected": rejected,
+        },
+    )
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed]}
+
+
+@router.route("GET", "/games/{gameId}/replay")
+def replay_game(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle GET /games/{gameId}/replay?hand=&move=.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    game_id = (event.get("pathParameters") or {}).get("gameId")
+    if not game_id:
+        return create_response(400, {"error": "Missing gameId parameter"})
+    params = event.get("queryStringParameters") or {}
+
+    try:
+        hand = int(params.get("hand") or 0)
+        move = int(params["move"]) if params.get("move") else None
+    except ValueError:
+        return create_response(400, {"error": "Invalid hand or move"})
+
+    try:
+        state = history.replay(game_id, hand, move)
+    except GameNotFoundError:
+        return create_response(404, {"error": "Game not found"})
+    except ValueError as e:
+        return create_response(400, {"error": str(e)})
+
+    last_play = state.last_play
+    return create_response(
+        200,
+        {
+            "gameId": game_id,
+            "hand": state.hand,
+            "move": state.move,
+            "turn": state.turn,
+            "handCounts": list(state.hand_counts),
+            "cards": [list(cards) for cards in state.cards],
+            "finished": state.finished,
+            "lastPlay": (
+                {"seat": last_play.seat, "cards": list(last_play.cards)} if last_play else None
+            ),
+        },
+        event=event,
+        etag=True,
+        cache_control="public, max-age=86400, immutable",
+    )
+
+
+@warmup_handler
+@logger.inject_lambda_context
+@buffered_logging(logger)
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Game history Lambda handler for the archive queue and replay API.
+
+    Args:
+        event: SQS event or API Gateway event
+        context: Lambda context
+
+    Returns:
+        Partial batch response or API Gateway response
+    """
+    if "Records" in event:
+        return archive_records(event["Records"])
+
+    try:
+        return router.dispatch(event, context)
+    except Exception:
+        logger.exception("Error processing request")
+        metrics.add_metric(name="HistoryErrors", unit=MetricUnit.Count, value=1)
+        return create_response(
+            500,
+            {"error": "Internal server error", "requestId": context.aws_request_id},
+        )
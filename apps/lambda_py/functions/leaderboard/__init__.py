@@ -0,0 +1 @@
+"""Leaderboard Lambda function package."""
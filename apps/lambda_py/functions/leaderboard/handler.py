@@ -0,0 +1,182 @@
+"""Leaderboard Lambda function.
+
+Consumes the Rooms table's DynamoDB stream (``NEW_AND_OLD_IMAGES``) and
+serves ``GET /leaderboard`` from the materialized top-N item.
+
+A settled hand is recognized by a changed ``last_result`` attribute on the
+room::
+
+    {"hand_id": "...", "season": "...", "region": "...", "scores": {"<user_id>": 3, ...}}
+
+Each new result is added to the players' sharded counters once; afterwards
+every board touched by the batch is rewritten once with the players' new
+totals.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from boto3.dynamodb.types import TypeDeserializer
+
+from shared.leaderboard import DEFAULT_REGION, DEFAULT_SEASON, Leaderboard
+from shared.logs import buffered_logging, create_logger
+from shared.router import Router
+from shared.utils import create_response
+from shared.warmup import mark, warmup_handler
+
+mark("imports")
+
+logger = create_logger("leaderboard-lambda")
+tracer = Tracer(service="leaderboard-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="leaderboard-lambda")
+
+leaderboard = Leaderboard()
+deserializer = TypeDeserializer()
+
+mark("clients")
+
+router = Router()
+
+
+def _image(record: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """Deserialize a stream record image."""
+    image = (record.get("dynamodb") or {}).get(name) or {}
+    return {key: deserializer.deserialize(value) for key, value in image.items()}
+
+
+def extract_result(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the newly settled hand from a Rooms stream record.
+
+    Args:
+        record: DynamoDB stream record
+
+    Returns:
+        The new ``last_result``, or None if the record did not settle a hand
+    """
+    if record.get("eventName") not in ("INSERT", "MODIFY"):
+        return None
+
+    new_result: Optional[Dict[str, Any]] = _image(record, "NewImage").get("last_result")
+    if not new_result or not new_result.get("hand_id"):
+        return None
+
+    old_result = _image(record, "OldImage").get("last_result") or {}
+    if old_result.get("hand_id") == new_result["hand_id"]:
+        return None
+    return new_result
+
+
+@tracer.capture_method
+def process_stream(records: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Apply settled hands to counters and refresh the affected boards.
+
+    Args:
+        records: DynamoDB stream records
+
+    Returns:
+        Counts of hands recorded and duplicates skipped
+    """
+    touched: Dict[Tuple[str, str], Set[str]] = {}
+    recorded = duplicates = 0
+
+    for record in records:
+        result = extract_result(record)
+        if result is None:
+            continue
+
+        season = result.get("season") or DEFAULT_SEASON
+        region = result.get("region") or DEFAULT_REGION
+        scores = {user_id: int(points) for user_id, points in (result.get("scores") or {}).items()}
+
+        if leaderboard.record_hand(result["hand_id"], season, region, scores):
+            recorded += 1
+        else:
+            duplicates += 1
+        # Refresh the board for duplicates too, in case a previous attempt
+        # recorded the hand but failed before updating the board.
+        touched.setdefault((season, region), set()).update(scores)
+
+    for (season, region), user_ids in touched.items():
+        totals = leaderboard.player_totals(season, region, user_ids)
+        leaderboard.update_board(season, region, totals)
+
+    return {"recorded": recorded, "duplicates": duplicates, "boards": len(touched)}
+
+
+@router.route("GET", "/leaderboard")
+def get_leaderboard(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle GET /leaderboard.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    params = event.get("queryStringParameters") or {}
+    season = params.get("season") or DEFAULT_SEASON
+    region = params.get("region") or DEFAULT_REGION
+
+    try:
+        limit = int(params.get("limit") or leaderboard.size)
+    except ValueError:
+        return create_response(400, {"error": "Invalid limit"})
+
+    board = leaderboard.get_board(season, region)
+    entries = (board or {}).get("entries", [])[: max(0, limit)]
+    version = int(board["version"]) if board else 0
+
+    return create_response(
+        200,
+        {
+            "season": season,
+            "region": region,
+            "version": version,
+            "entries": [
+                {"rank": rank, "userId": e["user_id"], "score": int(e["score"])}
+                for rank, e in enumerate(entries, start=1)
+            ],
+        },
+        event=event,
+        etag=f"{season}-{region}-{version}-{limit}",
+        cache_control="public, max-age=10",
+    )
+
+
+@warmup_handler
+@logger.inject_lambda_context
+@buffered_logging(logger)
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Leaderboard Lambda handler for the Rooms stream and GET /leaderboard.
+
+    Args:
+        event: DynamoDB stream event or API Gateway event
+        context: Lambda context
+
+    Returns:
+        Stream processing summary or API Gateway response
+    """
+    if "Records" in event:
+        summary = process_stream(event["Records"])
+        metrics.add_metric(name="HandsRecorded", unit=MetricUnit.Count, value=summary["recorded"])
+        logger.info("Processed stream batch", extra=summary)
+        return summary
+
+    try:
+        return router.dispatch(event, context)
+    except Exception:
+        logger.exception("Error processing request")
+        metrics.add_metric(name="LeaderboardErrors", unit=MetricUnit.Count, value=1)
+        return create_response(
+            500,
+            {"error": "Internal server error", "requestId": context.aws_request_id},
+        )
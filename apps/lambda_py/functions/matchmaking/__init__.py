@@ -0,0 +1 @@
+"""Matchmaking Lambda function package."""
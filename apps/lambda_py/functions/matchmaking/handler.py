@@ -0,0 +1,329 @@
+"""Matchmaking Lambda function.
+
+HTTP routes put players in and out of the queue:
+
+* ``POST /matchmaking``: queue the caller (``skill``, ``latencyMs``)
+* ``GET /matchmaking/{userId}``: ticket status and matched ``roomId``
+* ``DELETE /matchmaking/{userId}``: leave the queue
+
+Rooms are formed by ticks: a ``rate(1 minute)`` EventBridge rule invokes
+the function with the constant input ``{"tick": true}`` and it runs a tick
+every ``MATCH_TICK_SECONDS`` for ``MATCH_RUN_SECONDS``. Each tick loads the
+tickets queued since the previous one into the in-memory
+:class:`shared.matchmaking.MatchQueue`, forms every room it can and commits
+the rooms concurrently. Set reserved concurrency to 1 for the tick rule's
+target alias so one container owns the in-memory queue; a second one
+would only lose its commits to the ticket conditions.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import BotoCoreError, ClientError
+from pydantic import BaseModel, Field, ValidationError
+
+from shared.auth import require_auth
+from shared.logs import buffered_logging, create_logger
+from shared.matchmaking import MatchmakingStore, MatchQueue, Ticket
+from shared.router import Router
+from shared.utils import create_response, parse_body
+from shared.warmup import mark, warmup_handler
+
+mark("imports")
+
+logger = create_logger("matchmaking-lambda")
+tracer = Tracer(service="matchmaking-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="matchmaking-lambda")
+
+store = MatchmakingStore()
+queue = MatchQueue(
+    skill_width=int(os.environ.get("MATCH_SKILL_BUCKET", "100")),
+    latency_width=int(os.environ.get("MATCH_LATENCY_BUCKET_MS", "50")),
+    widen_seconds=float(os.environ.get("MATCH_WIDEN_SECONDS", "10")),
+)
+# Epoch milliseconds of the newest ticket loaded into ``queue``
+_watermark = 0
+
+TICK_SECONDS = float(os.environ.get("MATCH_TICK_SECONDS", "2"))
+RUN_SECONDS = float(os.environ.get("MATCH_RUN_SECONDS", "55"))
+SAFETY_MARGIN_MS = 3000
+WATERMARK_OVERLAP_MS = 1000
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MATCH_MAX_WORKERS", "16")),
+    thread_name_prefix="matchmaking",
+)
+
+mark("clients")
+
+router = Router()
+
+
+class MatchRequest(BaseModel):
+    """Matchmaking request model."""
+
+    user_id: Optional[str] = Field(default=None, alias="userId")
+    skill: int = Field(default=1000, ge=0)
+    latency_ms: int = Field(default=0, ge=0, le=10_000, alias="latencyMs")
+
+
+def caller_id(event: Dict[str, Any], requested: Optional[str]) -> Optional[str]:
+    """
+    Player a request acts for.
+
+    With verified claims this is the token's ``sub``, and a request naming
+    another player is refused. Without claims (``AUTH_REQUIRED`` off) the
+    requested ID is used as is.
+
+    Args:
+        event: API Gateway event
+        requested: User ID from the path or body
+
+    Returns:
+        User ID, or None if neither is present
+
+    Raises:
+        PermissionError: If ``requested`` is not the verified caller
+    """
+    claims = ((event.get("requestContext") or {}).get("authorizer") or {}).get("claims") or {}
+    subject = claims.get("sub")
+    if subject and requested and requested != subject:
+        raise PermissionError(f"Caller {subject} cannot act for {requested}")
+    return subject or requested
+
+
+def path_user(event: Dict[str, Any]) -> Optional[str]:
+    """``userId`` path parameter checked against the caller (see :func:`caller_id`)."""
+    requested = (event.get("pathParameters") or {}).get("userId")
+    return caller_id(event, requested) if requested else None
+
+
+@router.route("POST", "/matchmaking")
+@require_auth()
+def enqueue(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle POST /matchmaking.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    try:
+        request = MatchRequest(**(parse_body(event) or {}))
+    except ValidationError as e:
+        return create_response(400, {"error": "Validation error", "details": e.errors()})
+
+    try:
+        user_id = caller_id(event, request.user_id)
+    except PermissionError:
+        return create_response(403, {"error": "Forbidden"})
+    if not user_id:
+        return create_response(400, {"error": "Missing userId"})
+
+    store.enqueue(Ticket(user_id, request.skill, request.latency_ms, time.time()))
+    metrics.add_metric(name="PlayersQueued", unit=MetricUnit.Count, value=1)
+    return create_response(202, {"userId": user_id, "status": "queued"})
+
+
+@router.route("GET", "/matchmaking/{userId}")
+@require_auth()
+def get_ticket(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle GET /matchmaking/{userId}.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    try:
+        user_id = path_user(event)
+    except PermissionError:
+        return create_response(403, {"error": "Forbidden"})
+    item = store.get(user_id) if user_id else None
+    if item is None:
+        return create_response(404, {"error": "Not queued"})
+
+    waited = max(0.0, time.time() - int(item["enqueued_at"]) / 1000)
+    return create_response(
+        200,
+        {
+            "userId": user_id,
+            "status": item["status"],
+            "roomId": item.get("room_id"),
+            "waitedSeconds": round(waited, 1),
+        },
+    )
+
+
+@router.route("DELETE", "/matchmaking/{userId}")
+@require_auth()
+def leave_queue(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle DELETE /matchmaking/{userId}.
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    try:
+        user_id = path_user(event)
+    except PermissionError:
+        return create_response(403, {"error": "Forbidden"})
+    if not user_id or not store.cancel(user_id):
+        return create_response(409, {"error": "Not queued"})
+    return create_response(200, {"userId": user_id, "status": "cancelled"})
+
+
+def refresh_queue() -> int:
+    """
+    Load tickets queued since the last refresh.
+
+    Returns:
+        Number of tickets read
+    """
+    global _watermark
+    # Re-read the last second: a ticket written after the previous query can
+    # carry an older timestamp than the newest one it returned
+    tickets = store.load_since(max(0, _watermark - WATERMARK_OVERLAP_MS))
+    for ticket in tickets:
+        queue.add(ticket)
+        _watermark = max(_watermark, round(ticket.enqueued_at * 1000))
+    return len(tickets)
+
+
+def commit_room(tickets: List[Ticket], now: float) -> Tuple[Optional[str], List[str]]:
+    """
+    Commit one room, reporting a failed write as an uncommitted room.
+
+    Args:
+        tickets: The room's tickets, anchor first
+        now: Epoch seconds
+
+    Returns:
+        ``(room_id, gone)`` as from :meth:`MatchmakingStore.commit_room`;
+        ``(None, [])`` when the write failed, so every player waits again
+    """
+    try:
+        return store.commit_room(tickets, now)
+    except (BotoCoreError, ClientError):
+        logger.exception(
+            "Room commit failed", extra={"user_ids": [t.user_id for t in tickets]}
+        )
+        return None, []
+
+
+@tracer.capture_method
+def run_tick(now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Load new tickets, form rooms and commit them.
+
+    Args:
+        now: Epoch seconds (defaults to the current time)
+
+    Returns:
+        Counts of tickets ``loaded``, ``rooms`` created, room commits that
+        ``failed``, players ``gone`` from the queue and players still
+        ``waiting``
+    """
+    now = time.time() if now is None else now
+    loaded = refresh_queue()
+    rooms = queue.tick(now)
+
+    created = failed = gone = 0
+    for tickets, (room_id, missing) in zip(
+        rooms, _executor.map(lambda tickets: commit_room(tickets, now), rooms)
+    ):
+        if room_id:
+            created += 1
+            continue
+        # Players who left or re-queued are dropped; the rest wait for the next
+        # tick (all of them when the write itself failed)
+        if not missing:
+            failed += 1
+        gone += len(missing)
+        for ticket in tickets:
+            if ticket.user_id not in missing:
+                queue.add(ticket)
+
+    return {
+        "loaded": loaded,
+        "rooms": created,
+        "failed": failed,
+        "gone": gone,
+        "waiting": len(queue),
+    }
+
+
+def run_ticks(run_seconds: float, context: LambdaContext) -> Dict[str, Any]:
+    """
+    Tick every ``TICK_SECONDS`` until the run time or invocation budget ends.
+
+    Args:
+        run_seconds: Seconds to keep ticking
+        context: Lambda context
+
+    Returns:
+        Totals over all ticks
+    """
+    budget = (context.get_remaining_time_in_millis() - SAFETY_MARGIN_MS) / 1000
+    stop_at = time.time() + min(run_seconds, budget)
+    totals: Dict[str, Any] = {"ticks": 0, "loaded": 0, "rooms": 0, "failed": 0, "gone": 0}
+
+    while True:
+        started = time.time()
+        summary = run_tick(started)
+        totals["ticks"] += 1
+        for name in ("loaded", "rooms", "failed", "gone"):
+            totals[name] += summary[name]
+        totals["waiting"] = summary["waiting"]
+
+        next_tick = started + TICK_SECONDS
+        if next_tick >= stop_at:
+            return totals
+        time.sleep(max(0.0, next_tick - time.time()))
+
+
+@warmup_handler
+@logger.inject_lambda_context
+@buffered_logging(logger)
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Matchmaking Lambda handler for the tick rule and the queue API.
+
+    Args:
+        event: ``{"tick": true}`` (optionally ``runSeconds``) or API Gateway event
+        context: Lambda context
+
+    Returns:
+        Tick totals or API Gateway response
+    """
+    if event.get("tick"):
+        totals = run_ticks(float(event.get("runSeconds", RUN_SECONDS)), context)
+        metrics.add_metric(name="RoomsMatched", unit=MetricUnit.Count, value=totals["rooms"])
+        logger.info("Matchmaking run complete", extra=totals)
+        return totals
+
+    try:
+        return router.dispatch(event, context)
+    except Exception:
+        logger.exception("Error processing request")
+        metrics.add_metric(name="MatchmakingErrors", unit=MetricUnit.Count, value=1)
+        return create_response(
+            500,
+            {"error": "Internal server error", "requestId": context.aws_request_id},
+        )
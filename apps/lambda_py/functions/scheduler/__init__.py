@@ -0,0 +1 @@
+"""Room timeout scheduler Lambda function package."""
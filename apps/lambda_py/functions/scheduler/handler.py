@@ -0,0 +1,288 @@
+"""Room timeout scheduler Lambda function.
+
+Invoked once a minute by an EventBridge schedule, it sweeps the timer wheel
+in :mod:`shared.timers` every second for ``SCHEDULER_RUN_SECONDS`` and fires
+every due deadline in bulk:
+
+* ``turn``: the seat to play is auto-passed and the turn moves to the next
+  seat that still holds cards (``PLAYER_AUTO_PASSED``)
+* ``ai_fill``: an empty seat in a waiting room is given an AI player
+  (``AI_JOINED``)
+
+Claimed timers are grouped by room and applied with one optimistic-
+concurrency write per room through :class:`shared.game_store.GameStore`.
+Timers whose room has moved on (another turn, a real player took the seat)
+are ignored. Follow-up timers are scheduled in one batch and events are
+broadcast to the room when ``WEBSOCKET_ENDPOINT`` is set.
+
+The function is not wrapped in ``warmup_handler``: its trigger is itself a
+scheduled event, and running every minute keeps it warm.
+
+Room attributes used::
+
+    status       WAITING | PLAYING | ...
+    seats        four player maps, or null for an empty seat
+    turn         seat to play
+    turn_id      increases with every turn; a turn timer's token
+    finished     seats that have played out their cards, in order
+"""
+
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import BotoCoreError, ClientError
+
+from functions.ws import handler as ws
+from shared.deal import NUM_PLAYERS
+from shared.game_store import GameStore, RoomNotFoundError, VersionConflictError
+from shared.logs import create_logger
+from shared.timers import KIND_AI_FILL, KIND_TURN, Timer, TimerWheel, turn_timer
+from shared.warmup import mark
+
+mark("imports")
+
+logger = create_logger("scheduler-lambda")
+tracer = Tracer(service="scheduler-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="scheduler-lambda")
+
+store = GameStore()
+wheel = TimerWheel()
+
+RUN_SECONDS = int(os.environ.get("SCHEDULER_RUN_SECONDS", "55"))
+# Time kept in reserve at the end of an invocation
+SAFETY_MARGIN_MS = 3000
+RETRY_DELAY_SECONDS = 1
+MAX_ROOM_WORKERS = int(os.environ.get("SCHEDULER_MAX_WORKERS", "16"))
+_executor = ThreadPoolExecutor(max_workers=MAX_ROOM_WORKERS, thread_name_prefix="scheduler")
+
+AI_AVATARS = 6
+
+mark("clients")
+
+
+class _StaleTimersError(Exception):
+    """Raised from a room mutation when none of its timers still apply."""
+
+
+def next_seat(seat: int, finished: List[int]) -> Optional[int]:
+    """
+    Find the next seat clockwise that still holds cards.
+
+    Args:
+        seat: Current seat
+        finished: Seats that have played out
+
+    Returns:
+        Next seat, or None if no other seat holds cards
+    """
+    for step in range(1, NUM_PLAYERS):
+        candidate = (seat + step) % NUM_PLAYERS
+        if candidate not in finished:
+            return candidate
+    return None
+
+
+def ai_player(seat: int) -> Dict[str, Any]:
+    """
+    Generate an AI player for a seat.
+
+    Args:
+        seat: Seat the AI takes
+
+    Returns:
+        Player map
+    """
+    return {
+        "user_id": f"ai-{uuid.uuid4()}",
+        "nickname": f"AI玩家{seat + 1}",
+        "level": random.randint(8, 18),
+        "coins": random.randint(50_000, 200_000),
+        "avatar": random.randint(1, AI_AVATARS),
+        "is_ai": True,
+        "ready": True,
+    }
+
+
+def apply_timeouts(
+    room: Dict[str, Any],
+    timers: List[Timer],
+    now: float,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Timer]]:
+    """
+    Apply fired timers to a room.
+
+    Args:
+        room: Current room item
+        timers: Claimed timers for the room
+        now: Epoch seconds
+
+    Returns:
+        Updated room, events to broadcast and follow-up timers
+    """
+    room_id = room["room_id"]
+    events: List[Dict[str, Any]] = []
+    follow_ups: List[Timer] = []
+
+    for timer in sorted(timers, key=lambda t: (t.kind, t.seat or 0)):
+        if timer.kind == KIND_TURN:
+            if room.get("status") != "PLAYING" or int(room.get("turn_id", -1)) != timer.token:
+                continue
+            seat = int(room["turn"])
+            upcoming = next_seat(seat, [int(s) for s in room.get("finished", [])])
+            if upcoming is None:
+                continue
+            turn_id = timer.token + 1
+            room.update(
+                turn=upcoming,
+                turn_id=turn_id,
+                turn_started_at=int(now),
+                last_action={"type": "AUTO_PASS", "seat": seat},
+            )
+            events.append(
+                {
+                    "type": "PLAYER_AUTO_PASSED",
+                    "roomId": room_id,
+                    "seat": seat,
+                    "turn": upcoming,
+                    "turnId": turn_id,
+                }
+            )
+            follow_ups.append(turn_timer(room_id, turn_id, now))
+
+        elif timer.kind == KIND_AI_FILL:
+            seats = list(room.get("seats") or [None] * NUM_PLAYERS)
+            if room.get("status") != "WAITING" or timer.seat is None or seats[timer.seat]:
+                continue
+            player = ai_player(timer.seat)
+            seats[timer.seat] = player
+            room["seats"] = seats
+            events.append(
+                {"type": "AI_JOINED", "roomId": room_id, "seat": timer.seat, "player": player}
+            )
+
+    return room, events, follow_ups
+
+
+def fire_room(room_id: str, timers: List[Timer], now: float) -> Dict[str, Any]:
+    """
+    Apply a room's fired timers with one versioned write.
+
+    Args:
+        room_id: Room ID
+        timers: Claimed timers for the room
+        now: Epoch seconds
+
+    Returns:
+        Events and follow-up timers from the successful write (none if
+        every timer was stale)
+    """
+    outcome: Dict[str, Any] = {}
+
+    def mutate(room: Dict[str, Any]) -> Dict[str, Any]:
+        updated, outcome["events"], outcome["follow_ups"] = apply_timeouts(room, timers, now)
+        if not outcome["events"]:
+            raise _StaleTimersError()
+        return updated
+
+    try:
+        store.update_room(room_id, mutate)
+    except _StaleTimersError:
+        pass
+    return outcome
+
+
+@tracer.capture_method
+def run_sweep(now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Claim and fire every due timer once.
+
+    Args:
+        now: Epoch seconds (defaults to the current time)
+
+    Returns:
+        Counts of timers ``claimed``, ``fired`` and ``retried``
+    """
+    now = time.time() if now is None else now
+    claimed = wheel.sweep(now)
+
+    by_room: Dict[str, List[Timer]] = {}
+    for timer in claimed:
+        by_room.setdefault(timer.room_id, []).append(timer)
+
+    futures = {
+        room_id: _executor.submit(fire_room, room_id, timers, now)
+        for room_id, timers in by_room.items()
+    }
+
+    follow_ups: List[Timer] = []
+    retries: List[Timer] = []
+    events: List[Dict[str, Any]] = []
+    for room_id, future in futures.items():
+        try:
+            outcome = future.result()
+        except RoomNotFoundError:
+            logger.warning("Timer for missing room", extra={"room_id": room_id})
+            continue
+        except (VersionConflictError, BotoCoreError, ClientError):
+            logger.exception("Room timeout failed", extra={"room_id": room_id})
+            retries.extend(
+                Timer(t.room_id, t.kind, int(now) + RETRY_DELAY_SECONDS, t.token, t.seat)
+                for t in by_room[room_id]
+            )
+            continue
+        events.extend(outcome["events"])
+        follow_ups.extend(outcome["follow_ups"])
+
+    if follow_ups or retries:
+        wheel.schedule_many(follow_ups + retries)
+
+    endpoint_url = os.environ.get("WEBSOCKET_ENDPOINT")
+    if endpoint_url:
+        for event in events:
+            ws.broadcast(event["roomId"], event, endpoint_url)
+
+    return {"claimed": len(claimed), "fired": len(events), "retried": len(retries)}
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Scheduler Lambda handler: sweep the timer wheel once per second.
+
+    Args:
+        event: EventBridge scheduled event (``runSeconds`` overrides the run time)
+        context: Lambda context
+
+    Returns:
+        Totals over all sweeps
+    """
+    run_seconds = float(event.get("runSeconds", RUN_SECONDS))
+    budget = (context.get_remaining_time_in_millis() - SAFETY_MARGIN_MS) / 1000
+    stop_at = time.time() + min(run_seconds, budget)
+
+    totals = {"sweeps": 0, "claimed": 0, "fired": 0, "retried": 0}
+    while True:
+        summary = run_sweep()
+        totals["sweeps"] += 1
+        for name, value in summary.items():
+            totals[name] += value
+
+        next_tick = int(time.time()) + 1
+        if next_tick >= stop_at:
+            break
+        time.sleep(max(0.0, next_tick - time.time()))
+
+    metrics.add_metric(name="TimeoutsFired", unit=MetricUnit.Count, value=totals["fired"])
+    if totals["retried"]:
+        metrics.add_metric(name="TimeoutsRetried", unit=MetricUnit.Count, value=totals["retried"])
+    logger.info("Scheduler run complete", extra=totals)
+    return totals
@@ -5,26 +5,35 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-import boto3
-from aws_lambda_powertools import Logger, Metrics, Tracer
+from aws_lambda_powertools import Metrics, Tracer
 from aws_lambda_powertools.metrics import MetricUnit
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from pydantic import BaseModel, EmailStr, ValidationError
 
+from shared import aws
+from shared.auth import require_auth
+from shared.logs import buffered_logging, create_logger
+from shared.memprofile import memory_profile
+from shared.ratelimit import rate_limit
+from shared.router import Router
+from shared.snapstart import register_warmup
 from shared.utils import create_response, parse_body
+from shared.warmup import mark, warmup_handler
 
-logger = Logger(service="user-lambda")
+mark("imports")
+
+logger = create_logger("user-lambda")
 tracer = Tracer(service="user-lambda")
 metrics = Metrics(namespace="GuanDanOS", service="user-lambda")
 
 # Initialize DynamoDB
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=os.environ.get("AWS_REGION", "us-east-1"),
-    endpoint_url=os.environ.get("LOCALSTACK_ENDPOINT"),
-)
-table_name = os.environ.get("USERS_TABLE_NAME", "Users")
-table = dynamodb.Table(table_name)
+dynamodb = aws.dynamodb()
+profile_cache_control = os.environ.get("USER_CACHE_CONTROL", "private, no-cache")
+_tables: Dict[str, Any] = {}
+
+mark("clients")
+
+router = Router()
 
 
 class UserCreate(BaseModel):
@@ -41,28 +50,70 @@ class User(BaseModel):
     username: str
     email: EmailStr
     created_at: str
+    # Settlement counters (shared.settlement), incremented with ADD
+    rank: int = 0
+    coins: int = 0
 
 
-@tracer.capture_method
-def create_user(username: str, email: str) -> User:
+def get_table() -> Any:
     """
-    Create a new user in DynamoDB.
+    Get the users table named by ``USERS_TABLE_NAME``.
+
+    The name is read on every call so tests can point the function at
+    another table; Table objects are cached per name.
+
+    Returns:
+        DynamoDB Table resource
+    """
+    name = os.environ.get("USERS_TABLE_NAME", "Users")
+    table = _tables.get(name)
+    if table is None:
+        table = _tables[name] = dynamodb.Table(name)
+    return table
+
+
+@register_warmup
+def warm_models() -> None:
+    """Build the pydantic validators (including email) before a SnapStart snapshot."""
+    user = UserCreate(username="warmup", email="warmup@example.com")
+    User(user_id="warmup", created_at="", **user.model_dump()).model_dump()
+
+
+def build_user(username: str, email: str, user_id: Optional[str] = None) -> User:
+    """
+    Build a new user record without storing it.
     
     Args:
         username: User's username
         email: User's email
+        user_id: Fixed user ID (a random one is generated if omitted)
         
     Returns:
-        Created user
+        User to store
     """
-    user = User(
-        user_id=str(uuid.uuid4()),
+    return User(
+        user_id=user_id or str(uuid.uuid4()),
         username=username,
         email=email,
         created_at=datetime.now().isoformat(),
     )
+
+
+@tracer.capture_method
+def create_user(username: str, email: str) -> User:
+    """
+    Create a new user in DynamoDB.
     
-    table.put_item(Item=user.model_dump())
+    Args:
+        username: User's username
+        email: User's email
+        
+    Returns:
+        Created user
+    """
+    user = build_user(username, email)
+    
+    get_table().put_item(Item=user.model_dump())
     logger.info("User created", extra={"user_id": user.user_id})
     
     return user
@@ -79,7 +130,7 @@ def get_user(user_id: str) -> Optional[User]:
     Returns:
         User or None if not found
     """
-    response = table.get_item(Key={"user_id": user_id})
+    response = get_table().get_item(Key={"user_id": user_id})
     item = response.get("Item")
     
     if not item:
@@ -89,7 +140,75 @@ def get_user(user_id: str) -> Optional[User]:
     return User(**item)
 
 
+@router.route("POST", "/users")
+@require_auth()
+@rate_limit()
+def post_user(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle POST /users.
+    
+    Args:
+        event: API Gateway event
+        context: Lambda context
+        
+    Returns:
+        API Gateway response
+    """
+    body = parse_body(event)
+    if not body:
+        return create_response(400, {"error": "Invalid request body"})
+    
+    try:
+        user_create = UserCreate(**body)
+    except ValidationError as e:
+        return create_response(400, {"error": "Validation error", "details": e.errors()})
+    
+    user = create_user(user_create.username, user_create.email)
+    metrics.add_metric(name="UserCreated", unit=MetricUnit.Count, value=1)
+    
+    return create_response(201, user.model_dump())
+
+
+@router.route("GET", "/users")
+@router.route("GET", "/users/{userId}")
+@require_auth()
+def get_user_by_id(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    Handle GET /users/{userId}.
+    
+    Args:
+        event: API Gateway event
+        context: Lambda context
+        
+    Returns:
+        API Gateway response
+    """
+    path_params = event.get("pathParameters") or {}
+    user_id = path_params.get("userId")
+    
+    if not user_id:
+        return create_response(400, {"error": "Missing userId parameter"})
+    
+    user = get_user(user_id)
+    
+    if not user:
+        metrics.add_metric(name="UserNotFound", unit=MetricUnit.Count, value=1)
+        return create_response(404, {"error": "User not found"})
+    
+    metrics.add_metric(name="UserRetrieved", unit=MetricUnit.Count, value=1)
+    return create_response(
+        200,
+        user.model_dump(),
+        event=event,
+        etag=True,
+        cache_control=profile_cache_control,
+    )
+
+
+@warmup_handler
 @logger.inject_lambda_context
+@memory_profile(logger)
+@buffered_logging(logger)
 @tracer.capture_lambda_handler
 @metrics.log_metrics(capture_cold_start_metric=True)
 def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
@@ -107,42 +226,8 @@ def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     logger.info("Processing user request", extra={"method": method, "path": event.get("path")})
     
     try:
-        if method == "POST":
-            # Create user
-            body = parse_body(event)
-            if not body:
-                return create_response(400, {"error": "Invalid request body"})
-            
-            try:
-                user_create = UserCreate(**body)
-            except ValidationError as e:
-                return create_response(400, {"error": "Validation error", "details": e.errors()})
-            
-            user = create_user(user_create.username, user_create.email)
-            metrics.add_metric(name="UserCreated", unit=MetricUnit.Count, value=1)
-            
-            return create_response(201, user.model_dump())
-            
-        elif method == "GET":
-            # Get user
-            path_params = event.get("pathParameters") or {}
-            user_id = path_params.get("userId")
-            
-            if not user_id:
-                return create_response(400, {"error": "Missing userId parameter"})
-            
-            user = get_user(user_id)
-            
-            if not user:
-                metrics.add_metric(name="UserNotFound", unit=MetricUnit.Count, value=1)
-                return create_response(404, {"error": "User not found"})
-            
-            metrics.add_metric(name="UserRetrieved", unit=MetricUnit.Count, value=1)
-            return create_response(200, user.model_dump())
-            
-        else:
-            return create_response(405, {"error": "Method not allowed"})
-            
+        return router.dispatch(event, context)
+    
     except Exception as e:
         logger.exception("Error processing request")
         metrics.add_metric(name="UserErrors", unit=MetricUnit.Count, value=1)
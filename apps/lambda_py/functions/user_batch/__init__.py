@@ -0,0 +1 @@
+"""User batch Lambda function package."""
@@ -0,0 +1,176 @@
+"""SQS-triggered bulk user provisioning Lambda function.
+
+Each SQS message body is a ``POST /users`` request body (``username`` and
+``email``). Records are validated with the user function's ``UserCreate``
+model, and the valid users are written concurrently with one conditional
+``PutItem`` each (``BatchWriteItem`` cannot carry conditions). The response
+lists ``batchItemFailures`` so SQS retries only the records whose write
+failed; records that fail validation would fail again, so they are logged
+and dropped instead.
+
+User IDs are derived from the SQS message ID and each put requires
+``attribute_not_exists(user_id)``, so a redelivered message finds its user
+already stored and counts as done (a duplicate, not a new user) instead
+of overwriting fields (rank, coins) the user has gained since.
+"""
+
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from botocore.exceptions import BotoCoreError, ClientError
+from pydantic import ValidationError
+
+from functions.user import handler as user
+from shared.logs import create_logger
+from shared.warmup import mark, warmup_handler
+
+mark("imports")
+
+logger = create_logger("user-batch-lambda")
+tracer = Tracer(service="user-batch-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="user-batch-lambda")
+
+MAX_WRITE_WORKERS = int(os.environ.get("BATCH_WRITE_MAX_WORKERS", "16"))
+_executor = ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS, thread_name_prefix="user-batch")
+
+# write_user outcomes
+CREATED = "created"
+DUPLICATE = "duplicate"
+FAILED = "failed"
+
+# Namespace for user IDs derived from SQS message IDs
+USER_ID_NAMESPACE = uuid.UUID("0b6c3f5e-6a4d-4a63-9a57-2f1f0c1e8d21")
+
+mark("clients")
+
+
+def parse_record(record: Dict[str, Any]) -> user.User:
+    """
+    Validate one SQS record into a user ready to store.
+
+    Args:
+        record: SQS record
+
+    Returns:
+        User keyed by the record's message ID
+
+    Raises:
+        ValueError: If the body is not valid JSON or fails validation
+    """
+    try:
+        body = json.loads(record.get("body") or "")
+    except json.JSONDecodeError as e:
+        raise ValueError("Invalid JSON body") from e
+    if not isinstance(body, dict):
+        raise ValueError("Body must be a JSON object")
+
+    try:
+        user_create = user.UserCreate(**body)
+    except ValidationError as e:
+        raise ValueError(str(e)) from e
+
+    user_id = str(uuid.uuid5(USER_ID_NAMESPACE, record["messageId"]))
+    return user.build_user(user_create.username, user_create.email, user_id=user_id)
+
+
+def write_user(record: Tuple[str, user.User]) -> str:
+    """
+    Store one user unless it already exists.
+
+    Args:
+        record: (message ID, user) pair
+
+    Returns:
+        ``CREATED``, ``DUPLICATE`` if an earlier delivery stored the user,
+        or ``FAILED``
+    """
+    message_id, item = record
+    try:
+        user.get_table().put_item(
+            Item=item.model_dump(),
+            ConditionExpression="attribute_not_exists(user_id)",
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            # Stored by an earlier delivery of this message
+            logger.info("User already exists", extra={"user_id": item.user_id})
+            return DUPLICATE
+        logger.exception("User write failed", extra={"message_id": message_id})
+        return FAILED
+    except BotoCoreError:
+        logger.exception("User write failed", extra={"message_id": message_id})
+        return FAILED
+    return CREATED
+
+
+@tracer.capture_method
+def process_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validate and store a batch of records.
+
+    Args:
+        records: SQS records
+
+    Returns:
+        Partial batch response with ``batchItemFailures``
+    """
+    valid: List[Tuple[str, user.User]] = []
+    rejected = 0
+
+    for record in records:
+        try:
+            valid.append((record["messageId"], parse_record(record)))
+        except ValueError as e:
+            rejected += 1
+            logger.warning(
+                "Rejected user record",
+                extra={"message_id": record.get("messageId"), "error": str(e)},
+            )
+
+    outcomes = list(_executor.map(write_user, valid))
+    failed = [message_id for (message_id, _), outcome in zip(valid, outcomes) if outcome == FAILED]
+    created = outcomes.count(CREATED)
+    duplicates = outcomes.count(DUPLICATE)
+
+    metrics.add_metric(name="UserCreated", unit=MetricUnit.Count, value=created)
+    if duplicates:
+        metrics.add_metric(name="UserImportDuplicate", unit=MetricUnit.Count, value=duplicates)
+    if rejected:
+        metrics.add_metric(name="UserImportRejected", unit=MetricUnit.Count, value=rejected)
+    if failed:
+        metrics.add_metric(name="UserImportFailed", unit=MetricUnit.Count, value=len(failed))
+    logger.info(
+        "Processed user batch",
+        extra={
+            "users_created": created,
+            "duplicates": duplicates,
+            "rejected": rejected,
+            "failed": len(failed),
+        },
+    )
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed]}
+
+
+@warmup_handler
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    SQS batch handler for bulk user creation.
+
+    Args:
+        event: SQS event
+        context: Lambda context
+
+    Returns:
+        Partial batch response
+    """
+    return process_records(event.get("Records") or [])
@@ -0,0 +1 @@
+"""WebSocket Lambda function package."""
@@ -0,0 +1,324 @@
+"""WebSocket connection and broadcast Lambda function."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+from aws_lambda_powertools import Metrics, Tracer
+from aws_lambda_powertools.metrics import MetricUnit
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from shared import aws
+from shared.deal import NUM_PLAYERS
+from shared.logs import buffered_logging, create_logger
+from shared.snapstart import register_client, register_warmup
+from shared.utils import create_response, parse_body
+from shared.warmup import mark, warmup_handler
+
+mark("imports")
+
+logger = create_logger("ws-lambda")
+tracer = Tracer(service="ws-lambda")
+metrics = Metrics(namespace="GuanDanOS", service="ws-lambda")
+
+# Initialize DynamoDB
+dynamodb = aws.dynamodb()
+table_name = os.environ.get("CONNECTIONS_TABLE_NAME", "Connections")
+table = dynamodb.Table(table_name)
+room_index_name = os.environ.get("CONNECTIONS_ROOM_INDEX", "room_id-index")
+
+# Bounded pool shared by every broadcast in this container. Management API
+# clients are thread-safe and sized to the pool so posts never queue on
+# the HTTP connection pool.
+MAX_BROADCAST_WORKERS = int(os.environ.get("BROADCAST_MAX_WORKERS", "16"))
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_BROADCAST_WORKERS, thread_name_prefix="ws-broadcast"
+)
+_management_clients: Dict[str, Any] = {}
+
+mark("clients")
+
+ROLE_PLAYER = "player"
+ROLE_SPECTATOR = "spectator"
+
+
+def get_management_client(endpoint_url: str) -> Any:
+    """
+    Get the cached API Gateway management client for an endpoint.
+
+    Args:
+        endpoint_url: WebSocket API callback URL (https://{domain}/{stage})
+
+    Returns:
+        apigatewaymanagementapi client
+    """
+    client = _management_clients.get(endpoint_url)
+    if client is None:
+        client = boto3.client(
+            "apigatewaymanagementapi",
+            endpoint_url=endpoint_url,
+            region_name=os.environ.get("AWS_REGION", "us-east-1"),
+            config=Config(max_pool_connections=MAX_BROADCAST_WORKERS),
+        )
+        _management_clients[endpoint_url] = register_client(client)
+    return client
+
+
+@register_warmup
+def warm_management_client() -> None:
+    """Create the management client ahead of the first broadcast when the endpoint is known."""
+    endpoint_url = os.environ.get("WEBSOCKET_ENDPOINT")
+    if endpoint_url:
+        get_management_client(endpoint_url)
+
+
+def get_callback_url(event: Dict[str, Any]) -> str:
+    """
+    Resolve the management API endpoint for a WebSocket event.
+
+    Args:
+        event: API Gateway WebSocket event
+
+    Returns:
+        Callback URL, preferring the WEBSOCKET_ENDPOINT override
+    """
+    override = os.environ.get("WEBSOCKET_ENDPOINT")
+    if override:
+        return override
+
+    request_context = event.get("requestContext") or {}
+    return f"https://{request_context.get('domainName')}/{request_context.get('stage')}"
+
+
+def parse_seat(value: Optional[str]) -> Optional[int]:
+    """
+    Parse the ``seat`` query parameter.
+
+    Args:
+        value: Raw parameter, absent for spectators
+
+    Returns:
+        Seat index, or None for spectators
+
+    Raises:
+        ValueError: If the seat is not an index of the table
+    """
+    if value is None:
+        return None
+    try:
+        seat = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid seat: {value!r}") from None
+    if not 0 <= seat < NUM_PLAYERS:
+        raise ValueError(f"Seat must be between 0 and {NUM_PLAYERS - 1}")
+    return seat
+
+
+@tracer.capture_method
+def get_connection(connection_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a stored connection.
+
+    Args:
+        connection_id: API Gateway connection ID
+
+    Returns:
+        Connection item, or None if it is not stored
+    """
+    response = table.get_item(Key={"connection_id": connection_id})
+    item: Optional[Dict[str, Any]] = response.get("Item")
+    return item
+
+
+@tracer.capture_method
+def add_connection(connection_id: str, room_id: str, role: str, seat: Optional[int]) -> None:
+    """
+    Store a connection for a room.
+
+    Args:
+        connection_id: API Gateway connection ID
+        room_id: Room the connection belongs to
+        role: ``player`` or ``spectator``
+        seat: Seat index for players
+    """
+    item: Dict[str, Any] = {
+        "connection_id": connection_id,
+        "room_id": room_id,
+        "role": role,
+        "connected_at": datetime.now().isoformat(),
+    }
+    if seat is not None:
+        item["seat"] = seat
+
+    table.put_item(Item=item)
+    logger.info("Connection stored", extra={"connection_id": connection_id, "room_id": room_id})
+
+
+@tracer.capture_method
+def remove_connections(connection_ids: List[str]) -> None:
+    """
+    Delete connections in one batched write.
+
+    Args:
+        connection_ids: Connection IDs to delete
+    """
+    if not connection_ids:
+        return
+
+    with table.batch_writer() as batch:
+        for connection_id in connection_ids:
+            batch.delete_item(Key={"connection_id": connection_id})
+
+
+@tracer.capture_method
+def get_room_connections(room_id: str) -> List[str]:
+    """
+    List the connection IDs of every seat and spectator in a room.
+
+    Args:
+        room_id: Room ID
+
+    Returns:
+        Connection IDs
+    """
+    query: Dict[str, Any] = {
+        "IndexName": room_index_name,
+        "KeyConditionExpression": Key("room_id").eq(room_id),
+        "ProjectionExpression": "connection_id",
+    }
+    connection_ids: List[str] = []
+
+    while True:
+        response = table.query(**query)
+        connection_ids.extend(item["connection_id"] for item in response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return connection_ids
+        query["ExclusiveStartKey"] = last_key
+
+
+def _post(client: Any, connection_id: str, data: bytes) -> Tuple[str, Optional[str]]:
+    """Post to one connection, returning the error code on failure."""
+    try:
+        client.post_to_connection(ConnectionId=connection_id, Data=data)
+        return connection_id, None
+    except ClientError as e:
+        return connection_id, e.response.get("Error", {}).get("Code", "ClientError")
+
+
+@tracer.capture_method
+def broadcast(room_id: str, payload: Any, endpoint_url: str) -> Dict[str, int]:
+    """
+    Send a payload to every connection in a room concurrently.
+
+    The payload is serialized once and posted over the shared thread pool.
+    Connections that API Gateway reports as gone are pruned in one batch.
+
+    Args:
+        room_id: Room ID
+        payload: JSON-serializable message, or pre-encoded bytes
+        endpoint_url: Management API callback URL
+
+    Returns:
+        Counts of ``sent``, ``gone`` and ``failed`` posts
+    """
+    connection_ids = get_room_connections(room_id)
+    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    client = get_management_client(endpoint_url)
+
+    futures = [_executor.submit(_post, client, cid, data) for cid in connection_ids]
+    gone: List[str] = []
+    failed = 0
+
+    for future in futures:
+        connection_id, error = future.result()
+        if error == "GoneException":
+            gone.append(connection_id)
+        elif error:
+            failed += 1
+            logger.warning(
+                "Broadcast post failed",
+                extra={"connection_id": connection_id, "error": error},
+            )
+
+    remove_connections(gone)
+
+    result = {"sent": len(connection_ids) - len(gone) - failed, "gone": len(gone), "failed": failed}
+    logger.info("Broadcast complete", extra={"room_id": room_id, **result})
+    return result
+
+
+@warmup_handler
+@logger.inject_lambda_context
+@buffered_logging(logger)
+@tracer.capture_lambda_handler
+@metrics.log_metrics(capture_cold_start_metric=True)
+def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
+    """
+    WebSocket Lambda handler for $connect, $disconnect and message routes.
+
+    Args:
+        event: API Gateway WebSocket event
+        context: Lambda context
+
+    Returns:
+        API Gateway response
+    """
+    request_context = event.get("requestContext") or {}
+    route_key = request_context.get("routeKey")
+    connection_id = request_context.get("connectionId", "")
+    logger.info("Processing websocket event", extra={"route": route_key})
+
+    try:
+        if route_key == "$connect":
+            query_params = event.get("queryStringParameters") or {}
+            room_id = query_params.get("roomId")
+            if not room_id:
+                return create_response(400, {"error": "Missing roomId parameter"})
+
+            try:
+                seat = parse_seat(query_params.get("seat"))
+            except ValueError as e:
+                return create_response(400, {"error": str(e)})
+            role = ROLE_PLAYER if seat is not None else ROLE_SPECTATOR
+            add_connection(connection_id, room_id, role, seat)
+            metrics.add_metric(name="WebSocketConnected", unit=MetricUnit.Count, value=1)
+            return create_response(200, {"connected": True})
+
+        elif route_key == "$disconnect":
+            remove_connections([connection_id])
+            metrics.add_metric(name="WebSocketDisconnected", unit=MetricUnit.Count, value=1)
+            return create_response(200, {"disconnected": True})
+
+        else:
+            body = parse_body(event)
+            if not body or body.get("action") != "broadcast" or not body.get("roomId"):
+                return create_response(400, {"error": "Invalid message"})
+
+            # Clients may only push to the room they are seated in; server-side
+            # code calls broadcast() directly
+            sender = get_connection(connection_id)
+            if (
+                not sender
+                or sender.get("role") != ROLE_PLAYER
+                or sender.get("room_id") != body["roomId"]
+            ):
+                return create_response(403, {"error": "Not seated in this room"})
+
+            result = broadcast(body["roomId"], body.get("state"), get_callback_url(event))
+            metrics.add_metric(name="BroadcastPosts", unit=MetricUnit.Count, value=result["sent"])
+            return create_response(200, result)
+
+    except Exception:
+        logger.exception("Error processing websocket event")
+        metrics.add_metric(name="WebSocketErrors", unit=MetricUnit.Count, value=1)
+        return create_response(
+            500,
+            {"error": "Internal server error", "requestId": context.aws_request_id},
+        )
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Contention benchmark for the optimistic-concurrency game store (moto)."""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import boto3  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+from shared.game_store import GameStore  # noqa: E402
+
+
+def create_rooms_table() -> None:
+    """Create the Rooms table in the mocked account."""
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    dynamodb.create_table(
+        TableName="Rooms",
+        KeySchema=[{"AttributeName": "room_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "room_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def run(threads: int, updates: int, rooms: int) -> None:
+    """
+    Hammer ``rooms`` rooms with ``threads`` concurrent writers.
+
+    Args:
+        threads: Number of writer threads
+        updates: Updates per thread
+        rooms: Number of rooms the writers spread over
+    """
+    create_rooms_table()
+    store = GameStore(rooms_table_name="Rooms", max_attempts=100)
+    for i in range(rooms):
+        store.create_room(f"room-{i}", {"counter": 0})
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        room_id = f"room-{index % rooms}"
+        local: list[float] = []
+        for _ in range(updates):
+            start = time.perf_counter()
+            store.update_room(room_id, lambda room: {**room, "counter": room["counter"] + 1})
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(int(store.get_room(f"room-{i}")["counter"]) for i in range(rooms))
+    latencies.sort()
+
+    print(f"📊 {threads} threads x {updates} updates over {rooms} room(s)\n")
+    print(f"   committed      {total} / {threads * updates}")
+    print(f"   conflicts      {store.conflicts}")
+    print(f"   throughput     {total / elapsed:.1f} updates/s")
+    print(f"   latency p50    {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"   latency p99    {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark versioned room updates")
+    parser.add_argument("--threads", type=int, default=5, help="Concurrent writers")
+    parser.add_argument("--updates", type=int, default=50, help="Updates per writer")
+    parser.add_argument("--rooms", type=int, default=1, help="Rooms to spread writers over")
+    args = parser.parse_args()
+
+    with mock_aws():
+        run(args.threads, args.updates, args.rooms)
+
+
+if __name__ == "__main__":
+    main()
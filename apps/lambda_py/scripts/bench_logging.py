@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark per-request logging overhead of the handler logging setups."""
+
+import argparse
+import io
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.logs import buffered_logging, create_logger  # noqa: E402
+
+
+def make_handler(name: str, buffered: bool, sample_rate: float = 0.0, status: int = 200):
+    """
+    Build a handler logging like the user handler does on each request.
+
+    Args:
+        name: Logger service name (one logger per variant)
+        buffered: Wrap with :func:`buffered_logging`
+        sample_rate: Detail sample rate for the buffered variant
+        status: Status code the handler returns
+
+    Returns:
+        (handler, output stream)
+    """
+    stream = io.StringIO()
+    logger = create_logger(name, stream=stream)
+
+    def handler(event, context):
+        logger.info("Processing user request", extra={"method": "GET", "path": event["path"]})
+        logger.info("User retrieved", extra={"user_id": "5f0c6d2e-8f7a-4c1b-9d52-3a7e1c0b2f44"})
+        return {"statusCode": status}
+
+    if buffered:
+        handler = buffered_logging(logger, slow_ms=1000, sample_rate=sample_rate)(handler)
+    return handler, stream
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark logging overhead per request")
+    parser.add_argument("--number", type=int, default=20000, help="Requests per timing")
+    args = parser.parse_args()
+
+    event = {"httpMethod": "GET", "path": "/users/5f0c6d2e"}
+    variants = {
+        "unbuffered": make_handler("bench-plain", buffered=False),
+        "buffered, discarded": make_handler("bench-buffered", buffered=True),
+        "buffered, 1% sampled": make_handler("bench-sampled", buffered=True, sample_rate=0.01),
+        "buffered, 5xx flush": make_handler("bench-flush", buffered=True, status=500),
+    }
+
+    print(f"📊 Logging overhead, 2 INFO lines per request ({args.number} requests)\n")
+    print(f"   {'variant':<24}{'per request':>12}{'bytes/req':>11}")
+    for name, (handler, stream) in variants.items():
+        seconds = timeit.timeit(lambda: handler(event, None), number=args.number)
+        written = len(stream.getvalue()) / args.number
+        print(f"   {name:<24}{seconds / args.number * 1e6:>9.2f} µs{written:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
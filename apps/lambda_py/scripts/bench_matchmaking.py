@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Matchmaking simulation: match rate, wait time and match quality per widening policy.
+
+Runs the in-memory :class:`shared.matchmaking.MatchQueue` on simulated time.
+A backlog of ``--players`` is queued at t=0 and more arrive at
+``--arrival-rate`` per second; every ``--tick`` seconds the queue forms
+rooms. Each policy row replays the same arrivals.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.matchmaking import MatchQueue, Ticket  # noqa: E402
+
+# Typical round trips to the nearest region, in milliseconds
+LATENCY_TIERS = [20, 35, 60, 90, 140, 220]
+
+
+def arrivals(players: int, rate: float, duration: float, seed: int) -> List[Ticket]:
+    """Backlog at t=0 followed by Poisson arrivals, in arrival order."""
+    rng = random.Random(seed)
+
+    def ticket(user: int, at: float) -> Ticket:
+        skill = max(0, int(rng.gauss(1500, 300)))
+        latency = int(rng.choice(LATENCY_TIERS) * rng.uniform(0.8, 1.25))
+        return Ticket(user_id=f"p{user}", skill=skill, latency_ms=latency, enqueued_at=at)
+
+    tickets = [ticket(i, 0.0) for i in range(players)]
+    at = 0.0
+    while rate > 0:
+        at += rng.expovariate(rate)
+        if at >= duration:
+            break
+        tickets.append(ticket(len(tickets), at))
+    return tickets
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def simulate(
+    tickets: List[Ticket],
+    duration: float,
+    tick: float,
+    widen_seconds: Optional[float],
+) -> Dict[str, float]:
+    """Run one policy over the arrivals."""
+    queue = MatchQueue(
+        widen_seconds=widen_seconds or 1.0,
+        max_widen=5 if widen_seconds else 0,
+    )
+    waits: List[float] = []
+    spreads: List[float] = []
+    tick_ms: List[float] = []
+    peak = 0
+    pending = iter(tickets)
+    upcoming = next(pending, None)
+
+    now = 0.0
+    while now <= duration:
+        while upcoming is not None and upcoming.enqueued_at <= now:
+            queue.add(upcoming)
+            upcoming = next(pending, None)
+        peak = max(peak, len(queue))
+
+        started = time.perf_counter()
+        rooms = queue.tick(now)
+        tick_ms.append((time.perf_counter() - started) * 1000)
+
+        for room in rooms:
+            waits.extend(now - t.enqueued_at for t in room)
+            spreads.append(max(t.skill for t in room) - min(t.skill for t in room))
+        now += tick
+
+    return {
+        "matched": len(waits) / len(tickets) * 100,
+        "p50": percentile(waits, 0.5),
+        "p95": percentile(waits, 0.95),
+        "spread": statistics.fmean(spreads) if spreads else 0.0,
+        "peak": peak,
+        "tick_ms": statistics.fmean(tick_ms),
+        "tick_max_ms": max(tick_ms),
+    }
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Simulate skill-bucketed matchmaking")
+    parser.add_argument("--players", type=int, default=5000, help="Backlog queued at t=0")
+    parser.add_argument("--arrival-rate", type=float, default=50.0, help="Arrivals per second")
+    parser.add_argument("--duration", type=float, default=120.0, help="Simulated seconds")
+    parser.add_argument("--tick", type=float, default=2.0, help="Seconds between ticks")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tickets = arrivals(args.players, args.arrival_rate, args.duration, args.seed)
+    print(
+        f"📊 {args.players} queued + {len(tickets) - args.players} arrivals over "
+        f"{args.duration:g}s, tick {args.tick:g}s\n"
+    )
+    print(
+        f"   {'widening':<14}{'matched %':>10}{'wait p50':>10}{'wait p95':>10}"
+        f"{'skill Δ':>9}{'peak queue':>12}{'tick ms':>9}{'max ms':>8}"
+    )
+
+    for label, widen in (("none", None), ("every 20s", 20.0), ("every 10s", 10.0),
+                         ("every 5s", 5.0)):
+        r = simulate(tickets, args.duration, args.tick, widen)
+        print(
+            f"   {label:<14}{r['matched']:>10.1f}{r['p50']:>9.1f}s{r['p95']:>9.1f}s"
+            f"{r['spread']:>9.0f}{r['peak']:>12.0f}{r['tick_ms']:>9.2f}{r['tick_max_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
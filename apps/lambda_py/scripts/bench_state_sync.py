@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark binary state-sync messages against plain JSON room payloads."""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.deal import deal, decode_card  # noqa: E402
+from shared.state_sync import RoomSync, decode  # noqa: E402
+
+
+def build_room(plays: int) -> RoomSync:
+    """
+    Simulate a hand with the given number of plays.
+
+    Args:
+        plays: Number of plays to record
+
+    Returns:
+        Room sync log after the plays
+    """
+    hands = [bytearray(hand) for hand in deal()]
+    room = RoomSync(room_id="bench-room")
+    room.start_hand(turn=0)
+
+    seat = 0
+    for i in range(plays):
+        # Alternate singles, pairs and passes to mimic a real hand
+        size = (0, 1, 2)[i % 3]
+        size = min(size, len(hands[seat]))
+        cards = bytes(hands[seat][:size])
+        del hands[seat][:size]
+        room.record_play(seat, cards, next_turn=(seat + 1) % 4)
+        seat = (seat + 1) % 4
+
+    return room
+
+
+def room_json(room: RoomSync) -> str:
+    """Full room payload as the handlers would send it through json.dumps."""
+    return json.dumps(
+        {
+            "roomId": room.room_id,
+            "version": room.version,
+            "turn": room.turn,
+            "handCounts": room.hand_counts,
+            "plays": [
+                {
+                    "seat": play.seat,
+                    "cards": [
+                        {"rank": rank, "suit": suit, "id": code}
+                        for code in play.cards
+                        for rank, suit in [decode_card(code)]
+                    ],
+                }
+                for play in room.plays
+            ],
+        }
+    )
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark state-sync encoding")
+    parser.add_argument("--plays", type=int, default=60, help="Plays recorded in the hand")
+    parser.add_argument("--number", type=int, default=10000, help="Iterations per timing")
+    args = parser.parse_args()
+
+    room = build_room(args.plays)
+    acked = room.version - 1
+
+    full_json = room_json(room)
+    delta = room.encode_since(acked)
+    snapshot = room.encode_snapshot()
+
+    timings = {
+        "json encode": timeit.timeit(lambda: room_json(room), number=args.number),
+        "json decode": timeit.timeit(lambda: json.loads(full_json), number=args.number),
+        "delta encode": timeit.timeit(lambda: room.encode_since(acked), number=args.number),
+        "delta decode": timeit.timeit(lambda: decode(delta), number=args.number),
+        "snapshot encode": timeit.timeit(room.encode_snapshot, number=args.number),
+        "snapshot decode": timeit.timeit(lambda: decode(snapshot), number=args.number),
+    }
+
+    print(f"📊 State sync after {args.plays} plays ({args.number} iterations)\n")
+    print(f"   {'full JSON':<18}{len(full_json.encode('utf-8')):>8} bytes")
+    print(f"   {'snapshot':<18}{len(snapshot):>8} bytes")
+    print(f"   {'delta (1 play)':<18}{len(delta):>8} bytes\n")
+    for name, seconds in timings.items():
+        print(f"   {name:<18}{seconds / args.number * 1e6:>8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: SQS batch user creation vs one POST /users per user (moto).
+
+moto answers in microseconds, so ``--latency-ms`` adds a simulated network
+round trip to every DynamoDB call to make the two paths comparable to a
+deployed function.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("POWERTOOLS_TRACE_DISABLED", "true")
+os.environ.setdefault("POWERTOOLS_METRICS_NAMESPACE", "Bench")
+os.environ.setdefault("USERS_TABLE_NAME", "Users")
+
+import boto3  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+
+class LambdaContext:
+    """Minimal Lambda context."""
+
+    function_name = "bench"
+    memory_limit_in_mb = 512
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:bench"
+    aws_request_id = "bench-request"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 30000
+
+
+class CallStats:
+    """Counts DynamoDB calls and adds simulated latency to each."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def __call__(self, **kwargs: Any) -> None:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def create_users_table() -> None:
+    """Create the Users table in the mocked account."""
+    boto3.resource("dynamodb", region_name="us-east-1").create_table(
+        TableName=os.environ["USERS_TABLE_NAME"],
+        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def user_bodies(count: int, prefix: str) -> List[Dict[str, str]]:
+    """Request bodies for ``count`` distinct users."""
+    return [
+        {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com"} for i in range(count)
+    ]
+
+
+def run_api(count: int) -> None:
+    """Create users through the API handler, one invocation per user."""
+    api = importlib.import_module("functions.user.handler")
+    context = LambdaContext()
+    for body in user_bodies(count, "api"):
+        event = {
+            "httpMethod": "POST",
+            "path": "/users",
+            "headers": {},
+            "body": json.dumps(body),
+        }
+        assert api.handler(event, context)["statusCode"] == 201
+
+
+def run_batch(count: int, batch_size: int) -> None:
+    """Create users through the SQS batch handler."""
+    batch = importlib.import_module("functions.user_batch.handler")
+    context = LambdaContext()
+    bodies = user_bodies(count, "sqs")
+    for start in range(0, count, batch_size):
+        records = [
+            {"messageId": f"msg-{start + i}", "body": json.dumps(body)}
+            for i, body in enumerate(bodies[start:start + batch_size])
+        ]
+        response = batch.handler({"Records": records}, context)
+        assert not response["batchItemFailures"]
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark batch vs per-request user creation")
+    parser.add_argument("--users", type=int, default=500, help="Users created per path")
+    parser.add_argument("--batch-size", type=int, default=100, help="SQS records per invocation")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated DynamoDB RTT")
+    args = parser.parse_args()
+
+    with mock_aws():
+        stats = CallStats(args.latency_ms)
+        boto3.setup_default_session()
+        boto3.DEFAULT_SESSION.events.register("before-call.dynamodb", stats)
+        create_users_table()
+
+        print(
+            f"📊 {args.users} users, {args.latency_ms:g} ms simulated DynamoDB latency, "
+            f"SQS batches of {args.batch_size}\n"
+        )
+        print(f"   {'path':<22}{'seconds':>9}{'users/s':>10}{'ddb calls':>11}")
+
+        for name, run in (
+            ("POST /users", lambda: run_api(args.users)),
+            ("SQS batch", lambda: run_batch(args.users, args.batch_size)),
+        ):
+            stats.calls = 0
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"   {name:<22}{elapsed:>9.2f}{args.users / elapsed:>10.0f}{stats.calls:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """Build script for Lambda functions."""
 
 import argparse
+import json
 import os
 import shutil
 import subprocess
@@ -37,13 +38,43 @@ def get_all_functions() -> list[str]:
     ]
 
 
-def install_dependencies(function_name: str, target_dir: Path) -> None:
+def get_bundle_functions(function_name: str) -> list[str]:
+    """
+    Get the functions packaged together with a bundle entry point.
+    
+    Bundles are declared with a ``bundle`` list in deploy-config.json, e.g.
+    an ``app`` router that mounts ``hello`` and ``user`` in one deployable.
+    
+    Args:
+        function_name: Name of the entry-point function
+        
+    Returns:
+        Names of the additional functions to package (empty if not a bundle)
+    """
+    config_file = get_project_root() / "deploy-config.json"
+    if not config_file.exists():
+        return []
+    
+    with open(config_file) as f:
+        config = json.load(f)
+    
+    return [
+        name for name in config.get(function_name, {}).get("bundle", []) if name != function_name
+    ]
+
+
+def install_dependencies(
+    function_name: str,
+    target_dir: Path,
+    bundled: list[str] | None = None,
+) -> None:
     """
     Install dependencies for a function using uv.
     
     Args:
         function_name: Name of the function
         target_dir: Target directory for dependencies
+        bundled: Additional functions packaged in the same deployable
     """
     project_root = get_project_root()
     
@@ -93,39 +124,40 @@ def install_dependencies(function_name: str, target_dir: Path) -> None:
             )
     
     # Install function-specific dependencies if they exist
-    func_requirements = get_functions_dir() / function_name / "requirements.txt"
-    if func_requirements.exists():
-        print(f"📦 Installing {function_name}-specific dependencies...")
-        if use_uv:
-            subprocess.run(
-                [
-                    "uv",
-                    "pip",
-                    "install",
-                    "--python",
-                    sys.executable,
-                    "--target",
-                    str(target_dir),
-                    "-r",
-                    str(func_requirements),
-                ],
-                check=True,
-            )
-        else:
-            subprocess.run(
-                [
-                    sys.executable,
-                    "-m",
-                    "pip",
-                    "install",
-                    "-r",
-                    str(func_requirements),
-                    "-t",
-                    str(target_dir),
-                    "--upgrade",
-                ],
-                check=True,
-            )
+    for name in [function_name, *(bundled or [])]:
+        func_requirements = get_functions_dir() / name / "requirements.txt"
+        if func_requirements.exists():
+            print(f"📦 Installing {name}-specific dependencies...")
+            if use_uv:
+                subprocess.run(
+                    [
+                        "uv",
+                        "pip",
+                        "install",
+                        "--python",
+                        sys.executable,
+                        "--target",
+                        str(target_dir),
+                        "-r",
+                        str(func_requirements),
+                    ],
+                    check=True,
+                )
+            else:
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "pip",
+                        "install",
+                        "-r",
+                        str(func_requirements),
+                        "-t",
+                        str(target_dir),
+                        "--upgrade",
+                    ],
+                    check=True,
+                )
 
 
 def copy_function_code(function_name: str, target_dir: Path) -> None:
@@ -203,11 +235,17 @@ def build_function(function_name: str) -> None:
         shutil.rmtree(build_dir)
     build_dir.mkdir(parents=True)
     
+    bundled = get_bundle_functions(function_name)
+    if bundled:
+        print(f"   Bundling: {', '.join(bundled)}")
+    
     # Install dependencies
-    install_dependencies(function_name, build_dir)
+    install_dependencies(function_name, build_dir, bundled)
     
     # Copy function code
     copy_function_code(function_name, build_dir)
+    for name in bundled:
+        copy_function_code(name, build_dir)
     
     # Cleanup
     cleanup_build_artifacts(build_dir)
@@ -94,12 +94,109 @@ def function_exists(function_name: str, region: str) -> bool:
         return False
 
 
-def deploy_function(function_name: str) -> None:
+def publish_version(function_name: str, region: str) -> str:
+    """
+    Wait for pending updates and publish a new function version.
+    
+    Args:
+        function_name: AWS Lambda function name
+        region: AWS region
+        
+    Returns:
+        Published version number
+    """
+    subprocess.run(
+        [
+            "aws",
+            "lambda",
+            "wait",
+            "function-updated",
+            "--function-name",
+            function_name,
+            "--region",
+            region,
+        ],
+        check=True,
+    )
+    
+    result = subprocess.run(
+        [
+            "aws",
+            "lambda",
+            "publish-version",
+            "--function-name",
+            function_name,
+            "--query",
+            "Version",
+            "--output",
+            "text",
+            "--region",
+            region,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def point_alias(function_name: str, alias: str, version: str, region: str) -> None:
+    """
+    Create or update an alias so it points at a published version.
+    
+    Args:
+        function_name: AWS Lambda function name
+        alias: Alias name
+        version: Published version number
+        region: AWS region
+    """
+    exists = subprocess.run(
+        [
+            "aws",
+            "lambda",
+            "get-alias",
+            "--function-name",
+            function_name,
+            "--name",
+            alias,
+            "--region",
+            region,
+        ],
+        capture_output=True,
+    ).returncode == 0
+    
+    subprocess.run(
+        [
+            "aws",
+            "lambda",
+            "update-alias" if exists else "create-alias",
+            "--function-name",
+            function_name,
+            "--name",
+            alias,
+            "--function-version",
+            version,
+            "--region",
+            region,
+        ],
+        check=True,
+    )
+
+
+def deploy_function(
+    function_name: str,
+    snapstart: bool = False,
+    publish: bool = False,
+    alias: str | None = None,
+) -> None:
     """
     Deploy a Lambda function to AWS.
     
     Args:
         function_name: Name of the function to deploy
+        snapstart: Enable SnapStart on published versions
+        publish: Publish a new version after deploying
+        alias: Alias to point at the published version
     """
     config = get_deploy_config()
     region = os.environ.get("AWS_REGION", "us-east-1")
@@ -113,6 +210,10 @@ def deploy_function(function_name: str) -> None:
     timeout = func_config.get("timeout", 30)
     memory_size = func_config.get("memorySize", 256)
     environment = func_config.get("environment", {})
+    snapstart = snapstart or func_config.get("snapStart", False)
+    alias = alias or func_config.get("alias")
+    # SnapStart only applies to published versions, and an alias needs one
+    publish = publish or snapstart or bool(alias)
     
     if not role:
         print("❌ Lambda execution role not specified.")
@@ -166,6 +267,9 @@ def deploy_function(function_name: str) -> None:
                 env_vars = ",".join(f"{k}={v}" for k, v in environment.items())
                 cmd.extend(["--environment", f"Variables={{{env_vars}}}"])
             
+            if snapstart:
+                cmd.extend(["--snap-start", "ApplyOn=PublishedVersions"])
+            
             subprocess.run(cmd, check=True)
         else:
             # Create new function
@@ -196,8 +300,19 @@ def deploy_function(function_name: str) -> None:
                 env_vars = ",".join(f"{k}={v}" for k, v in environment.items())
                 cmd.extend(["--environment", f"Variables={{{env_vars}}}"])
             
+            if snapstart:
+                cmd.extend(["--snap-start", "ApplyOn=PublishedVersions"])
+            
             subprocess.run(cmd, check=True)
         
+        if publish:
+            version = publish_version(aws_function_name, region)
+            print(f"   Published version {version}" + (" (SnapStart)" if snapstart else ""))
+            
+            if alias:
+                point_alias(aws_function_name, alias, version, region)
+                print(f"   Alias {alias} -> {version}")
+        
         print(f"✅ Deployed {function_name} successfully")
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to deploy {function_name}: {e}")
@@ -212,8 +327,23 @@ def main() -> None:
         help="Function name to deploy",
     )
     
+    parser.add_argument(
+        "--snapstart",
+        action="store_true",
+        help="Enable SnapStart (implies --publish)",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="Publish a new version after deploying",
+    )
+    parser.add_argument(
+        "--alias",
+        help="Create or update an alias pointing at the published version (implies --publish)",
+    )
+    
     args = parser.parse_args()
-    deploy_function(args.function)
+    deploy_function(args.function, args.snapstart, args.publish, args.alias)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Event-replay load generator for the Lambda handlers.
+
+Replays API Gateway proxy events at a target request rate, either by calling
+a handler in-process or by sending HTTP requests to a local endpoint such as
+``scripts/serve.py``. Requests are scheduled open-loop with asyncio, and
+latency is measured from each request's scheduled start, so a saturated
+handler shows up as growing latency instead of a silently lower rate.
+
+Events come from a corpus file (a JSON array, ``{"events": [...]}`` or
+NDJSON) or are synthesized: a mix of ``GET /hello``, ``POST /users`` and
+``GET /users/{userId}`` against users created in a seeding phase.
+
+The report covers achieved throughput, latency percentiles, error rates and,
+in-process, DynamoDB API calls per route.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_HANDLER = "functions.app.handler.handler"
+
+_current = threading.local()
+
+
+class DynamoCallCounter:
+    """Counts DynamoDB API calls per route via a botocore event hook."""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def __call__(self, model: Any = None, **kwargs: Any) -> None:
+        route = getattr(_current, "route", None) or "(background)"
+        with self._lock:
+            self.calls[route][model.name if model else "unknown"] += 1
+
+    def install(self) -> None:
+        """Register on the default boto3 session before any client is created."""
+        import boto3
+
+        if boto3.DEFAULT_SESSION is None:
+            boto3.setup_default_session()
+        boto3.DEFAULT_SESSION.events.register("before-call.dynamodb", self)
+
+
+class LocalContext:
+    """Minimal Lambda context for in-process invocations."""
+
+    def __init__(self) -> None:
+        self.function_name = "loadgen"
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = "arn:aws:lambda:us-east-1:000000000000:function:loadgen"
+        self.memory_limit_in_mb = "512"
+        self.request_id = str(uuid.uuid4())
+        self.aws_request_id = self.request_id
+        self.log_group_name = "/aws/lambda/loadgen"
+        self.log_stream_name = "local/[$LATEST]loadgen"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 30000
+
+
+def route_key(event: Dict[str, Any]) -> str:
+    """Route label for reporting: method plus resource template (or path)."""
+    return f"{event.get('httpMethod')} {event.get('resource') or event.get('path')}"
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load recorded API Gateway events.
+
+    Args:
+        path: JSON array, {"events": [...]} or NDJSON file
+
+    Returns:
+        List of events
+    """
+    text = path.read_text()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if isinstance(data, dict):
+        # A single-event NDJSON file also parses as one JSON object
+        return data["events"] if "events" in data else [data]
+    return data
+
+
+def api_event(
+    method: str,
+    path: str,
+    resource: str,
+    body: Optional[Dict[str, Any]] = None,
+    path_params: Optional[Dict[str, str]] = None,
+    query: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Build an API Gateway proxy event in the shape used by the tests."""
+    return {
+        "httpMethod": method,
+        "path": path,
+        "resource": resource,
+        "headers": {"Content-Type": "application/json"} if body is not None else {},
+        "queryStringParameters": query,
+        "pathParameters": path_params,
+        "body": json.dumps(body) if body is not None else None,
+    }
+
+
+def create_user_event() -> Dict[str, Any]:
+    """Synthesize a POST /users event."""
+    name = f"load_{uuid.uuid4().hex[:10]}"
+    return api_event("POST", "/users", "/users", {"username": name, "email": f"{name}@example.com"})
+
+
+def synthesize(count: int, user_ids: List[str], rng: random.Random) -> List[Dict[str, Any]]:
+    """
+    Synthesize a mixed workload.
+
+    Args:
+        count: Number of events
+        user_ids: Existing user IDs for GET requests
+        rng: Random source
+
+    Returns:
+        List of events
+    """
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.2:
+            events.append(api_event("GET", "/hello", "/hello", query={"name": "load"}))
+        elif roll < 0.5 or not user_ids:
+            events.append(create_user_event())
+        else:
+            user_id = rng.choice(user_ids)
+            events.append(
+                api_event(
+                    "GET", f"/users/{user_id}", "/users/{userId}", path_params={"userId": user_id}
+                )
+            )
+    return events
+
+
+def in_process_sender(dotted_path: str) -> Callable[[Dict[str, Any]], Tuple[int, str]]:
+    """Build a sender that calls a handler directly."""
+    import importlib
+
+    module_name, _, attribute = dotted_path.rpartition(".")
+    handler = getattr(importlib.import_module(module_name), attribute)
+
+    def send(event: Dict[str, Any]) -> Tuple[int, str]:
+        _current.route = route_key(event)
+        try:
+            response = handler(event, LocalContext())
+        finally:
+            _current.route = None
+        return int(response["statusCode"]), response.get("body") or ""
+
+    return send
+
+
+def http_sender(base_url: str) -> Callable[[Dict[str, Any]], Tuple[int, str]]:
+    """Build a sender that replays events as HTTP requests."""
+
+    def send(event: Dict[str, Any]) -> Tuple[int, str]:
+        url = base_url.rstrip("/") + event["path"]
+        if event.get("queryStringParameters"):
+            url += "?" + urlencode(event["queryStringParameters"])
+        body = event.get("body")
+        request = urllib.request.Request(
+            url,
+            data=body.encode("utf-8") if body else None,
+            method=event["httpMethod"],
+            headers=event.get("headers") or {},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode("utf-8")
+
+    return send
+
+
+def seed_users(send: Callable[[Dict[str, Any]], Tuple[int, str]], count: int) -> List[str]:
+    """Create users through the handler so GET requests hit real items."""
+    user_ids = []
+    for _ in range(count):
+        status, body = send(create_user_event())
+        if status == 201:
+            user_ids.append(json.loads(body)["user_id"])
+    return user_ids
+
+
+async def replay(
+    events: List[Dict[str, Any]],
+    send: Callable[[Dict[str, Any]], Tuple[int, str]],
+    rps: float,
+    concurrency: int,
+) -> Tuple[List[Tuple[str, int, float]], float]:
+    """
+    Replay events open-loop at a target rate.
+
+    Args:
+        events: Events to send, in order
+        send: Blocking sender returning (status, body); 0 means an exception
+        rps: Target requests per second
+        concurrency: Maximum requests in flight
+
+    Returns:
+        (route, status, latency seconds) per request, and the wall time
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    results: List[Tuple[str, int, float]] = []
+    interval = 1.0 / rps
+    start = time.perf_counter()
+
+    def timed(event: Dict[str, Any]) -> int:
+        try:
+            return send(event)[0]
+        except Exception:
+            return 0
+
+    async def fire(index: int, event: Dict[str, Any]) -> None:
+        scheduled = start + index * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        status = await loop.run_in_executor(executor, timed, event)
+        results.append((route_key(event), status, time.perf_counter() - scheduled))
+
+    await asyncio.gather(*(fire(i, event) for i, event in enumerate(events)))
+    elapsed = time.perf_counter() - start
+    executor.shutdown(wait=False)
+    return results, elapsed
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def report(
+    results: List[Tuple[str, int, float]],
+    elapsed: float,
+    target_rps: float,
+    counter: Optional[DynamoCallCounter],
+) -> Dict[str, Any]:
+    """
+    Print and return a summary of the run.
+
+    Args:
+        results: Per-request results from :func:`replay`
+        elapsed: Wall time in seconds
+        target_rps: Requested rate
+        counter: DynamoDB call counter (in-process runs only)
+
+    Returns:
+        Summary dictionary (also printed)
+    """
+    by_route: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for route, status, latency in results:
+        by_route[route].append((status, latency))
+
+    summary: Dict[str, Any] = {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "target_rps": target_rps,
+        "achieved_rps": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "routes": {},
+    }
+
+    print(f"📊 {len(results)} requests in {elapsed:.2f}s")
+    print(f"   target {target_rps:.1f} rps, achieved {summary['achieved_rps']:.1f} rps\n")
+    header = f"   {'route':<24}{'count':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+    print(header + f"{'4xx':>7}{'5xx/err':>9}{'ddb/req':>9}")
+
+    for route, samples in sorted(by_route.items()):
+        latencies = sorted(latency * 1000 for _, latency in samples)
+        client_errors = sum(1 for status, _ in samples if 400 <= status < 500)
+        server_errors = sum(1 for status, _ in samples if status == 0 or status >= 500)
+        ddb_calls = sum(counter.calls.get(route, {}).values()) if counter else None
+
+        stats = {
+            "count": len(samples),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p90_ms": round(percentile(latencies, 0.90), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "client_error_rate": round(client_errors / len(samples), 4),
+            "error_rate": round(server_errors / len(samples), 4),
+            "dynamodb_calls": dict(counter.calls.get(route, {})) if counter else None,
+        }
+        summary["routes"][route] = stats
+
+        per_request = f"{ddb_calls / len(samples):.2f}" if ddb_calls is not None else "n/a"
+        print(
+            f"   {route:<24}{len(samples):>7}{stats['p50_ms']:>9.2f}{stats['p90_ms']:>9.2f}"
+            f"{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}{client_errors:>7}"
+            f"{server_errors:>9}{per_request:>9}"
+        )
+
+    return summary
+
+
+def create_users_table() -> None:
+    """Create the Users table for --moto runs."""
+    import boto3
+
+    boto3.resource("dynamodb", region_name="us-east-1").create_table(
+        TableName=os.environ.get("USERS_TABLE_NAME", "Users"),
+        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Replay API Gateway events under load")
+    parser.add_argument("--corpus", type=Path, help="Recorded events (JSON array or NDJSON)")
+    parser.add_argument("--requests", type=int, default=500, help="Synthesized request count")
+    parser.add_argument("--seed-users", type=int, default=20, help="Users created before run")
+    parser.add_argument("--rps", type=float, default=100.0, help="Target requests per second")
+    parser.add_argument("--concurrency", type=int, default=16, help="Max requests in flight")
+    parser.add_argument("--url", help="Replay over HTTP against this base URL")
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="In-process handler path")
+    parser.add_argument("--moto", action="store_true", help="In-process against moto DynamoDB")
+    parser.add_argument("--json", type=Path, help="Write the summary as JSON")
+    parser.add_argument("--random-seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.random_seed)
+    counter: Optional[DynamoCallCounter] = None
+    mock = None
+
+    if args.url:
+        send = http_sender(args.url)
+    else:
+        os.environ.setdefault("POWERTOOLS_TRACE_DISABLED", "true")
+        if args.moto:
+            for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+                os.environ.setdefault(name, "testing")
+            from moto import mock_aws
+
+            mock = mock_aws()
+            mock.start()
+            create_users_table()
+
+        counter = DynamoCallCounter()
+        counter.install()
+        send = in_process_sender(args.handler)
+
+    try:
+        if args.corpus:
+            events = load_corpus(args.corpus)
+        else:
+            user_ids = seed_users(send, args.seed_users)
+            events = synthesize(args.requests, user_ids, rng)
+
+        if counter:
+            counter.calls.clear()
+
+        results, elapsed = asyncio.run(replay(events, send, args.rps, args.concurrency))
+        summary = report(results, elapsed, args.rps, counter)
+    finally:
+        if mock:
+            mock.stop()
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2))
+        print(f"\n✅ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
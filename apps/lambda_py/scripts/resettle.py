@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Re-settle archived games in bulk and rewrite players' rank and coins.
+
+Reads one game per line (``shared.history.game_to_dict`` plus ``"seats"``,
+the user ID per seat or null for AI players), replays every hand to its
+finish order and recomputes each player's totals with
+:func:`shared.settlement.resettle`. Each player's ``rank`` and ``coins``
+are then set with one conditional ``UpdateItem`` (run concurrently), so a
+backlog costs one request per player rather than a transaction per hand.
+Only those two attributes are written, and only on existing users. The
+values replace the stored counters, so include every completed game and run
+it while no hands are being settled: a live ``ADD`` that lands before the
+rewrite is overwritten.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from functions.user import handler as user  # noqa: E402
+from shared.history import GameLog, game_from_dict  # noqa: E402
+from shared.settlement import BASE_COINS, PlayerTotals, resettle  # noqa: E402
+
+MAX_WORKERS = 16
+
+
+def read_games(lines: TextIO) -> Iterator[Tuple[GameLog, Sequence[Optional[str]]]]:
+    """Parse game lines, skipping blank ones."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        seats = data.get("seats")
+        if not isinstance(seats, list) or len(seats) != 4:
+            raise ValueError(f"Line {number}: expected four seats")
+        yield game_from_dict(data), seats
+
+
+def write_totals(table: Any, totals: Dict[str, PlayerTotals]) -> List[str]:
+    """
+    Set each existing player's rank and coins, leaving other attributes alone.
+
+    Args:
+        table: Users table
+        totals: Recomputed totals per user ID
+
+    Returns:
+        User IDs that were not found
+    """
+
+    def write(user_id: str) -> Optional[str]:
+        player = totals[user_id]
+        try:
+            table.update_item(
+                Key={"user_id": user_id},
+                UpdateExpression="SET #rank = :rank, coins = :coins",
+                ConditionExpression="attribute_exists(user_id)",
+                ExpressionAttributeNames={"#rank": "rank"},
+                ExpressionAttributeValues={":rank": player.rank, ":coins": player.coins},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return user_id
+            raise
+        return None
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return sorted(user_id for user_id in executor.map(write, totals) if user_id)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Re-settle archived games")
+    parser.add_argument("games", help="JSON-lines file of games ('-' for stdin)")
+    parser.add_argument("--base-coins", type=int, default=BASE_COINS, help="Coins per level")
+    parser.add_argument("--dry-run", action="store_true", help="Compute totals only")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    source = sys.stdin if args.games == "-" else open(args.games, encoding="utf-8")
+    with source:
+        totals = resettle(read_games(source), args.base_coins)
+    print(f"📊 Re-settled {len(totals)} players in {time.perf_counter() - started:.2f}s")
+    if args.dry_run:
+        for user_id, player in sorted(totals.items(), key=lambda kv: -kv[1].rank)[:20]:
+            print(f"   {user_id:<40} rank {player.rank:>5} coins {player.coins:>8}")
+        return
+
+    missing = write_totals(user.get_table(), totals)
+    print(f"✅ Rewrote {len(totals) - len(missing)} players")
+    if missing:
+        print(f"⚠️  {len(missing)} players not found: {', '.join(missing[:10])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Recommend a Lambda memory size from REPORT logs and local benchmarks.
+
+Lambda allocates CPU in proportion to memory: one full vCPU at 1,769 MB,
+less below it. A function's duration therefore has a CPU part that shrinks
+as memory grows and an I/O part (DynamoDB, API Gateway) that does not.
+This script splits observed durations into those two parts, predicts the
+duration and cost at each candidate size and recommends the cheapest one
+that keeps peak memory under the headroom limit.
+
+The split comes from, in order of preference:
+
+* ``REPORT`` lines recorded at two or more memory sizes (least-squares fit)
+* one memory size plus a ``scripts/loadgen.py --json`` summary, whose
+  in-process latency is taken as an upper bound on CPU time at a full vCPU
+
+Usage::
+
+    python scripts/rightsize.py user logs/user-report.log --bench loadgen.json
+    python scripts/rightsize.py user logs/*.log --max-duration 150 --write
+"""
+
+import argparse
+import difflib
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import mean
+from typing import Dict, List, Optional, Tuple
+
+FULL_VCPU_MB = 1769
+CANDIDATE_SIZES = [128, 256, 384, 512, 640, 768, 1024, 1280, 1536, 1769, 2048, 3008]
+PRICE_PER_GB_SECOND = {"x86_64": 0.0000166667, "arm64": 0.0000133334}
+PRICE_PER_MILLION_REQUESTS = 0.20
+
+_REPORT_FIELDS = {
+    "duration": re.compile(r"\bDuration: ([\d.]+) ms"),
+    "memory": re.compile(r"Memory Size: (\d+) MB"),
+    "max_used": re.compile(r"Max Memory Used: (\d+) MB"),
+    "init": re.compile(r"Init Duration: ([\d.]+) ms"),
+}
+
+
+@dataclass
+class Report:
+    """One parsed ``REPORT`` line."""
+
+    duration_ms: float
+    memory_mb: int
+    max_used_mb: int
+    init_ms: Optional[float] = None
+
+
+@dataclass
+class Estimate:
+    """Predicted duration and cost at one memory size."""
+
+    memory_mb: int
+    duration_ms: float
+    cost_per_million: float
+
+
+def get_project_root() -> Path:
+    """Get the project root directory."""
+    return Path(__file__).parent.parent
+
+
+def parse_report(line: str) -> Optional[Report]:
+    """
+    Parse a Lambda ``REPORT`` log line.
+
+    Exported lines may carry a timestamp or log stream prefix; only the
+    fields are matched.
+
+    Args:
+        line: Log line
+
+    Returns:
+        Parsed report, or None for any other line
+    """
+    if "REPORT RequestId:" not in line:
+        return None
+
+    values = {name: pattern.search(line) for name, pattern in _REPORT_FIELDS.items()}
+    if not (values["duration"] and values["memory"] and values["max_used"]):
+        return None
+
+    return Report(
+        duration_ms=float(values["duration"].group(1)),
+        memory_mb=int(values["memory"].group(1)),
+        max_used_mb=int(values["max_used"].group(1)),
+        init_ms=float(values["init"].group(1)) if values["init"] else None,
+    )
+
+
+def load_reports(paths: List[Path]) -> List[Report]:
+    """Parse every ``REPORT`` line in the given log files."""
+    reports = []
+    for path in paths:
+        with open(path) as f:
+            reports.extend(r for r in map(parse_report, f) if r is not None)
+    return reports
+
+
+def load_bench_cpu_ms(path: Path) -> float:
+    """
+    Request-weighted p50 latency from a ``loadgen.py --json`` summary.
+
+    Args:
+        path: Summary file
+
+    Returns:
+        Estimated CPU time per request at a full vCPU, in milliseconds
+    """
+    routes = json.loads(path.read_text()).get("routes", {})
+    total = sum(stats["count"] for stats in routes.values())
+    if not total:
+        raise ValueError(f"No routes in benchmark summary {path}")
+    return sum(stats["p50_ms"] * stats["count"] for stats in routes.values()) / total
+
+
+def cpu_slowdown(memory_mb: int) -> float:
+    """CPU time multiplier at a memory size relative to one full vCPU."""
+    return FULL_VCPU_MB / min(memory_mb, FULL_VCPU_MB)
+
+
+def fit_model(reports: List[Report], bench_cpu_ms: Optional[float]) -> Tuple[float, float]:
+    """
+    Split mean duration into I/O time and CPU time at a full vCPU.
+
+    Args:
+        reports: Parsed REPORT lines
+        bench_cpu_ms: CPU estimate from a local benchmark, if any
+
+    Returns:
+        (io_ms, cpu_ms)
+    """
+    by_memory: Dict[int, List[float]] = {}
+    for r in reports:
+        by_memory.setdefault(r.memory_mb, []).append(r.duration_ms)
+    points = [(cpu_slowdown(m), mean(d)) for m, d in by_memory.items()]
+
+    if len(points) >= 2:
+        x_mean = mean(x for x, _ in points)
+        y_mean = mean(y for _, y in points)
+        sxx = sum((x - x_mean) ** 2 for x, _ in points)
+        if sxx > 0:
+            cpu = max(0.0, sum((x - x_mean) * (y - y_mean) for x, y in points) / sxx)
+            return max(0.0, y_mean - cpu * x_mean), cpu
+
+    slowdown, observed = points[0]
+    if bench_cpu_ms is None:
+        print("⚠️  One memory size and no --bench: assuming the duration is all CPU time")
+        return 0.0, observed / slowdown
+
+    cpu = min(bench_cpu_ms, observed / slowdown)
+    return observed - cpu * slowdown, cpu
+
+
+def estimate(memory_mb: int, io_ms: float, cpu_ms: float, architecture: str) -> Estimate:
+    """Predict mean duration and cost per million invocations at a memory size."""
+    duration = io_ms + cpu_ms * cpu_slowdown(memory_mb)
+    gb_seconds = math.ceil(duration) / 1000 * memory_mb / 1024
+    cost = 1_000_000 * gb_seconds * PRICE_PER_GB_SECOND[architecture] + PRICE_PER_MILLION_REQUESTS
+    return Estimate(memory_mb, duration, cost)
+
+
+def recommend(
+    estimates: List[Estimate],
+    floor_mb: float,
+    tolerance: float,
+    max_duration_ms: Optional[float] = None,
+) -> Optional[Estimate]:
+    """
+    Pick the fastest size whose cost is within ``tolerance`` of the cheapest.
+
+    Args:
+        estimates: Estimates per candidate size
+        floor_mb: Minimum memory size (peak usage plus headroom)
+        tolerance: Accepted cost increase over the cheapest size, e.g. 0.05
+        max_duration_ms: Optional latency target for the mean duration
+
+    Returns:
+        Recommended estimate, or None if no candidate fits
+    """
+    eligible = [
+        e
+        for e in estimates
+        if e.memory_mb >= floor_mb and (max_duration_ms is None or e.duration_ms <= max_duration_ms)
+    ]
+    if not eligible:
+        return None
+    cheapest = min(e.cost_per_million for e in eligible)
+    affordable = [e for e in eligible if e.cost_per_million <= cheapest * (1 + tolerance)]
+    return min(affordable, key=lambda e: (e.duration_ms, e.memory_mb))
+
+
+def proposed_diff(config_path: Path, function_name: str, memory_mb: int) -> Tuple[str, str]:
+    """
+    Build the updated ``deploy-config.json`` and its unified diff.
+
+    Returns:
+        (new file content, diff text)
+    """
+    original = config_path.read_text()
+    config = json.loads(original)
+    config[function_name]["memorySize"] = memory_mb
+    updated = json.dumps(config, indent=2) + "\n"
+    diff = difflib.unified_diff(
+        original.splitlines(keepends=True),
+        updated.splitlines(keepends=True),
+        fromfile=f"a/{config_path.name}",
+        tofile=f"b/{config_path.name}",
+    )
+    return updated, "".join(diff)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Recommend a Lambda memory size")
+    parser.add_argument("function", help="Function name in deploy-config.json")
+    parser.add_argument("logs", type=Path, nargs="+", help="Exported CloudWatch log files")
+    parser.add_argument("--bench", type=Path, help="loadgen.py --json summary")
+    parser.add_argument("--headroom", type=float, default=1.2, help="Peak memory multiplier")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Accepted extra cost")
+    parser.add_argument("--max-duration", type=float, help="Mean duration target in ms")
+    parser.add_argument("--architecture", choices=sorted(PRICE_PER_GB_SECOND), default="x86_64")
+    parser.add_argument("--write", action="store_true", help="Apply the change to the config")
+    args = parser.parse_args()
+
+    config_path = get_project_root() / "deploy-config.json"
+    config = json.loads(config_path.read_text())
+    if args.function not in config:
+        print(f"❌ Function '{args.function}' not found in deploy-config.json")
+        sys.exit(1)
+
+    reports = load_reports(args.logs)
+    if not reports:
+        print("❌ No REPORT lines found")
+        sys.exit(1)
+
+    current = config[args.function].get("memorySize", 128)
+    peak = max(r.max_used_mb for r in reports)
+    durations = sorted(r.duration_ms for r in reports)
+    inits = [r.init_ms for r in reports if r.init_ms is not None]
+
+    print(f"📊 {args.function}: {len(reports)} invocations, {len(inits)} cold starts")
+    p99 = durations[int(0.99 * (len(durations) - 1))]
+    print(f"   mean {mean(durations):.1f} ms, p99 {p99:.1f} ms")
+    print(f"   peak memory {peak} MB of {current} MB")
+    if inits:
+        print(f"   mean init {mean(inits):.1f} ms")
+
+    bench_cpu_ms = load_bench_cpu_ms(args.bench) if args.bench else None
+    io_ms, cpu_ms = fit_model(reports, bench_cpu_ms)
+    print(f"   model: {io_ms:.1f} ms I/O + {cpu_ms:.1f} ms CPU at 1 vCPU\n")
+
+    estimates = [estimate(m, io_ms, cpu_ms, args.architecture) for m in CANDIDATE_SIZES]
+    floor_mb = peak * args.headroom
+    best = recommend(estimates, floor_mb, args.tolerance, args.max_duration)
+
+    print(f"   {'memory':>8}{'duration':>11}{'$/1M':>10}")
+    for e in estimates:
+        flag = "  ✗ below headroom" if e.memory_mb < floor_mb else ""
+        flag = "  ← recommended" if best is not None and e is best else flag
+        print(f"   {e.memory_mb:>5} MB{e.duration_ms:>8.1f} ms{e.cost_per_million:>10.3f}{flag}")
+
+    if best is None:
+        print("\n❌ No candidate size satisfies the memory headroom and duration target")
+        sys.exit(1)
+
+    if best.memory_mb == current:
+        print(f"\n✅ memorySize {current} MB is already the recommendation")
+        return
+
+    updated, diff = proposed_diff(config_path, args.function, best.memory_mb)
+    print(f"\n📝 Proposed change ({current} MB → {best.memory_mb} MB):\n")
+    print(diff)
+
+    if args.write:
+        config_path.write_text(updated)
+        print(f"✅ Updated {config_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Local multi-worker HTTP server that runs Lambda handlers for load testing.
+
+The parent process binds the listening socket and pre-forks a pool of
+workers. Each worker behaves like one Lambda execution environment: it
+handles one request at a time, and imports the handler module on its first
+request so that request pays a realistic cold start. HTTP requests are
+translated into API Gateway (REST, v1) proxy events and the handler's
+response is written back as-is.
+
+Point the handlers at LocalStack (``LOCALSTACK_ENDPOINT``) or real AWS
+through the usual environment variables.
+"""
+
+import argparse
+import base64
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_HANDLER = "functions.app.handler.handler"
+
+
+class LocalLambdaContext:
+    """Minimal Lambda context for locally served invocations."""
+
+    def __init__(self, function_name: str, timeout: float, memory_limit_in_mb: int):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = (
+            f"arn:aws:lambda:us-east-1:000000000000:function:{function_name}"
+        )
+        self.memory_limit_in_mb = str(memory_limit_in_mb)
+        self.request_id = str(uuid.uuid4())
+        self.aws_request_id = self.request_id
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self.log_stream_name = f"local/[$LATEST]{os.getpid()}"
+        self._deadline = time.monotonic() + timeout
+
+    def get_remaining_time_in_millis(self) -> int:
+        """Milliseconds left before the simulated timeout."""
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def build_event(
+    method: str,
+    raw_path: str,
+    headers: Dict[str, str],
+    body: bytes,
+    request_id: str,
+) -> Dict[str, Any]:
+    """
+    Translate an HTTP request into an API Gateway proxy event.
+
+    Args:
+        method: HTTP method
+        raw_path: Request target including the query string
+        headers: Request headers
+        body: Raw request body
+        request_id: Request ID for the request context
+
+    Returns:
+        API Gateway (REST) proxy event
+    """
+    url = urlsplit(raw_path)
+    multi_query = parse_qs(url.query, keep_blank_values=True)
+
+    try:
+        text_body: Optional[str] = body.decode("utf-8") if body else None
+        is_base64 = False
+    except UnicodeDecodeError:
+        text_body = base64.b64encode(body).decode("ascii")
+        is_base64 = True
+
+    return {
+        "httpMethod": method,
+        "path": url.path,
+        "resource": url.path,
+        "headers": headers,
+        "multiValueHeaders": {k: [v] for k, v in headers.items()},
+        "queryStringParameters": {k: v[-1] for k, v in multi_query.items()} or None,
+        "multiValueQueryStringParameters": multi_query or None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "body": text_body,
+        "isBase64Encoded": is_base64,
+        "requestContext": {
+            "requestId": request_id,
+            "stage": "local",
+            "httpMethod": method,
+            "path": url.path,
+            "requestTimeEpoch": int(time.time() * 1000),
+        },
+    }
+
+
+class WorkerState:
+    """Per-process handler state; import happens on the first request."""
+
+    def __init__(self, dotted_path: str, timeout: float, memory: int):
+        self.dotted_path = dotted_path
+        parts = dotted_path.split(".")
+        self.function_name = parts[-3] if len(parts) >= 3 else parts[0]
+        self.timeout = timeout
+        self.memory = memory
+        self.handler: Optional[Callable[[Dict[str, Any], Any], Dict[str, Any]]] = None
+        self.init_ms = 0.0
+        self.invocations = 0
+
+    def load(self) -> bool:
+        """
+        Import the handler if this worker is still cold.
+
+        Returns:
+            True if this call performed the cold start
+        """
+        if self.handler is not None:
+            return False
+
+        start = time.perf_counter()
+        module_name, _, attribute = self.dotted_path.rpartition(".")
+        self.handler = getattr(importlib.import_module(module_name), attribute)
+        self.init_ms = (time.perf_counter() - start) * 1000
+        return True
+
+
+def make_request_handler(state: WorkerState) -> type:
+    """Build the HTTP request handler class bound to a worker's state."""
+
+    class LambdaRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _invoke(self) -> None:
+            cold = state.load()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            context = LocalLambdaContext(state.function_name, state.timeout, state.memory)
+            event = build_event(
+                self.command, self.path, dict(self.headers.items()), body, context.request_id
+            )
+
+            start = time.perf_counter()
+            try:
+                response = state.handler(event, context)  # type: ignore[misc]
+            except Exception as e:
+                response = {"statusCode": 502, "body": f"Handler raised {type(e).__name__}"}
+            duration_ms = (time.perf_counter() - start) * 1000
+            state.invocations += 1
+
+            payload = response.get("body") or ""
+            data = (
+                base64.b64decode(payload)
+                if response.get("isBase64Encoded")
+                else payload.encode("utf-8")
+            )
+
+            self.send_response(int(response.get("statusCode", 200)))
+            for name, value in (response.get("headers") or {}).items():
+                self.send_header(name, str(value))
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("X-Worker-Pid", str(os.getpid()))
+            self.send_header("X-Cold-Start", "true" if cold else "false")
+            self.send_header("X-Duration-Ms", f"{duration_ms:.2f}")
+            if cold:
+                self.send_header("X-Init-Duration-Ms", f"{state.init_ms:.2f}")
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _invoke  # noqa: N815
+
+        def log_message(self, format: str, *args: Any) -> None:
+            if os.environ.get("SERVE_ACCESS_LOG"):
+                super().log_message(format, *args)
+
+    return LambdaRequestHandler
+
+
+def run_worker(listener: socket.socket, state: WorkerState) -> None:
+    """
+    Serve requests on the shared listening socket until terminated.
+
+    Args:
+        listener: Socket bound and listening in the parent
+        state: Worker handler state
+    """
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    server = HTTPServer(
+        listener.getsockname()[:2], make_request_handler(state), bind_and_activate=False
+    )
+    server.socket = listener
+    server.serve_forever()
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Serve Lambda handlers over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 2, help="Pre-forked worker processes"
+    )
+    parser.add_argument(
+        "--handler",
+        default=DEFAULT_HANDLER,
+        help=f"Dotted handler path (default {DEFAULT_HANDLER})",
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Simulated timeout (seconds)")
+    parser.add_argument("--memory", type=int, default=512, help="Reported memory size (MB)")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("❌ serve.py requires a platform with os.fork")
+        sys.exit(1)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((args.host, args.port))
+    listener.listen(1024)
+
+    children: List[int] = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(listener, WorkerState(args.handler, args.timeout, args.memory))
+            os._exit(0)
+        children.append(pid)
+
+    print(f"🚀 Serving {args.handler} on http://{args.host}:{args.port}")
+    print(f"   Workers: {args.workers} (cold start on first request per worker)")
+
+    def shutdown(signum: int, frame: Any) -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for pid in children:
+        os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""JWT bearer-token verification with cached JWKS and verified tokens.
+
+Verifying an RS256 signature costs far more than the rest of a typical
+request, and a session sends the same token many times before it expires.
+:class:`TokenVerifier` therefore keeps a bounded LRU of SHA-256 token
+hashes mapped to their verified claims until the token's ``exp``, so only
+the first request of a session pays for signature verification.
+
+Signing keys come from :class:`JWKSCache`, which holds the JWKS document
+for ``JWKS_TTL_SECONDS``. After that the cached keys are still served for
+up to ``JWKS_STALE_SECONDS`` while one background refresh runs, so requests
+never wait on the identity provider except on the first fetch or when a
+token names a key ID that is not cached yet (key rotation).
+
+Configuration (read on first use, except ``AUTH_REQUIRED``):
+
+* ``AUTH_REQUIRED``: ``true`` to enforce :func:`require_auth`; read when the
+  decorator is applied, i.e. when the handler module is imported
+* ``JWKS_URL``: JWKS endpoint, e.g. a Cognito user pool's
+  ``/.well-known/jwks.json``
+* ``JWT_ISSUER`` / ``JWT_AUDIENCE``: expected ``iss`` / ``aud`` claims
+* ``AUTH_CACHE_SIZE``: verified tokens kept (default 1024)
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import jwt
+
+from .utils import create_response
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+class AuthError(Exception):
+    """Raised when a bearer token is missing or fails verification."""
+
+
+def fetch_jwks(url: str, timeout: float = 2.0) -> Dict[str, Any]:
+    """
+    Download a JWKS document.
+
+    Args:
+        url: JWKS endpoint
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Parsed JWKS document
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        jwks: Dict[str, Any] = json.loads(response.read())
+    return jwks
+
+
+class JWKSCache:
+    """Signing keys by key ID with TTL and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = 600.0,
+        stale_ttl: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        fetch: Callable[[str], Dict[str, Any]] = fetch_jwks,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            url: JWKS endpoint
+            ttl: Seconds the keys are served without refreshing
+            stale_ttl: Seconds past ``ttl`` stale keys are served while refreshing
+            min_refresh_interval: Minimum seconds between refreshes triggered
+                by unknown key IDs
+            fetch: Function downloading the JWKS document
+        """
+        self.url = url
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._fetch = fetch
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.fetches = 0
+
+    def _refresh(self) -> None:
+        """Download the JWKS document and replace the cached keys."""
+        document = self._fetch(self.url)
+        keys = {
+            jwk.key_id: jwk.key
+            for jwk in jwt.PyJWKSet.from_dict(document).keys
+            if jwk.key_id is not None
+        }
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            self.fetches += 1
+
+    def _refresh_in_background(self) -> None:
+        """Start one background refresh unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self._refresh()
+            except Exception:
+                # Keep serving stale keys; the next request past the TTL retries.
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def get_key(self, kid: str) -> Any:
+        """
+        Get the public key for a key ID.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            Public key object
+
+        Raises:
+            AuthError: If the key ID is unknown or the JWKS cannot be fetched
+        """
+        age = None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+        if age is None or age >= self.ttl + self.stale_ttl:
+            try:
+                self._refresh()
+            except Exception as e:
+                raise AuthError("Unable to fetch signing keys") from e
+        elif age >= self.ttl:
+            self._refresh_in_background()
+        elif kid not in self._keys and age >= self.min_refresh_interval:
+            try:
+                self._refresh()
+            except Exception as e:
+                raise AuthError("Unable to fetch signing keys") from e
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise AuthError("Unknown signing key")
+        return key
+
+
+class TokenVerifier:
+    """Verify bearer tokens, caching verified claims until expiry."""
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        algorithms: Sequence[str] = ("RS256",),
+        cache_size: int = 1024,
+        leeway: float = 0.0,
+    ):
+        """
+        Initialize the verifier.
+
+        Args:
+            jwks: Signing key cache
+            issuer: Expected ``iss`` claim, if checked
+            audience: Expected ``aud`` claim, if checked
+            algorithms: Accepted signature algorithms
+            cache_size: Maximum verified tokens kept
+            leeway: Clock skew tolerance in seconds
+        """
+        self.jwks = jwks
+        self.issuer = issuer
+        self.audience = audience
+        self.algorithms = list(algorithms)
+        self.cache_size = cache_size
+        self.leeway = leeway
+        self._verified: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token and return its claims.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            Verified claims
+
+        Raises:
+            AuthError: If the token is invalid or expired
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+
+        with self._lock:
+            cached = self._verified.get(digest)
+            if cached is not None:
+                expires_at, claims = cached
+                if now < expires_at + self.leeway:
+                    self._verified.move_to_end(digest)
+                    self.hits += 1
+                    return claims
+                del self._verified[digest]
+
+        self.misses += 1
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if not kid:
+                raise AuthError("Token has no key ID")
+            claims = jwt.decode(
+                token,
+                self.jwks.get_key(kid),
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp"], "verify_aud": self.audience is not None},
+            )
+        except jwt.InvalidTokenError as e:
+            raise AuthError(str(e)) from e
+
+        with self._lock:
+            self._verified[digest] = (float(claims["exp"]), claims)
+            while len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+        return claims
+
+
+_verifier: Optional[TokenVerifier] = None
+
+
+def get_verifier() -> TokenVerifier:
+    """
+    Get the container-wide verifier configured from the environment.
+
+    Returns:
+        Token verifier
+
+    Raises:
+        AuthError: If ``JWKS_URL`` is not set
+    """
+    global _verifier
+    if _verifier is None:
+        url = os.environ.get("JWKS_URL")
+        if not url:
+            raise AuthError("JWKS_URL is not configured")
+        _verifier = TokenVerifier(
+            JWKSCache(
+                url,
+                ttl=float(os.environ.get("JWKS_TTL_SECONDS", "600")),
+                stale_ttl=float(os.environ.get("JWKS_STALE_SECONDS", "3600")),
+            ),
+            issuer=os.environ.get("JWT_ISSUER"),
+            audience=os.environ.get("JWT_AUDIENCE"),
+            cache_size=int(os.environ.get("AUTH_CACHE_SIZE", "1024")),
+        )
+    return _verifier
+
+
+def bearer_token(event: Dict[str, Any]) -> str:
+    """
+    Extract the bearer token from an API Gateway event.
+
+    Args:
+        event: API Gateway event
+
+    Returns:
+        Encoded token
+
+    Raises:
+        AuthError: If there is no bearer Authorization header
+    """
+    headers = event.get("headers") or {}
+    value = next((v for k, v in headers.items() if k.lower() == "authorization"), None)
+    scheme, _, token = (value or "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise AuthError("Missing bearer token")
+    return token.strip()
+
+
+def require_auth(
+    verifier: Optional[TokenVerifier] = None, enabled: Optional[bool] = None
+) -> Callable[[Handler], Handler]:
+    """
+    Decorator rejecting requests without a valid bearer token.
+
+    Verified claims are added to ``requestContext.authorizer.claims``, where
+    a Cognito authorizer would put them.
+
+    Args:
+        verifier: Verifier to use; defaults to :func:`get_verifier`
+        enabled: Enforce authentication; defaults to ``AUTH_REQUIRED``,
+            read here when the decorator is applied (at import), not per
+            call. When disabled the handler is returned unchanged.
+
+    Returns:
+        Decorator
+    """
+    if enabled is None:
+        enabled = os.environ.get("AUTH_REQUIRED", "false").lower() == "true"
+
+    def decorator(handler: Handler) -> Handler:
+        if not enabled:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            try:
+                claims = (verifier or get_verifier()).verify(bearer_token(event))
+            except AuthError:
+                return create_response(
+                    401, {"error": "Unauthorized"}, headers={"WWW-Authenticate": "Bearer"}
+                )
+
+            request_context = dict(event.get("requestContext") or {})
+            request_context["authorizer"] = {
+                **(request_context.get("authorizer") or {}),
+                "claims": claims,
+            }
+            return handler({**event, "requestContext": request_context}, context)
+
+        return wrapper
+
+    return decorator
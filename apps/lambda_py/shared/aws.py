@@ -0,0 +1,53 @@
+"""Shared AWS clients and resources.
+
+Every module in a container uses the same DynamoDB resource and S3 client,
+created on first use and registered with :mod:`shared.snapstart` so their
+pooled connections are dropped after a SnapStart restore. Creating them at
+import time (``dynamodb = aws.dynamodb()``) keeps that work before the
+snapshot.
+"""
+
+import os
+from typing import Any, Dict
+
+import boto3
+
+from .snapstart import register_client
+
+_clients: Dict[str, Any] = {}
+
+
+def dynamodb() -> Any:
+    """
+    Get the container's DynamoDB resource.
+
+    Returns:
+        boto3 DynamoDB service resource
+    """
+    resource = _clients.get("dynamodb")
+    if resource is None:
+        resource = boto3.resource(
+            "dynamodb",
+            region_name=os.environ.get("AWS_REGION", "us-east-1"),
+            endpoint_url=os.environ.get("LOCALSTACK_ENDPOINT"),
+        )
+        _clients["dynamodb"] = register_client(resource)
+    return resource
+
+
+def s3() -> Any:
+    """
+    Get the container's S3 client.
+
+    Returns:
+        boto3 S3 client
+    """
+    client = _clients.get("s3")
+    if client is None:
+        client = boto3.client(
+            "s3",
+            region_name=os.environ.get("AWS_REGION", "us-east-1"),
+            endpoint_url=os.environ.get("LOCALSTACK_ENDPOINT"),
+        )
+        _clients["s3"] = register_client(client)
+    return client
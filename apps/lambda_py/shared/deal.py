@@ -0,0 +1,267 @@
+"""Cryptographically secure shuffling and dealing for Guandan hands.
+
+Cards are encoded as integers 0-107 so a whole deck fits in a 108-byte
+``bytes`` object:
+
+* 0-103: two standard decks, ``code % 52`` gives ``suit * 13 + rank``
+* 104-105: small jokers
+* 106-107: big jokers
+
+Randomness comes from one bulk ``secrets.token_bytes`` draw that is sliced
+into 16-bit samples and turned into unbiased Fisher-Yates swaps with
+rejection sampling, so shuffling many decks costs a single syscall.
+"""
+
+import math
+import secrets
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DECK_SIZE = 108
+NUM_PLAYERS = 4
+CARDS_PER_PLAYER = 27
+
+SUITS = ["♠", "♥", "♣", "♦"]
+RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+
+SMALL_JOKER_CODES = (104, 105)
+BIG_JOKER_CODES = (106, 107)
+
+_SAMPLE_BYTES = 2
+_SAMPLE_SPACE = 1 << (8 * _SAMPLE_BYTES)
+# Each swap for bound n accepts a sample below the largest multiple of n, so
+# the worst case (n = 108) rejects 16 / 65536 samples. A small margin covers
+# rejections without a second draw in practice.
+_SWAPS_PER_DECK = DECK_SIZE - 1
+_BYTES_PER_DECK = _SWAPS_PER_DECK * _SAMPLE_BYTES
+_REFILL_BYTES = 4096
+
+_ORDERED_DECK = bytes(range(DECK_SIZE))
+
+
+def decode_card(code: int) -> Tuple[str, str]:
+    """
+    Decode a compact card code into its rank and suit.
+
+    Args:
+        code: Card code in the range 0-107
+
+    Returns:
+        Tuple of (rank, suit), using ``JOKER`` as the suit for jokers
+    """
+    if not 0 <= code < DECK_SIZE:
+        raise ValueError(f"Invalid card code: {code}")
+
+    if code in SMALL_JOKER_CODES:
+        return "SMALL_JOKER", "JOKER"
+    if code in BIG_JOKER_CODES:
+        return "BIG_JOKER", "JOKER"
+
+    suit, rank = divmod(code % 52, 13)
+    return RANKS[rank], SUITS[suit]
+
+
+class RandomBuffer:
+    """Bulk CSPRNG byte buffer handing out unbiased bounded integers."""
+
+    def __init__(self, size: int = _REFILL_BYTES):
+        self._buffer = secrets.token_bytes(max(size, _SAMPLE_BYTES))
+        self._offset = 0
+
+    def _sample(self) -> int:
+        if self._offset + _SAMPLE_BYTES > len(self._buffer):
+            self._buffer = secrets.token_bytes(_REFILL_BYTES)
+            self._offset = 0
+
+        start = self._offset
+        self._offset += _SAMPLE_BYTES
+        return int.from_bytes(self._buffer[start:self._offset], "big")
+
+    def below(self, bound: int) -> int:
+        """
+        Return a uniformly distributed integer in ``[0, bound)``.
+
+        Args:
+            bound: Exclusive upper bound, at most 65536
+
+        Returns:
+            Random integer
+        """
+        if not 0 < bound <= _SAMPLE_SPACE:
+            raise ValueError(f"Bound out of range: {bound}")
+
+        limit = _SAMPLE_SPACE - (_SAMPLE_SPACE % bound)
+        while True:
+            value = self._sample()
+            if value < limit:
+                return value % bound
+
+
+def shuffle_deck(rng: Optional[RandomBuffer] = None) -> bytes:
+    """
+    Produce one uniformly shuffled 108-card deck.
+
+    Args:
+        rng: Optional shared random buffer (a fresh one is drawn if omitted)
+
+    Returns:
+        Deck as 108 bytes of card codes
+    """
+    rng = rng or RandomBuffer(_BYTES_PER_DECK + 64)
+    cards = bytearray(_ORDERED_DECK)
+
+    for i in range(DECK_SIZE - 1, 0, -1):
+        j = rng.below(i + 1)
+        cards[i], cards[j] = cards[j], cards[i]
+
+    return bytes(cards)
+
+
+def shuffle_many(count: int) -> Iterator[bytes]:
+    """
+    Produce many shuffled decks from a single bulk random draw.
+
+    Args:
+        count: Number of decks to shuffle
+
+    Returns:
+        Iterator of decks, each 108 bytes of card codes
+    """
+    rng = RandomBuffer(count * _BYTES_PER_DECK + 64)
+    for _ in range(count):
+        yield shuffle_deck(rng)
+
+
+def deal_hands(deck: bytes) -> Tuple[bytes, bytes, bytes, bytes]:
+    """
+    Split a shuffled deck into four 27-card hands.
+
+    Args:
+        deck: Shuffled deck of 108 card codes
+
+    Returns:
+        Four hands in seat order, each 27 bytes of card codes
+    """
+    if len(deck) != DECK_SIZE:
+        raise ValueError(f"Invalid deck size: expected {DECK_SIZE}, got {len(deck)}")
+
+    return tuple(  # type: ignore[return-value]
+        deck[seat * CARDS_PER_PLAYER:(seat + 1) * CARDS_PER_PLAYER]
+        for seat in range(NUM_PLAYERS)
+    )
+
+
+def deal(rng: Optional[RandomBuffer] = None) -> Tuple[bytes, bytes, bytes, bytes]:
+    """
+    Shuffle a fresh deck and deal it to four seats.
+
+    Args:
+        rng: Optional shared random buffer
+
+    Returns:
+        Four hands in seat order, each 27 bytes of card codes
+    """
+    return deal_hands(shuffle_deck(rng))
+
+
+def _chi_square_p_value(statistic: float, dof: int) -> float:
+    """Upper-tail p-value via the Wilson-Hilferty normal approximation."""
+    if dof <= 0:
+        return 1.0
+
+    k = 2.0 / (9.0 * dof)
+    z = ((statistic / dof) ** (1.0 / 3.0) - (1.0 - k)) / math.sqrt(k)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def _position_counts(decks: bytes) -> List[Counter]:
+    """Count how often each card lands in each position of concatenated decks."""
+    return [Counter(decks[position::DECK_SIZE]) for position in range(DECK_SIZE)]
+
+
+def _chi_square(counts: List[Counter], deck_count: int) -> Dict[str, float]:
+    """Chi-square statistic over a 108x108 position/card count table."""
+    if deck_count == 0:
+        raise ValueError("At least one deck is required")
+
+    expected = deck_count / DECK_SIZE
+    stddev = math.sqrt(expected * (1.0 - 1.0 / DECK_SIZE))
+    chi_square = 0.0
+    max_z = 0.0
+
+    for position_counts in counts:
+        for card in range(DECK_SIZE):
+            diff = position_counts.get(card, 0) - expected
+            chi_square += diff * diff / expected
+            max_z = max(max_z, abs(diff) / stddev)
+
+    dof = (DECK_SIZE - 1) * (DECK_SIZE - 1)
+    return {
+        "chi_square": chi_square,
+        "dof": dof,
+        "p_value": _chi_square_p_value(chi_square, dof),
+        "max_z": max_z,
+    }
+
+
+def position_bias(decks: bytes, deck_count: int) -> Dict[str, float]:
+    """
+    Run a chi-square test of card-by-position uniformity over many decks.
+
+    Decks are passed as one concatenated buffer so that every deck position
+    becomes a strided ``bytes`` slice counted at C speed, instead of looping
+    over each card of each deck in Python.
+
+    Args:
+        decks: Concatenated decks, ``deck_count * 108`` bytes
+        deck_count: Number of decks in the buffer
+
+    Returns:
+        Dictionary with ``chi_square``, ``dof``, ``p_value``, and the largest
+        per-cell deviation in standard deviations (``max_z``)
+    """
+    if len(decks) != deck_count * DECK_SIZE:
+        raise ValueError("Deck buffer length does not match deck count")
+
+    return _chi_square(_position_counts(decks), deck_count)
+
+
+def verify_shuffle(deck_count: int, batch_size: int = 100_000) -> Dict[str, float]:
+    """
+    Shuffle ``deck_count`` decks and test them for position bias.
+
+    Intended for offline verification runs over millions of deals; decks are
+    generated and counted in batches so memory stays bounded.
+
+    Args:
+        deck_count: Total number of decks to generate
+        batch_size: Decks per batch
+
+    Returns:
+        Result of :func:`position_bias` over all generated decks
+    """
+    totals: List[Counter] = [Counter() for _ in range(DECK_SIZE)]
+    remaining = deck_count
+
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        batch = b"".join(shuffle_many(size))
+        for total, counts in zip(totals, _position_counts(batch)):
+            total.update(counts)
+        remaining -= size
+
+    return _chi_square(totals, deck_count)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify shuffle fairness")
+    parser.add_argument("decks", nargs="?", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    result = verify_shuffle(args.decks)
+    print(
+        f"decks={args.decks} chi2={result['chi_square']:.1f} dof={result['dof']} "
+        f"p={result['p_value']:.4f} max_z={result['max_z']:.2f}"
+    )
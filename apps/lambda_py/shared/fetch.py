@@ -0,0 +1,180 @@
+"""Concurrent multi-key DynamoDB fetch helper.
+
+Handlers that need several items at once (a room, its four players and the
+room's connection list) describe every read up front and get them back in
+one call. Point reads are grouped into ``BatchGetItem`` requests across
+tables, and those batches run concurrently with any extra queries on a
+module-level thread pool that survives warm invocations.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from . import aws
+
+dynamodb = aws.dynamodb()
+
+BATCH_GET_LIMIT = 100
+MAX_UNPROCESSED_RETRIES = 5
+# Time reserved after the fetch for the handler to build its response.
+DEFAULT_SAFETY_MARGIN_MS = 500
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("FETCH_MAX_WORKERS", "8")),
+    thread_name_prefix="fetch",
+)
+
+
+class FetchTimeoutError(TimeoutError):
+    """Raised when reads do not finish within the invocation's time budget."""
+
+
+@dataclass(frozen=True)
+class Get:
+    """A point read of one item, optionally parsed into a pydantic model."""
+
+    table: str
+    key: Mapping[str, Any]
+    model: Optional[Type[BaseModel]] = None
+
+
+@dataclass
+class FetchResult:
+    """Results of a multi-key fetch, addressed by the names given in the request."""
+
+    items: Dict[str, Any] = field(default_factory=dict)
+    queries: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.items:
+            return self.items[name]
+        return self.queries[name]
+
+
+def _key_id(key: Mapping[str, Any], names: Tuple[str, ...]) -> Tuple[Any, ...]:
+    """Hashable identity of a key given its attribute names."""
+    return tuple(key[name] for name in names)
+
+
+def _batch_get(request_items: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Run one BatchGetItem, retrying unprocessed keys with backoff."""
+    found: Dict[str, List[Dict[str, Any]]] = {table: [] for table in request_items}
+    pending = request_items
+
+    for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+        response = dynamodb.batch_get_item(RequestItems=pending)
+        for table, items in response.get("Responses", {}).items():
+            found[table].extend(items)
+
+        pending = response.get("UnprocessedKeys") or {}
+        if not pending:
+            return found
+        time.sleep(0.01 * (2 ** attempt))
+
+    raise RuntimeError("BatchGetItem left keys unprocessed after retries")
+
+
+def _chunk_gets(
+    gets: Mapping[str, Get],
+) -> Tuple[List[Dict[str, Dict[str, Any]]], Dict[str, Tuple[str, ...]]]:
+    """Group unique keys into BatchGetItem request bodies of at most 100 keys."""
+    key_names: Dict[str, Tuple[str, ...]] = {}
+    unique: Dict[Tuple[str, Tuple[Any, ...]], Mapping[str, Any]] = {}
+
+    for get in gets.values():
+        names = key_names.setdefault(get.table, tuple(sorted(get.key)))
+        if tuple(sorted(get.key)) != names:
+            raise ValueError(f"Inconsistent key attributes for table {get.table}")
+        unique.setdefault((get.table, _key_id(get.key, names)), get.key)
+
+    chunks: List[Dict[str, Dict[str, Any]]] = []
+    keys = list(unique.items())
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        chunk: Dict[str, Dict[str, Any]] = {}
+        for (table, _), key in keys[start:start + BATCH_GET_LIMIT]:
+            chunk.setdefault(table, {"Keys": []})["Keys"].append(dict(key))
+        chunks.append(chunk)
+
+    return chunks, key_names
+
+
+def time_budget(context: Any, safety_margin_ms: int = DEFAULT_SAFETY_MARGIN_MS) -> float:
+    """
+    Seconds available for reads in the current invocation.
+
+    Args:
+        context: Lambda context
+        safety_margin_ms: Milliseconds to keep in reserve
+
+    Returns:
+        Timeout in seconds (never negative)
+    """
+    remaining_ms: int = context.get_remaining_time_in_millis()
+    return max(0.0, (remaining_ms - safety_margin_ms) / 1000)
+
+
+def fetch(
+    gets: Optional[Mapping[str, Get]] = None,
+    queries: Optional[Mapping[str, Callable[[], Any]]] = None,
+    context: Any = None,
+    timeout: Optional[float] = None,
+) -> FetchResult:
+    """
+    Fetch many items and query results concurrently.
+
+    Args:
+        gets: Point reads by result name
+        queries: Independent read callables by result name (e.g. a GSI query)
+        context: Lambda context used to derive the timeout when none is given
+        timeout: Explicit timeout in seconds
+
+    Returns:
+        Items (None when missing, a model instance when ``model`` is set)
+        and query results, addressed by name
+
+    Raises:
+        FetchTimeoutError: If the reads do not finish in time
+    """
+    gets = gets or {}
+    queries = queries or {}
+    if timeout is None and context is not None:
+        timeout = time_budget(context)
+
+    chunks, key_names = _chunk_gets(gets)
+    batch_futures = [_executor.submit(_batch_get, chunk) for chunk in chunks]
+    query_futures = {name: _executor.submit(query) for name, query in queries.items()}
+
+    all_futures = batch_futures + list(query_futures.values())
+    done, not_done = wait(all_futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+    for future in done:
+        error = future.exception()
+        if error is not None:
+            for pending in not_done:
+                pending.cancel()
+            raise error
+    if not_done:
+        raise FetchTimeoutError(f"{len(not_done)} read(s) did not finish in {timeout:.3f}s")
+
+    index: Dict[Tuple[str, Tuple[Any, ...]], Dict[str, Any]] = {}
+    for future in batch_futures:
+        for table, items in future.result().items():
+            for item in items:
+                index[(table, _key_id(item, key_names[table]))] = item
+
+    result = FetchResult()
+    for name, get in gets.items():
+        found = index.get((get.table, _key_id(get.key, key_names[get.table])))
+        if found is not None and get.model is not None:
+            result.items[name] = get.model(**found)
+        else:
+            result.items[name] = found
+
+    for name, future in query_futures.items():
+        result.queries[name] = future.result()
+
+    return result
@@ -0,0 +1,303 @@
+"""Optimistic-concurrency room repository backed by DynamoDB.
+
+Every room item carries a numeric ``version``. Writers read the room, apply
+their change and write it back with a ``ConditionExpression`` on the version
+they read, retrying with jittered exponential backoff when another writer
+got there first. End-of-hand settlement updates the room and all four player
+rows in a single ``TransactWriteItems`` call, so no lock table is needed.
+"""
+
+import os
+import random
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from botocore.exceptions import ClientError
+
+from . import aws
+
+dynamodb = aws.dynamodb()
+
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_BASE_DELAY = 0.01
+DEFAULT_MAX_DELAY = 0.5
+
+
+class VersionConflictError(Exception):
+    """Raised when a versioned write keeps losing to concurrent writers."""
+
+
+class RoomNotFoundError(Exception):
+    """Raised when a room does not exist."""
+
+
+def _is_conditional_failure(error: ClientError) -> bool:
+    """Check whether a write failed on its condition expression."""
+    code = error.response.get("Error", {}).get("Code")
+    if code == "ConditionalCheckFailedException":
+        return True
+    if code == "TransactionCanceledException":
+        reasons = error.response.get("CancellationReasons", [])
+        return any(r.get("Code") == "ConditionalCheckFailed" for r in reasons)
+    return False
+
+
+class GameStore:
+    """Room and player repository using compare-and-swap on ``version``."""
+
+    def __init__(
+        self,
+        rooms_table_name: Optional[str] = None,
+        players_table_name: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        self.rooms_table_name = rooms_table_name or os.environ.get("ROOMS_TABLE_NAME", "Rooms")
+        self.players_table_name = players_table_name or os.environ.get(
+            "USERS_TABLE_NAME", "Users"
+        )
+        self.rooms = dynamodb.Table(self.rooms_table_name)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.conflicts = 0
+
+    def _backoff(self, attempt: int) -> None:
+        """Sleep with full jitter before the next attempt."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        time.sleep(random.uniform(0, cap))
+
+    def create_room(self, room_id: str, attributes: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Create a room at version 1.
+
+        Args:
+            room_id: Room ID
+            attributes: Initial room attributes
+
+        Returns:
+            Stored room item
+
+        Raises:
+            VersionConflictError: If the room already exists
+        """
+        item = {**attributes, "room_id": room_id, "version": 1}
+        try:
+            self.rooms.put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(room_id)",
+            )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                raise VersionConflictError(f"Room {room_id} already exists") from e
+            raise
+        return item
+
+    def get_room(self, room_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a room with a strongly consistent read.
+
+        Args:
+            room_id: Room ID
+
+        Returns:
+            Room item or None if not found
+        """
+        response = self.rooms.get_item(Key={"room_id": room_id}, ConsistentRead=True)
+        item: Optional[Dict[str, Any]] = response.get("Item")
+        return item
+
+    def put_room_if_version(self, item: Mapping[str, Any], expected_version: int) -> Dict[str, Any]:
+        """
+        Write a room only if its stored version still matches.
+
+        Args:
+            item: Room item to write (its version is replaced)
+            expected_version: Version the caller read
+
+        Returns:
+            Stored room item with the incremented version
+
+        Raises:
+            VersionConflictError: If the stored version has moved on
+        """
+        new_item = {**item, "version": expected_version + 1}
+        try:
+            self.rooms.put_item(
+                Item=new_item,
+                ConditionExpression="version = :expected",
+                ExpressionAttributeValues={":expected": expected_version},
+            )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                raise VersionConflictError(
+                    f"Room {item['room_id']} is no longer at version {expected_version}"
+                ) from e
+            raise
+        return new_item
+
+    def update_room(
+        self,
+        room_id: str,
+        mutate: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Apply a change to a room with optimistic concurrency.
+
+        ``mutate`` receives the current room item and returns the new one. It
+        may run several times, so it must not have side effects.
+
+        Args:
+            room_id: Room ID
+            mutate: Function producing the new room item
+
+        Returns:
+            Stored room item
+
+        Raises:
+            RoomNotFoundError: If the room does not exist
+            VersionConflictError: If every attempt lost to a concurrent writer
+        """
+        for attempt in range(self.max_attempts):
+            current = self.get_room(room_id)
+            if current is None:
+                raise RoomNotFoundError(f"Room {room_id} not found")
+
+            expected_version = int(current["version"])
+            updated = mutate(dict(current))
+            updated["room_id"] = room_id
+
+            try:
+                return self.put_room_if_version(updated, expected_version)
+            except VersionConflictError:
+                self.conflicts += 1
+                if attempt + 1 < self.max_attempts:
+                    self._backoff(attempt)
+
+        raise VersionConflictError(
+            f"Room {room_id} update failed after {self.max_attempts} attempts"
+        )
+
+    def settle_hand(
+        self,
+        room_id: str,
+        expected_version: int,
+        room_attributes: Mapping[str, Any],
+        player_deltas: Mapping[str, Mapping[str, int]],
+        player_attributes: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> int:
+        """
+        Commit an end-of-hand settlement atomically.
+
+        The room is updated only if it is still at ``expected_version``, and
+        every player row receives its numeric deltas (via ``ADD``) and
+        attribute overwrites (via ``SET``) in the same transaction.
+
+        Args:
+            room_id: Room ID
+            expected_version: Room version the settlement was computed from
+            room_attributes: Room attributes to set
+            player_deltas: Numeric deltas per player ID (e.g. ``{"coins": -20}``)
+            player_attributes: Optional attributes to set per player ID
+
+        Returns:
+            New room version
+
+        Raises:
+            VersionConflictError: If the room moved on or a player is missing
+        """
+        player_attributes = player_attributes or {}
+        items = [self._room_update(room_id, expected_version, room_attributes)]
+
+        for user_id in sorted(set(player_deltas) | set(player_attributes)):
+            if not player_deltas.get(user_id) and not player_attributes.get(user_id):
+                continue
+            items.append(
+                self._player_update(
+                    user_id,
+                    player_deltas.get(user_id, {}),
+                    player_attributes.get(user_id, {}),
+                )
+            )
+
+        try:
+            dynamodb.meta.client.transact_write_items(TransactItems=items)
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                raise VersionConflictError(f"Settlement for room {room_id} was rejected") from e
+            raise
+
+        return expected_version + 1
+
+    def _room_update(
+        self,
+        room_id: str,
+        expected_version: int,
+        attributes: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        """Build the versioned room update for a transaction."""
+        names = {"#version": "version"}
+        values: Dict[str, Any] = {":expected": expected_version, ":one": 1}
+        sets = []
+
+        for i, (name, value) in enumerate(sorted(attributes.items())):
+            names[f"#a{i}"] = name
+            values[f":a{i}"] = value
+            sets.append(f"#a{i} = :a{i}")
+
+        expression = "ADD #version :one"
+        if sets:
+            expression = f"SET {', '.join(sets)} {expression}"
+
+        return {
+            "Update": {
+                "TableName": self.rooms_table_name,
+                "Key": {"room_id": room_id},
+                "UpdateExpression": expression,
+                "ConditionExpression": "#version = :expected",
+                "ExpressionAttributeNames": names,
+                "ExpressionAttributeValues": values,
+            }
+        }
+
+    def _player_update(
+        self,
+        user_id: str,
+        deltas: Mapping[str, int],
+        attributes: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        """Build a player row update for a transaction."""
+        names: Dict[str, str] = {}
+        values: Dict[str, Any] = {}
+        adds = []
+        sets = []
+
+        for i, (name, delta) in enumerate(sorted(deltas.items())):
+            names[f"#d{i}"] = name
+            values[f":d{i}"] = Decimal(delta)
+            adds.append(f"#d{i} :d{i}")
+
+        for i, (name, value) in enumerate(sorted(attributes.items())):
+            names[f"#s{i}"] = name
+            values[f":s{i}"] = value
+            sets.append(f"#s{i} = :s{i}")
+
+        clauses = []
+        if sets:
+            clauses.append(f"SET {', '.join(sets)}")
+        if adds:
+            clauses.append(f"ADD {', '.join(adds)}")
+
+        update: Dict[str, Any] = {
+            "TableName": self.players_table_name,
+            "Key": {"user_id": user_id},
+            "UpdateExpression": " ".join(clauses),
+            "ConditionExpression": "attribute_exists(user_id)",
+        }
+        if names:
+            update["ExpressionAttributeNames"] = names
+            update["ExpressionAttributeValues"] = values
+
+        return {"Update": update}
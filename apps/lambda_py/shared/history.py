@@ -0,0 +1,607 @@
+"""Compressed, seekable game-history archive on S3.
+
+Completed games are packed into binary move logs with the card codes from
+:mod:`shared.deal` and the plays from :mod:`shared.state_sync`, and many
+games are appended to one S3 object per batch. Each game is cut into
+frames of at most ``snapshot_interval`` plays. A frame starts with a
+snapshot of the hand (the cards each seat still holds, the turn and the
+finish order), so it is independently ``zlib``-compressed and can be
+replayed without the frames before it. A hand's first snapshot is the deal
+itself, so the deck is not stored separately; it is followed by the tribute
+and return-tribute transfers (see :mod:`shared.settlement`) that move cards
+between seats before the first play.
+
+The offset index is one small DynamoDB item per game (``HISTORY_TABLE_NAME``)
+recording the archive key and the byte range of every frame. Replaying a
+hand at a given move issues a single HTTP range read for the frame that
+contains it and applies at most ``snapshot_interval`` plays.
+
+Frame layout before compression (big-endian)::
+
+    header    H hand index | H first play | B turn | B turn after the frame
+              | B finished count | finished seats...
+    snapshot  4 x (B card count | card codes...)
+    tribute   B transfer count | (B giver | B receiver | B card)...
+    plays     H play count | (B seat | B card count | card codes...)...
+
+The turn after a play is the seat of the next play, so passes must be
+logged as plays with no cards. A turn of 255 means the hand is over.
+"""
+
+import os
+import struct
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import aws
+from .deal import NUM_PLAYERS, deal_hands
+from .state_sync import Play
+
+s3 = aws.s3()
+dynamodb = aws.dynamodb()
+
+DEFAULT_SNAPSHOT_INTERVAL = 32
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+COMPRESSION_LEVEL = 6
+
+_FRAME_HEADER = struct.Struct(">HHBBB")
+_COUNT = struct.Struct(">H")
+_PLAY = struct.Struct(">BB")
+_TRANSFER = struct.Struct(">BBB")
+_NO_TURN = 255
+
+
+class GameNotFoundError(Exception):
+    """Raised when a game is not in the history index."""
+
+
+@dataclass
+class Transfer:
+    """A card passed between seats after the deal (a tribute or its return)."""
+
+    giver: int
+    receiver: int
+    card: int
+
+
+@dataclass
+class HandLog:
+    """One dealt hand, the tribute transfers and the plays made in it, in order."""
+
+    deck: bytes
+    leader: int
+    plays: List[Play] = field(default_factory=list)
+    tribute: List[Transfer] = field(default_factory=list)
+
+
+@dataclass
+class GameLog:
+    """A completed game: consecutive hands played in one room."""
+
+    game_id: str
+    room_id: str
+    hands: List[HandLog] = field(default_factory=list)
+
+
+@dataclass
+class HandState:
+    """State of a hand after a number of plays."""
+
+    hand: int
+    move: int
+    turn: Optional[int]
+    cards: List[bytes]
+    finished: List[int] = field(default_factory=list)
+    last_play: Optional[Play] = None
+
+    @property
+    def hand_counts(self) -> Tuple[int, ...]:
+        """Cards left per seat."""
+        return tuple(len(cards) for cards in self.cards)
+
+    def apply(self, play: Play, next_turn: Optional[int]) -> None:
+        """
+        Apply one play (a pass when it has no cards).
+
+        Args:
+            play: Play to apply
+            next_turn: Seat to play next, or None if the hand is over
+
+        Raises:
+            ValueError: If the seat does not hold the played cards
+        """
+        held = self.cards[play.seat]
+        played = set(play.cards)
+        if len(played) != len(play.cards) or not played.issubset(held):
+            raise ValueError(f"Seat {play.seat} does not hold the cards of move {self.move}")
+
+        self.cards[play.seat] = bytes(code for code in held if code not in played)
+        if play.cards and not self.cards[play.seat]:
+            self.finished.append(play.seat)
+        self.last_play = play
+        self.move += 1
+        self.turn = next_turn
+
+
+def _with_next_turns(
+    plays: List[Play], end_turn: Optional[int]
+) -> Iterator[Tuple[Play, Optional[int]]]:
+    """Pair each play with the seat that plays after it."""
+    for i, play in enumerate(plays):
+        yield play, plays[i + 1].seat if i + 1 < len(plays) else end_turn
+
+
+def pass_cards(cards: List[bytes], tribute: List[Transfer]) -> None:
+    """
+    Apply tribute transfers to the hands, in order.
+
+    Args:
+        cards: Hands per seat, updated in place
+        tribute: Transfers to apply
+
+    Raises:
+        ValueError: If a giver does not hold the card
+    """
+    for transfer in tribute:
+        held = cards[transfer.giver]
+        if transfer.card not in held:
+            raise ValueError(f"Seat {transfer.giver} does not hold tribute card {transfer.card}")
+        cards[transfer.giver] = bytes(code for code in held if code != transfer.card)
+        cards[transfer.receiver] += bytes([transfer.card])
+
+
+def initial_state(hand_index: int, hand: HandLog) -> HandState:
+    """
+    Build the state of a freshly dealt hand after tribute.
+
+    Args:
+        hand_index: Position of the hand in its game
+        hand: Hand log
+
+    Returns:
+        State before the first play
+    """
+    cards = list(deal_hands(hand.deck))
+    pass_cards(cards, hand.tribute)
+    return HandState(hand=hand_index, move=0, turn=hand.leader, cards=cards)
+
+
+def _turn_byte(turn: Optional[int]) -> int:
+    """Encode a turn, using 255 for a finished hand."""
+    return _NO_TURN if turn is None else turn
+
+
+def _turn_value(value: int) -> Optional[int]:
+    """Decode a turn byte."""
+    return None if value == _NO_TURN else value
+
+
+def _encode_frame(
+    state: HandState,
+    plays: List[Play],
+    end_turn: Optional[int],
+    tribute: Optional[List[Transfer]] = None,
+) -> bytes:
+    """Pack a snapshot, the transfers and plays that follow it and the turn after them."""
+    parts = [
+        _FRAME_HEADER.pack(
+            state.hand,
+            state.move,
+            _turn_byte(state.turn),
+            _turn_byte(end_turn),
+            len(state.finished),
+        )
+    ]
+    parts.append(bytes(state.finished))
+    for cards in state.cards:
+        parts.append(bytes([len(cards)]))
+        parts.append(cards)
+    tribute = tribute or []
+    parts.append(bytes([len(tribute)]))
+    for transfer in tribute:
+        parts.append(_TRANSFER.pack(transfer.giver, transfer.receiver, transfer.card))
+    parts.append(_COUNT.pack(len(plays)))
+    for play in plays:
+        parts.append(_PLAY.pack(play.seat, len(play.cards)))
+        parts.append(play.cards)
+    return b"".join(parts)
+
+
+def _decode_frame(
+    data: bytes,
+) -> Tuple[HandState, List[Transfer], List[Play], Optional[int]]:
+    """
+    Unpack a frame into its snapshot, transfers, plays and the turn after them.
+
+    The snapshot is returned as stored, before the transfers are applied.
+    """
+    hand, move, turn, end_turn, finished_count = _FRAME_HEADER.unpack_from(data)
+    offset = _FRAME_HEADER.size
+    finished = list(data[offset:offset + finished_count])
+    offset += finished_count
+
+    cards: List[bytes] = []
+    for _ in range(NUM_PLAYERS):
+        count = data[offset]
+        cards.append(data[offset + 1:offset + 1 + count])
+        offset += 1 + count
+
+    tribute: List[Transfer] = []
+    for _ in range(data[offset]):
+        giver, receiver, card = _TRANSFER.unpack_from(data, offset + 1)
+        tribute.append(Transfer(giver=giver, receiver=receiver, card=card))
+        offset += _TRANSFER.size
+    offset += 1
+
+    (play_count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    plays: List[Play] = []
+    for _ in range(play_count):
+        seat, count = _PLAY.unpack_from(data, offset)
+        offset += _PLAY.size
+        plays.append(Play(seat=seat, cards=data[offset:offset + count]))
+        offset += count
+
+    if offset != len(data):
+        raise ValueError("Trailing bytes in history frame")
+
+    state = HandState(
+        hand=hand, move=move, turn=_turn_value(turn), cards=cards, finished=finished
+    )
+    return state, tribute, plays, _turn_value(end_turn)
+
+
+def encode_game(
+    game: GameLog,
+    snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+) -> Tuple[bytes, List[Tuple[int, int, int, int]]]:
+    """
+    Encode a game into compressed frames.
+
+    Args:
+        game: Game to encode
+        snapshot_interval: Plays per frame
+
+    Returns:
+        Encoded game and its frames as (hand, first play, offset, length),
+        with offsets relative to the start of the encoded game
+    """
+    if snapshot_interval < 1:
+        raise ValueError("snapshot_interval must be at least 1")
+
+    blob = bytearray()
+    frames: List[Tuple[int, int, int, int]] = []
+
+    for hand_index, hand in enumerate(game.hands):
+        state = initial_state(hand_index, hand)
+        dealt = HandState(
+            hand=hand_index, move=0, turn=hand.leader, cards=list(deal_hands(hand.deck))
+        )
+        for start in range(0, max(len(hand.plays), 1), snapshot_interval):
+            end = start + snapshot_interval
+            plays = hand.plays[start:end]
+            end_turn = hand.plays[end].seat if end < len(hand.plays) else None
+            # The first frame stores the deal and the transfers, later ones the state
+            frame = (
+                _encode_frame(dealt, plays, end_turn, hand.tribute)
+                if start == 0
+                else _encode_frame(state, plays, end_turn)
+            )
+            compressed = zlib.compress(frame, COMPRESSION_LEVEL)
+            frames.append((hand_index, start, len(blob), len(compressed)))
+            blob += compressed
+            for play, next_turn in _with_next_turns(plays, end_turn):
+                state.apply(play, next_turn)
+
+    return bytes(blob), frames
+
+
+def decode_game(game_id: str, room_id: str, blob: bytes, frames: List[Any]) -> GameLog:
+    """
+    Decode a whole game from its encoded bytes.
+
+    Args:
+        game_id: Game ID
+        room_id: Room ID
+        blob: Encoded game
+        frames: Frame list from :func:`encode_game` or the index
+
+    Returns:
+        Decoded game
+    """
+    game = GameLog(game_id=game_id, room_id=room_id)
+    for hand_index, first_play, offset, length in frames:
+        state, tribute, plays, _ = _decode_frame(
+            zlib.decompress(blob[int(offset):int(offset) + int(length)])
+        )
+        if int(first_play) == 0:
+            game.hands.append(
+                HandLog(deck=b"".join(state.cards), leader=state.turn or 0, tribute=tribute)
+            )
+        game.hands[int(hand_index)].plays.extend(plays)
+    return game
+
+
+class GameArchiver:
+    """Buffers completed games and writes them to S3 in batches."""
+
+    def __init__(
+        self,
+        bucket: Optional[str] = None,
+        prefix: Optional[str] = None,
+        table_name: Optional[str] = None,
+        snapshot_interval: Optional[int] = None,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ):
+        """
+        Initialize the archiver.
+
+        Args:
+            bucket: Bucket name (defaults to ``HISTORY_BUCKET``)
+            prefix: Key prefix (defaults to ``HISTORY_PREFIX``, ``games``)
+            table_name: Index table (defaults to ``HISTORY_TABLE_NAME``)
+            snapshot_interval: Plays per frame (defaults to ``HISTORY_SNAPSHOT_INTERVAL``)
+            max_batch_bytes: Buffered bytes that trigger a flush
+        """
+        self.bucket = bucket or os.environ.get("HISTORY_BUCKET", "guandan-history")
+        self.prefix = (prefix or os.environ.get("HISTORY_PREFIX", "games")).strip("/")
+        self.table = dynamodb.Table(
+            table_name or os.environ.get("HISTORY_TABLE_NAME", "GameHistory")
+        )
+        self.snapshot_interval = snapshot_interval or int(
+            os.environ.get("HISTORY_SNAPSHOT_INTERVAL", str(DEFAULT_SNAPSHOT_INTERVAL))
+        )
+        self.max_batch_bytes = max_batch_bytes
+        self._buffer = bytearray()
+        self._pending: List[Dict[str, Any]] = []
+
+    @property
+    def pending(self) -> int:
+        """Games buffered but not yet written."""
+        return len(self._pending)
+
+    def add(self, game: GameLog) -> Optional[str]:
+        """
+        Buffer a completed game, flushing when the batch is full.
+
+        Args:
+            game: Completed game
+
+        Returns:
+            Key of the archive written, if the game triggered a flush
+        """
+        blob, frames = encode_game(game, self.snapshot_interval)
+        base = len(self._buffer)
+        self._buffer += blob
+        self._pending.append(
+            {
+                "game_id": game.game_id,
+                "room_id": game.room_id,
+                "hands": len(game.hands),
+                "offset": base,
+                "length": len(blob),
+                "frames": [[hand, first, base + offset, length]
+                           for hand, first, offset, length in frames],
+            }
+        )
+        if len(self._buffer) >= self.max_batch_bytes:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """
+        Write the buffered games as one object and index them.
+
+        Returns:
+            Key of the archive written, or None if nothing was buffered
+        """
+        if not self._pending:
+            return None
+
+        key = f"{self.prefix}/{time.strftime('%Y/%m/%d', time.gmtime())}/{uuid.uuid4().hex}.bin"
+        s3.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=bytes(self._buffer),
+            ContentType="application/octet-stream",
+        )
+
+        archived_at = int(time.time())
+        with self.table.batch_writer(overwrite_by_pkeys=["game_id"]) as batch:
+            for entry in self._pending:
+                batch.put_item(Item={**entry, "key": key, "archived_at": archived_at})
+
+        self._buffer = bytearray()
+        self._pending = []
+        return key
+
+
+class GameHistory:
+    """Reads archived games by range request."""
+
+    def __init__(self, bucket: Optional[str] = None, table_name: Optional[str] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            bucket: Bucket name (defaults to ``HISTORY_BUCKET``)
+            table_name: Index table (defaults to ``HISTORY_TABLE_NAME``)
+        """
+        self.bucket = bucket or os.environ.get("HISTORY_BUCKET", "guandan-history")
+        self.table = dynamodb.Table(
+            table_name or os.environ.get("HISTORY_TABLE_NAME", "GameHistory")
+        )
+
+    def get_index(self, game_id: str) -> Dict[str, Any]:
+        """
+        Read a game's index item.
+
+        Args:
+            game_id: Game ID
+
+        Returns:
+            Index item with the archive key and frame ranges
+
+        Raises:
+            GameNotFoundError: If the game has not been archived
+        """
+        item: Optional[Dict[str, Any]] = self.table.get_item(Key={"game_id": game_id}).get("Item")
+        if item is None:
+            raise GameNotFoundError(f"Game {game_id} not found")
+        return item
+
+    def _read(self, key: str, offset: int, length: int) -> bytes:
+        """Fetch a byte range of an archive object."""
+        response = s3.get_object(
+            Bucket=self.bucket,
+            Key=key,
+            Range=f"bytes={offset}-{offset + length - 1}",
+        )
+        data: bytes = response["Body"].read()
+        return data
+
+    def load_game(self, game_id: str) -> GameLog:
+        """
+        Read and decode a whole game with one range read.
+
+        Args:
+            game_id: Game ID
+
+        Returns:
+            Decoded game
+        """
+        index = self.get_index(game_id)
+        base = int(index["offset"])
+        blob = self._read(index["key"], base, int(index["length"]))
+        frames = [(hand, first, int(offset) - base, length)
+                  for hand, first, offset, length in index["frames"]]
+        return decode_game(game_id, index["room_id"], blob, frames)
+
+    def replay(self, game_id: str, hand: int, move: Optional[int] = None) -> HandState:
+        """
+        Rebuild a hand's state after ``move`` plays.
+
+        Args:
+            game_id: Game ID
+            hand: Hand index within the game
+            move: Plays to apply (defaults to the whole hand)
+
+        Returns:
+            Hand state
+
+        Raises:
+            GameNotFoundError: If the game has not been archived
+            ValueError: If the hand or move is out of range
+        """
+        index = self.get_index(game_id)
+        frames = [
+            (int(first), int(offset), int(length))
+            for frame_hand, first, offset, length in index["frames"]
+            if int(frame_hand) == hand
+        ]
+        if not frames:
+            raise ValueError(f"Game {game_id} has no hand {hand}")
+        if move is not None and move < 0:
+            raise ValueError("move must not be negative")
+
+        candidates = frames if move is None else [f for f in frames if f[0] <= move]
+        first, offset, length = candidates[-1]
+        state, tribute, plays, end_turn = _decode_frame(
+            zlib.decompress(self._read(index["key"], offset, length))
+        )
+        pass_cards(state.cards, tribute)
+
+        remaining = len(plays) if move is None else move - first
+        if remaining > len(plays):
+            raise ValueError(f"Hand {hand} has only {first + len(plays)} moves")
+        for play, next_turn in list(_with_next_turns(plays, end_turn))[:remaining]:
+            state.apply(play, next_turn)
+        return state
+
+
+def iter_states(game: GameLog, hand: int) -> Iterator[HandState]:
+    """
+    Yield a hand's state before the first play and after every play.
+
+    Args:
+        game: Decoded game
+        hand: Hand index
+
+    Returns:
+        Iterator of states (the same object, updated in place)
+    """
+    state = initial_state(hand, game.hands[hand])
+    yield state
+    for play, next_turn in _with_next_turns(game.hands[hand].plays, None):
+        state.apply(play, next_turn)
+        yield state
+
+
+def game_to_dict(game: GameLog) -> Dict[str, Any]:
+    """
+    Serialize a game for a queue message, with card codes as hex strings.
+
+    Args:
+        game: Game to serialize
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {
+        "gameId": game.game_id,
+        "roomId": game.room_id,
+        "hands": [
+            {
+                "deck": hand.deck.hex(),
+                "leader": hand.leader,
+                "plays": [[play.seat, play.cards.hex()] for play in hand.plays],
+                "tribute": [[t.giver, t.receiver, t.card] for t in hand.tribute],
+            }
+            for hand in game.hands
+        ],
+    }
+
+
+def game_from_dict(data: Dict[str, Any]) -> GameLog:
+    """
+    Parse a game produced by :func:`game_to_dict`.
+
+    Args:
+        data: Serialized game
+
+    Returns:
+        Game log
+
+    Raises:
+        ValueError: If the game is malformed
+    """
+    try:
+        game = GameLog(
+            game_id=str(data["gameId"]),
+            room_id=str(data["roomId"]),
+            hands=[
+                HandLog(
+                    deck=bytes.fromhex(hand["deck"]),
+                    leader=int(hand["leader"]),
+                    plays=[
+                        Play(seat=int(seat), cards=bytes.fromhex(cards))
+                        for seat, cards in hand.get("plays", [])
+                    ],
+                    tribute=[
+                        Transfer(giver=int(giver), receiver=int(receiver), card=int(card))
+                        for giver, receiver, card in hand.get("tribute", [])
+                    ],
+                )
+                for hand in data["hands"]
+            ],
+        )
+        # Replay every hand once so a bad log is rejected before archiving
+        for hand_index in range(len(game.hands)):
+            for _ in iter_states(game, hand_index):
+                pass
+    except (IndexError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed game: {e}") from e
+    return game
@@ -0,0 +1,228 @@
+"""Materialized leaderboards with sharded score counters.
+
+Scores live in a single ``Leaderboard`` table (hash key ``pk``) holding
+three kinds of items:
+
+* ``score#<season>#<region>#<user_id>#<shard>``: one of ``SCORE_SHARDS``
+  counters per player. Each hand's points go to a random shard, so a
+  player in many concurrent games does not throttle one item. A player's
+  total is the sum of the shards.
+* ``top#<season>#<region>``: the precomputed top-N list with a ``version``
+  for compare-and-swap updates. ``GET /leaderboard`` reads only this item.
+* ``hand#<hand_id>``: marker written in the same transaction as a hand's
+  counter updates, so a redelivered stream record is applied once.
+
+The top-N item is rewritten at most once per board per stream batch, with
+the exact totals of the players that batch touched. A player below the
+cutoff only re-enters when one of their own results is processed, so a
+board is exact for its top entries as long as scores only grow between
+their updates; a player whose total decreases can leave a stale gap below
+the cutoff until the next player there scores.
+"""
+
+import os
+import random
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from . import aws
+from .fetch import Get, fetch
+from .game_store import VersionConflictError
+
+dynamodb = aws.dynamodb()
+
+DEFAULT_SEASON = os.environ.get("LEADERBOARD_SEASON", "default")
+DEFAULT_REGION = "global"
+MAX_CAS_ATTEMPTS = 8
+HAND_MARKER_TTL_SECONDS = 7 * 24 * 3600
+
+
+def board_key(season: str, region: str) -> str:
+    """Partition key of a board's top-N item."""
+    return f"top#{season}#{region}"
+
+
+def shard_key(season: str, region: str, user_id: str, shard: int) -> str:
+    """Partition key of one of a player's score counters."""
+    return f"score#{season}#{region}#{user_id}#{shard}"
+
+
+class Leaderboard:
+    """Sharded score counters and top-N boards in one table."""
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        shards: Optional[int] = None,
+        size: Optional[int] = None,
+    ):
+        """
+        Initialize the leaderboard store.
+
+        Args:
+            table_name: Table name (defaults to ``LEADERBOARD_TABLE_NAME``)
+            shards: Counters per player (defaults to ``SCORE_SHARDS``, 4)
+            size: Entries kept per board (defaults to ``LEADERBOARD_SIZE``, 100)
+        """
+        self.table_name = table_name or os.environ.get("LEADERBOARD_TABLE_NAME", "Leaderboard")
+        self.table = dynamodb.Table(self.table_name)
+        self.shards = shards or int(os.environ.get("SCORE_SHARDS", "4"))
+        self.size = size or int(os.environ.get("LEADERBOARD_SIZE", "100"))
+
+    def record_hand(
+        self,
+        hand_id: str,
+        season: str,
+        region: str,
+        scores: Mapping[str, int],
+    ) -> bool:
+        """
+        Add one hand's points to the players' counters exactly once.
+
+        Args:
+            hand_id: Unique hand ID
+            season: Season
+            region: Region
+            scores: Points per user ID
+
+        Returns:
+            False if the hand was already recorded
+        """
+        items: List[Dict[str, Any]] = [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": {
+                        "pk": f"hand#{hand_id}",
+                        "expires_at": int(time.time()) + HAND_MARKER_TTL_SECONDS,
+                    },
+                    "ConditionExpression": "attribute_not_exists(pk)",
+                }
+            }
+        ]
+        for user_id, points in sorted(scores.items()):
+            if not points:
+                continue
+            shard = random.randrange(self.shards)
+            items.append(
+                {
+                    "Update": {
+                        "TableName": self.table_name,
+                        "Key": {"pk": shard_key(season, region, user_id, shard)},
+                        "UpdateExpression": "ADD score :points SET user_id = :user",
+                        "ExpressionAttributeValues": {
+                            ":points": Decimal(points),
+                            ":user": user_id,
+                        },
+                    }
+                }
+            )
+
+        try:
+            dynamodb.meta.client.transact_write_items(TransactItems=items)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "TransactionCanceledException":
+                reasons = e.response.get("CancellationReasons", [])
+                if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                    return False
+            raise
+        return True
+
+    def player_totals(self, season: str, region: str, user_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Sum the score shards of several players.
+
+        Args:
+            season: Season
+            region: Region
+            user_ids: Players to read
+
+        Returns:
+            Total score per user ID
+        """
+        user_ids = list(user_ids)
+        gets = {
+            f"{user_id}#{shard}": Get(
+                self.table_name, {"pk": shard_key(season, region, user_id, shard)}
+            )
+            for user_id in user_ids
+            for shard in range(self.shards)
+        }
+        totals = {user_id: 0 for user_id in user_ids}
+        if not gets:
+            return totals
+
+        result = fetch(gets)
+        for name in gets:
+            item = result.items[name]
+            if item is not None:
+                totals[item["user_id"]] += int(item.get("score", 0))
+        return totals
+
+    def get_board(self, season: str, region: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a board's top-N item.
+
+        Args:
+            season: Season
+            region: Region
+
+        Returns:
+            Item with ``entries`` (rank order) and ``version``, or None
+        """
+        item: Optional[Dict[str, Any]] = self.table.get_item(
+            Key={"pk": board_key(season, region)}
+        ).get("Item")
+        return item
+
+    def update_board(self, season: str, region: str, totals: Mapping[str, int]) -> Dict[str, Any]:
+        """
+        Merge new player totals into a board's top-N item.
+
+        Args:
+            season: Season
+            region: Region
+            totals: Exact current totals of the players to merge
+
+        Returns:
+            Stored board item
+
+        Raises:
+            VersionConflictError: If every attempt lost to a concurrent writer
+        """
+        key = board_key(season, region)
+
+        for attempt in range(MAX_CAS_ATTEMPTS):
+            current = self.table.get_item(Key={"pk": key}, ConsistentRead=True).get("Item")
+            version = int(current["version"]) if current else 0
+            scores = {e["user_id"]: int(e["score"]) for e in (current or {}).get("entries", [])}
+            scores.update(totals)
+
+            ranked: List[Tuple[str, int]] = sorted(scores.items(), key=lambda s: (-s[1], s[0]))
+            item = {
+                "pk": key,
+                "season": season,
+                "region": region,
+                "version": version + 1,
+                "updated_at": int(time.time()),
+                "entries": [
+                    {"user_id": user_id, "score": score} for user_id, score in ranked[: self.size]
+                ],
+            }
+
+            condition = "version = :expected" if current else "attribute_not_exists(pk)"
+            kwargs: Dict[str, Any] = {"ConditionExpression": condition}
+            if current:
+                kwargs["ExpressionAttributeValues"] = {":expected": version}
+            try:
+                self.table.put_item(Item=item, **kwargs)
+                return item
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+                time.sleep(random.uniform(0, 0.01 * (2 ** attempt)))
+
+        raise VersionConflictError(f"Leaderboard {key} update lost {MAX_CAS_ATTEMPTS} times")
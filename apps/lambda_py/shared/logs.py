@@ -0,0 +1,177 @@
+"""Logger configuration for hot request paths.
+
+Writing every INFO line with ``extra`` fields serializes it to JSON and
+writes it to stdout synchronously, which adds up at high request rates.
+This module keeps the detail without paying for it on every request:
+
+* :func:`create_logger` builds the powertools Logger with the static
+  fields (region, function version, memory size) computed once per
+  container, and debug sampling from ``POWERTOOLS_LOGGER_SAMPLE_RATE``.
+* :func:`buffered_logging` holds INFO and lower records in memory for the
+  duration of an invocation. They are formatted and written only when the
+  request errors (an ERROR record, an exception or a 5xx response), is
+  slower than ``LOG_BUFFER_SLOW_MS``, or falls in the
+  ``LOG_DETAIL_SAMPLE_RATE`` fraction of sampled requests. Otherwise they
+  are discarded unformatted. WARNING and above are always written at once.
+
+Set ``LOG_BUFFER=false`` to write every record immediately.
+"""
+
+import functools
+import logging
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_lambda_powertools import Logger
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+_STATIC_ENV_KEYS = {
+    "region": "AWS_REGION",
+    "function_version": "AWS_LAMBDA_FUNCTION_VERSION",
+    "memory_size": "AWS_LAMBDA_FUNCTION_MEMORY_SIZE",
+}
+_static_keys: Optional[Dict[str, str]] = None
+
+
+def static_log_keys() -> Dict[str, str]:
+    """
+    Fields that never change within a container, read from the environment once.
+
+    Returns:
+        Static log keys
+    """
+    global _static_keys
+    if _static_keys is None:
+        _static_keys = {
+            key: os.environ[env] for key, env in _STATIC_ENV_KEYS.items() if env in os.environ
+        }
+    return _static_keys
+
+
+def create_logger(service: str, **kwargs: Any) -> Logger:
+    """
+    Create a service Logger carrying the cached static fields.
+
+    Args:
+        service: Service name
+        **kwargs: Extra Logger options
+
+    Returns:
+        Powertools Logger
+    """
+    options: Dict[str, Any] = {**static_log_keys(), **kwargs}
+    return Logger(service=service, **options)
+
+
+class InvocationLogBuffer(logging.Filter):
+    """Logger filter holding low-severity records until the invocation ends."""
+
+    def __init__(self, logger: Any, level: int = logging.INFO, max_records: int = 200):
+        super().__init__()
+        self.logger = logger
+        self.level = level
+        self.max_records = max_records
+        self.records: List[logging.LogRecord] = []
+        self.dropped = 0
+        self.active = False
+        self.errored = False
+
+    def start(self) -> None:
+        """Start buffering for a new invocation."""
+        self.records.clear()
+        self.dropped = 0
+        self.errored = False
+        self.active = True
+
+    def flush(self) -> None:
+        """Write the buffered records and pass later records straight through."""
+        self.active = False
+        records, self.records = self.records, []
+        for record in records:
+            self.logger.callHandlers(record)
+        if self.dropped:
+            self.logger.warning("Log buffer overflow", extra={"dropped_records": self.dropped})
+            self.dropped = 0
+
+    def discard(self) -> None:
+        """Drop the buffered records without formatting them."""
+        self.active = False
+        self.records.clear()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.active:
+            return True
+        if record.levelno > self.level:
+            if record.levelno >= logging.ERROR:
+                self.errored = True
+                self.flush()
+            return True
+        if len(self.records) < self.max_records:
+            self.records.append(record)
+        else:
+            self.dropped += 1
+        return False
+
+
+def buffered_logging(
+    logger: Logger,
+    slow_ms: Optional[float] = None,
+    sample_rate: Optional[float] = None,
+) -> Callable[[Handler], Handler]:
+    """
+    Decorator buffering a handler's INFO and DEBUG records per invocation.
+
+    Apply inside ``logger.inject_lambda_context`` so flushed records still
+    carry the request's context fields.
+
+    Args:
+        logger: Powertools Logger used by the handler
+        slow_ms: Flush when the invocation takes longer; defaults to
+            ``LOG_BUFFER_SLOW_MS`` (1000)
+        sample_rate: Fraction of invocations flushed regardless; defaults
+            to ``LOG_DETAIL_SAMPLE_RATE`` (0.01)
+
+    Returns:
+        Decorator
+    """
+    if slow_ms is None:
+        slow_ms = float(os.environ.get("LOG_BUFFER_SLOW_MS", "1000"))
+    if sample_rate is None:
+        sample_rate = float(os.environ.get("LOG_DETAIL_SAMPLE_RATE", "0.01"))
+    enabled = os.environ.get("LOG_BUFFER", "true").lower() != "false"
+
+    def decorator(handler: Handler) -> Handler:
+        if not enabled:
+            return handler
+
+        buffer = InvocationLogBuffer(logger)
+        logger.addFilter(buffer)
+
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            if sample_rate > 0 and random.random() < sample_rate:
+                return handler(event, context)
+
+            buffer.start()
+            start = time.perf_counter()
+            try:
+                response = handler(event, context)
+            except BaseException:
+                buffer.flush()
+                raise
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            status = response.get("statusCode", 200) if isinstance(response, dict) else 200
+            if buffer.errored or status >= 500 or elapsed_ms > slow_ms:
+                buffer.flush()
+            else:
+                buffer.discard()
+            return response
+
+        return wrapper
+
+    return decorator
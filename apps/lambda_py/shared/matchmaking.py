@@ -0,0 +1,358 @@
+"""Skill- and latency-bucketed matchmaking queue.
+
+Waiting players are indexed in memory by ``(skill // skill_width,
+latency_ms // latency_width)``. Each tick walks the queue oldest first and
+looks for three partners for every player in the buckets around theirs.
+The search radius (in buckets, along both axes) grows by one every
+``widen_seconds`` the player has waited, up to ``max_widen``, so new players
+get close matches while long waits trade match quality for a room. Partners
+are chosen closest in skill first. All rooms of a tick are formed in one
+pass instead of one search per request.
+
+:class:`MatchmakingStore` persists tickets in DynamoDB (``MATCH_QUEUE_TABLE_NAME``).
+Queued tickets carry a ``queue`` attribute that feeds a sparse index
+(``queue`` hash key, ``enqueued_at`` range key), so the matchmaker loads only
+tickets newer than the last one it has seen. A formed room is committed in
+one ``TransactWriteItems`` that marks its four tickets matched (each on
+condition that it is still queued) and creates the room, so a player who
+left the queue in the meantime cannot be placed.
+"""
+
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from . import aws
+from .deal import NUM_PLAYERS
+
+dynamodb = aws.dynamodb()
+
+DEFAULT_SKILL_WIDTH = 100
+DEFAULT_LATENCY_WIDTH = 50
+DEFAULT_WIDEN_SECONDS = 10.0
+DEFAULT_MAX_WIDEN = 5
+
+QUEUE_NAME = "default"
+STATUS_QUEUED = "queued"
+STATUS_MATCHED = "matched"
+TICKET_TTL_SECONDS = 3600
+
+
+@dataclass
+class Ticket:
+    """A player waiting for a room."""
+
+    user_id: str
+    skill: int
+    latency_ms: int
+    enqueued_at: float
+
+
+class MatchQueue:
+    """In-memory bucketed index of waiting players."""
+
+    def __init__(
+        self,
+        skill_width: int = DEFAULT_SKILL_WIDTH,
+        latency_width: int = DEFAULT_LATENCY_WIDTH,
+        widen_seconds: float = DEFAULT_WIDEN_SECONDS,
+        max_widen: int = DEFAULT_MAX_WIDEN,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            skill_width: Skill points per bucket
+            latency_width: Milliseconds of latency per bucket
+            widen_seconds: Wait after which the search radius grows by one bucket
+            max_widen: Largest search radius in buckets
+        """
+        self.skill_width = skill_width
+        self.latency_width = latency_width
+        self.widen_seconds = widen_seconds
+        self.max_widen = max_widen
+        self._tickets: Dict[str, Ticket] = {}
+        self._buckets: Dict[Tuple[int, int], Dict[str, Ticket]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._tickets
+
+    def _bucket(self, ticket: Ticket) -> Tuple[int, int]:
+        """Index key of a ticket."""
+        return ticket.skill // self.skill_width, ticket.latency_ms // self.latency_width
+
+    def add(self, ticket: Ticket) -> None:
+        """
+        Add a ticket, replacing any earlier ticket of the same player.
+
+        Args:
+            ticket: Ticket to add
+        """
+        self.remove(ticket.user_id)
+        self._tickets[ticket.user_id] = ticket
+        self._buckets.setdefault(self._bucket(ticket), {})[ticket.user_id] = ticket
+
+    def remove(self, user_id: str) -> Optional[Ticket]:
+        """
+        Remove a player's ticket.
+
+        Args:
+            user_id: Player to remove
+
+        Returns:
+            The removed ticket, or None if the player was not queued
+        """
+        ticket = self._tickets.pop(user_id, None)
+        if ticket is not None:
+            key = self._bucket(ticket)
+            bucket = self._buckets[key]
+            del bucket[user_id]
+            if not bucket:
+                del self._buckets[key]
+        return ticket
+
+    def radius(self, ticket: Ticket, now: float) -> int:
+        """
+        Search radius of a ticket in buckets.
+
+        Args:
+            ticket: Waiting ticket
+            now: Epoch seconds
+
+        Returns:
+            Radius, growing with the wait up to ``max_widen``
+        """
+        waited = max(0.0, now - ticket.enqueued_at)
+        return min(self.max_widen, int(waited // self.widen_seconds))
+
+    def _neighbours(self, ticket: Ticket, radius: int) -> Iterator[Ticket]:
+        """Tickets in the buckets within ``radius`` of a ticket's bucket."""
+        skill, latency = self._bucket(ticket)
+        for ds in range(-radius, radius + 1):
+            for dl in range(-radius, radius + 1):
+                bucket = self._buckets.get((skill + ds, latency + dl))
+                if bucket:
+                    yield from bucket.values()
+
+    def tick(self, now: float) -> List[List[Ticket]]:
+        """
+        Form as many rooms as the current queue allows.
+
+        Args:
+            now: Epoch seconds
+
+        Returns:
+            Rooms of four tickets (anchor first); their players are removed
+        """
+        rooms: List[List[Ticket]] = []
+        partners = NUM_PLAYERS - 1
+
+        for anchor in sorted(self._tickets.values(), key=lambda t: t.enqueued_at):
+            if anchor.user_id not in self._tickets:
+                continue
+            candidates = [
+                t for t in self._neighbours(anchor, self.radius(anchor, now)) if t is not anchor
+            ]
+            if len(candidates) < partners:
+                continue
+
+            candidates.sort(key=lambda t: (abs(t.skill - anchor.skill), t.enqueued_at))
+            room = [anchor] + candidates[:partners]
+            for ticket in room:
+                self.remove(ticket.user_id)
+            rooms.append(room)
+
+        return rooms
+
+
+class MatchmakingStore:
+    """DynamoDB persistence for tickets and matched rooms."""
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        rooms_table_name: Optional[str] = None,
+        index_name: Optional[str] = None,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            table_name: Ticket table (defaults to ``MATCH_QUEUE_TABLE_NAME``)
+            rooms_table_name: Rooms table (defaults to ``ROOMS_TABLE_NAME``)
+            index_name: Sparse queue index (defaults to ``MATCH_QUEUE_INDEX``)
+        """
+        self.table_name = table_name or os.environ.get("MATCH_QUEUE_TABLE_NAME", "MatchQueue")
+        self.rooms_table_name = rooms_table_name or os.environ.get("ROOMS_TABLE_NAME", "Rooms")
+        self.index_name = index_name or os.environ.get(
+            "MATCH_QUEUE_INDEX", "queue-enqueued_at-index"
+        )
+        self.table = dynamodb.Table(self.table_name)
+
+    def enqueue(self, ticket: Ticket) -> None:
+        """
+        Store a queued ticket, replacing any earlier ticket of the player.
+
+        Args:
+            ticket: Ticket to store
+        """
+        self.table.put_item(
+            Item={
+                "user_id": ticket.user_id,
+                "skill": ticket.skill,
+                "latency_ms": ticket.latency_ms,
+                "enqueued_at": round(ticket.enqueued_at * 1000),
+                "queue": QUEUE_NAME,
+                "status": STATUS_QUEUED,
+                "expires_at": int(ticket.enqueued_at) + TICKET_TTL_SECONDS,
+            }
+        )
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a player's ticket.
+
+        Args:
+            user_id: Player ID
+
+        Returns:
+            Ticket item or None
+        """
+        item: Optional[Dict[str, Any]] = self.table.get_item(Key={"user_id": user_id}).get("Item")
+        return item
+
+    def cancel(self, user_id: str) -> bool:
+        """
+        Remove a player from the queue unless already matched.
+
+        Args:
+            user_id: Player ID
+
+        Returns:
+            False if the player was not queued
+        """
+        try:
+            self.table.delete_item(
+                Key={"user_id": user_id},
+                ConditionExpression="#status = :queued",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":queued": STATUS_QUEUED},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def load_since(self, enqueued_after_ms: int) -> List[Ticket]:
+        """
+        Read queued tickets newer than a watermark from the sparse index.
+
+        Args:
+            enqueued_after_ms: Watermark in epoch milliseconds
+
+        Returns:
+            Tickets, oldest first
+        """
+        query: Dict[str, Any] = {
+            "IndexName": self.index_name,
+            "KeyConditionExpression": (
+                Key("queue").eq(QUEUE_NAME) & Key("enqueued_at").gt(enqueued_after_ms)
+            ),
+        }
+        tickets: List[Ticket] = []
+        while True:
+            response = self.table.query(**query)
+            tickets.extend(
+                Ticket(
+                    user_id=item["user_id"],
+                    skill=int(item["skill"]),
+                    latency_ms=int(item["latency_ms"]),
+                    enqueued_at=int(item["enqueued_at"]) / 1000,
+                )
+                for item in response.get("Items", [])
+            )
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return tickets
+            query["ExclusiveStartKey"] = last_key
+
+    def commit_room(self, tickets: List[Ticket], now: float) -> Tuple[Optional[str], List[str]]:
+        """
+        Mark four tickets matched and create their room atomically.
+
+        Args:
+            tickets: Matched tickets in seat order
+            now: Epoch seconds
+
+        Returns:
+            Room ID (None if not created) and the players no longer queued
+        """
+        room_id = str(uuid.uuid4())
+        items: List[Dict[str, Any]] = [
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": {"user_id": ticket.user_id},
+                    "UpdateExpression": "SET #status = :matched, room_id = :room REMOVE #queue",
+                    "ConditionExpression": "#status = :queued AND enqueued_at = :enqueued",
+                    "ExpressionAttributeNames": {"#status": "status", "#queue": "queue"},
+                    "ExpressionAttributeValues": {
+                        ":matched": STATUS_MATCHED,
+                        ":queued": STATUS_QUEUED,
+                        ":room": room_id,
+                        ":enqueued": round(ticket.enqueued_at * 1000),
+                    },
+                }
+            }
+            for ticket in tickets
+        ]
+        items.append(
+            {
+                "Put": {
+                    "TableName": self.rooms_table_name,
+                    "Item": {
+                        "room_id": room_id,
+                        "version": 1,
+                        "status": "WAITING",
+                        "created_at": int(now),
+                        "seats": [
+                            {
+                                "user_id": t.user_id,
+                                "skill": t.skill,
+                                "is_ai": False,
+                                "ready": False,
+                            }
+                            for t in tickets
+                        ],
+                        "skill_spread": (
+                            max(t.skill for t in tickets) - min(t.skill for t in tickets)
+                        ),
+                    },
+                    "ConditionExpression": "attribute_not_exists(room_id)",
+                }
+            }
+        )
+
+        try:
+            dynamodb.meta.client.transact_write_items(TransactItems=items)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                raise
+            reasons = e.response.get("CancellationReasons", [])
+            gone = [
+                ticket.user_id
+                for ticket, reason in zip(tickets, reasons)
+                if reason.get("Code") == "ConditionalCheckFailed"
+            ]
+            if not gone:
+                raise
+            return None, gone
+        return room_id, []
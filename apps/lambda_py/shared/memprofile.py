@@ -0,0 +1,131 @@
+"""Sampled per-invocation allocation profiling.
+
+:func:`memory_profile` wraps a handler with ``tracemalloc`` snapshots and
+logs, for each sampled invocation, the peak traced memory above the
+pre-request baseline and the source lines that allocated the most. It is
+controlled by environment variables read when the handler module is
+imported:
+
+* ``MEMORY_PROFILE_SAMPLE_RATE``: fraction of invocations to profile
+  (default ``0``; the decorator then returns the handler unchanged)
+* ``MEMORY_PROFILE_TOP``: allocation sites to log (default ``10``)
+* ``MEMORY_PROFILE_FRAMES``: traceback depth per allocation (default ``1``)
+
+Tracing is started only for a sampled invocation and stopped after it, so
+unsampled invocations run at full speed.
+"""
+
+import functools
+import os
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _top_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int
+) -> List[Dict[str, Any]]:
+    """Source lines whose retained allocations grew the most between snapshots."""
+    stats = after.filter_traces(_FILTERS).compare_to(before.filter_traces(_FILTERS), "lineno")
+    growing = sorted((s for s in stats if s.size_diff > 0), key=lambda s: s.size_diff, reverse=True)
+    return [
+        {
+            "site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+            "size_kb": round(s.size_diff / 1024, 1),
+            "count": s.count_diff,
+        }
+        for s in growing[:limit]
+    ]
+
+
+def profile_call(
+    handler: Handler,
+    event: Dict[str, Any],
+    context: Any,
+    top: int = 10,
+    frames: int = 1,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run a handler under ``tracemalloc`` and measure its allocations.
+
+    Args:
+        handler: Lambda handler
+        event: Lambda event
+        context: Lambda context
+        top: Number of allocation sites to report
+        frames: Traceback depth per allocation
+
+    Returns:
+        (handler response, profile fields)
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        response = handler(event, context)
+
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    fields = {
+        "memory_peak_kb": round((peak - baseline) / 1024, 1),
+        "memory_retained_kb": round((current - baseline) / 1024, 1),
+        "memory_top_sites": _top_sites(before, after, top),
+    }
+    return response, fields
+
+
+def memory_profile(
+    logger: Any, sample_rate: Optional[float] = None
+) -> Callable[[Handler], Handler]:
+    """
+    Decorator logging allocation profiles for a sampled fraction of invocations.
+
+    Apply inside ``logger.inject_lambda_context`` so the profile line carries
+    the request ID.
+
+    Args:
+        logger: Logger receiving a ``Memory profile`` line with the fields
+        sample_rate: Fraction of invocations to profile; defaults to
+            ``MEMORY_PROFILE_SAMPLE_RATE``
+
+    Returns:
+        Decorator
+    """
+    if sample_rate is None:
+        sample_rate = float(os.environ.get("MEMORY_PROFILE_SAMPLE_RATE", "0"))
+    top = int(os.environ.get("MEMORY_PROFILE_TOP", "10"))
+    frames = int(os.environ.get("MEMORY_PROFILE_FRAMES", "1"))
+
+    def decorator(handler: Handler) -> Handler:
+        if sample_rate <= 0:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            if sample_rate < 1 and random.random() >= sample_rate:
+                return handler(event, context)
+
+            response, fields = profile_call(handler, event, context, top, frames)
+            logger.info("Memory profile", extra=fields)
+            return response
+
+        return wrapper
+
+    return decorator
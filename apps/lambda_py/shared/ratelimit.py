@@ -0,0 +1,267 @@
+"""Per-caller rate limiting with locally pre-aggregated DynamoDB counters.
+
+Each warm container keeps a token bucket per caller and decides locally,
+so an allowed request costs no DynamoDB call. Requests admitted since the
+last sync are added to a shared per-window counter with an atomic
+``UpdateItem ADD`` every ``sync_every`` requests, and on every request
+once the caller's known usage (the last synced total plus local requests)
+reaches ``near_limit`` of the limit. A caller far under its limit
+therefore costs one write per ``sync_every`` requests however slowly it
+calls, plus one when the window ends. The returned total tells the
+container whether the caller has used up the window across all
+containers; if so the caller is blocked locally until the window ends.
+
+Limits therefore hold approximately: a caller can exceed the global limit
+by at most the requests admitted between two syncs in each container.
+A failed sync keeps the usage and is retried after a backoff that
+doubles per consecutive failure, so an unavailable table is not called
+on every request.
+
+Counter items are keyed ``<caller>#<window start>`` and carry an
+``expires_at`` attribute for DynamoDB TTL.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from . import aws
+from .utils import create_response
+
+dynamodb = aws.dynamodb()
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+@dataclass
+class CallerState:
+    """Local bucket and unsynced usage for one caller."""
+
+    tokens: float
+    updated_at: float
+    window_start: int
+    pending: int = 0
+    synced_count: int = 0
+    blocked_until: float = 0.0
+    sync_after: float = 0.0
+    sync_failures: int = 0
+
+
+class RateLimiter:
+    """Token buckets per caller, synced to a DynamoDB counter in batches."""
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: int = 60,
+        burst: Optional[int] = None,
+        sync_every: int = 10,
+        near_limit: float = 0.8,
+        retry_backoff: float = 1.0,
+        table_name: Optional[str] = None,
+        max_callers: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Requests allowed per caller per window across containers
+            window_seconds: Window length
+            burst: Local bucket capacity (defaults to ``limit``)
+            sync_every: Sync after this many admitted requests
+            near_limit: Fraction of the limit from which every request syncs
+            retry_backoff: Seconds before retrying a failed sync (doubled per
+                consecutive failure, capped at the window length)
+            table_name: Counter table (defaults to ``RATE_LIMIT_TABLE_NAME``)
+            max_callers: Callers tracked per container before the least
+                recently seen is dropped
+            clock: Time source in seconds
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.capacity = float(burst if burst is not None else limit)
+        self.refill_rate = limit / window_seconds
+        self.sync_every = sync_every
+        self.near_limit = near_limit
+        self.retry_backoff = retry_backoff
+        self.table_name = table_name or os.environ.get("RATE_LIMIT_TABLE_NAME", "RateLimits")
+        self.table = dynamodb.Table(self.table_name)
+        self.max_callers = max_callers
+        self.clock = clock
+        self._callers: "OrderedDict[str, CallerState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.syncs = 0
+        self.sync_errors = 0
+
+    def _window_start(self, now: float) -> int:
+        return int(now // self.window_seconds) * self.window_seconds
+
+    def _state(self, caller: str, now: float) -> CallerState:
+        """Get or create a caller's state, refilled to ``now``."""
+        state = self._callers.get(caller)
+        if state is None:
+            state = CallerState(self.capacity, now, self._window_start(now))
+            self._callers[caller] = state
+            if len(self._callers) > self.max_callers:
+                self._callers.popitem(last=False)
+        else:
+            self._callers.move_to_end(caller)
+            elapsed = max(0.0, now - state.updated_at)
+            state.tokens = min(self.capacity, state.tokens + elapsed * self.refill_rate)
+            state.updated_at = now
+        return state
+
+    def _sync(self, caller: str, state: CallerState, now: float) -> None:
+        """Add the caller's unsynced usage to the shared window counter."""
+        if now < state.sync_after:
+            return
+        window_start = state.window_start
+        pending = state.pending
+        try:
+            response = self.table.update_item(
+                Key={"key": f"{caller}#{window_start}"},
+                UpdateExpression="ADD #count :n SET expires_at = :expires",
+                ExpressionAttributeNames={"#count": "count"},
+                ExpressionAttributeValues={
+                    ":n": pending,
+                    ":expires": window_start + 2 * self.window_seconds,
+                },
+                ReturnValues="UPDATED_NEW",
+            )
+        except (BotoCoreError, ClientError):
+            # Keep the usage and retry after a backoff; limits stay local meanwhile.
+            self.sync_errors += 1
+            state.sync_failures += 1
+            backoff = self.retry_backoff * 2 ** (state.sync_failures - 1)
+            state.sync_after = now + min(backoff, self.window_seconds)
+            return
+
+        state.pending -= pending
+        state.sync_failures = 0
+        state.sync_after = 0.0
+        self.syncs += 1
+        state.synced_count = int(response["Attributes"]["count"])
+        if state.synced_count >= self.limit:
+            state.blocked_until = window_start + self.window_seconds
+
+    def allow(self, caller: str) -> bool:
+        """
+        Admit or reject one request from a caller.
+
+        Args:
+            caller: Caller identity (user ID, source IP, ...)
+
+        Returns:
+            True if the request is within the limit
+        """
+        with self._lock:
+            now = self.clock()
+            state = self._state(caller, now)
+
+            window_start = self._window_start(now)
+            if window_start != state.window_start:
+                if state.pending:
+                    self._sync(caller, state, now)
+                state.window_start = window_start
+                state.pending = 0
+                state.synced_count = 0
+
+            if now < state.blocked_until or state.tokens < 1:
+                return False
+
+            state.tokens -= 1
+            state.pending += 1
+            known = state.synced_count + state.pending
+            if state.pending >= self.sync_every or known >= self.limit * self.near_limit:
+                self._sync(caller, state, now)
+            return True
+
+    def retry_after(self, caller: str) -> int:
+        """
+        Seconds until a rejected caller may try again.
+
+        Args:
+            caller: Caller identity
+
+        Returns:
+            Whole seconds, at least 1
+        """
+        with self._lock:
+            state = self._callers.get(caller)
+            if state is None:
+                return 1
+            now = self.clock()
+            wait = max(state.blocked_until - now, (1 - state.tokens) / self.refill_rate)
+            return max(1, int(wait + 0.999))
+
+
+def caller_identity(event: Dict[str, Any]) -> str:
+    """
+    Identify the caller of an API Gateway request.
+
+    Uses the verified ``sub`` claim when the request is authenticated and
+    the source IP otherwise.
+
+    Args:
+        event: API Gateway event
+
+    Returns:
+        Caller identity
+    """
+    request_context = event.get("requestContext") or {}
+    claims = (request_context.get("authorizer") or {}).get("claims") or {}
+    if claims.get("sub"):
+        return f"user:{claims['sub']}"
+    source_ip = (request_context.get("identity") or {}).get("sourceIp")
+    return f"ip:{source_ip or 'unknown'}"
+
+
+def rate_limit(
+    limiter: Optional[RateLimiter] = None,
+    key: Callable[[Dict[str, Any]], str] = caller_identity,
+) -> Callable[[Handler], Handler]:
+    """
+    Decorator answering 429 when the caller exceeds its limit.
+
+    Without a limiter one is built from ``RATE_LIMIT_PER_MINUTE`` (and
+    ``RATE_LIMIT_BURST``); if that is unset or ``0`` the handler is returned
+    unchanged.
+
+    Args:
+        limiter: Rate limiter to use
+        key: Function deriving the caller identity from the event
+
+    Returns:
+        Decorator
+    """
+    if limiter is None:
+        per_minute = int(os.environ.get("RATE_LIMIT_PER_MINUTE", "0"))
+        if per_minute > 0:
+            burst = os.environ.get("RATE_LIMIT_BURST")
+            limiter = RateLimiter(per_minute, 60, burst=int(burst) if burst else None)
+
+    def decorator(handler: Handler) -> Handler:
+        if limiter is None:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            caller = key(event)
+            if not limiter.allow(caller):
+                return create_response(
+                    429,
+                    {"error": "Too many requests"},
+                    headers={"Retry-After": str(limiter.retry_after(caller))},
+                )
+            return handler(event, context)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,188 @@
+"""Precompiled HTTP route table for API Gateway proxy events.
+
+Routes are registered with API Gateway style path templates such as
+``/users/{userId}`` or ``/files/{proxy+}``. Static templates resolve with a
+single dictionary lookup; templated ones are compiled to regular
+expressions once, bucketed by method. Handlers can be registered directly or
+mounted lazily by dotted path, so a single deployment can serve routes from
+several ``functions/<fn>`` packages while only importing the ones that
+receive traffic.
+"""
+
+import importlib
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .utils import create_response
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+_PARAM = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(\+?)\}")
+
+
+def compile_template(template: str) -> Tuple[Pattern[str], List[str]]:
+    """
+    Compile a path template to a regular expression.
+
+    Args:
+        template: Path template, e.g. ``/users/{userId}``
+
+    Returns:
+        Compiled pattern and the parameter names it captures
+    """
+    names: List[str] = []
+    pattern = ""
+    position = 0
+
+    for match in _PARAM.finditer(template):
+        pattern += re.escape(template[position:match.start()])
+        name, greedy = match.group(1), match.group(2)
+        names.append(name)
+        pattern += f"(?P<{name}>.+)" if greedy else f"(?P<{name}>[^/]+)"
+        position = match.end()
+
+    pattern += re.escape(template[position:])
+    return re.compile(f"^{pattern}$"), names
+
+
+class LazyHandler:
+    """Handler imported from a dotted path on first call."""
+
+    def __init__(self, dotted_path: str):
+        self.dotted_path = dotted_path
+        self._handler: Optional[Handler] = None
+
+    def load(self) -> Handler:
+        """
+        Import the target handler if it has not been imported yet.
+
+        Returns:
+            The handler callable
+        """
+        if self._handler is None:
+            module_name, _, attribute = self.dotted_path.rpartition(".")
+            self._handler = getattr(importlib.import_module(module_name), attribute)
+        return self._handler
+
+    def __call__(self, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        return self.load()(event, context)
+
+
+class Router:
+    """Route table keyed by HTTP method and path template."""
+
+    def __init__(self) -> None:
+        self._static: Dict[Tuple[str, str], Handler] = {}
+        self._dynamic: Dict[str, List[Tuple[Pattern[str], Handler]]] = {}
+        self._static_paths: Dict[str, List[str]] = {}
+        self._templates: List[Pattern[str]] = []
+
+    def add(self, method: str, template: str, handler: Handler) -> None:
+        """
+        Register a handler for a method and path template.
+
+        Args:
+            method: HTTP method
+            template: Path template
+            handler: Handler called with the event and context
+        """
+        method = method.upper()
+        if _PARAM.search(template):
+            pattern, _ = compile_template(template)
+            self._dynamic.setdefault(method, []).append((pattern, handler))
+            self._templates.append(pattern)
+        else:
+            self._static[(method, template)] = handler
+            self._static_paths.setdefault(template, []).append(method)
+
+    def route(self, method: str, template: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator form of :meth:`add`.
+
+        Args:
+            method: HTTP method
+            template: Path template
+
+        Returns:
+            Decorator registering the function
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            self.add(method, template, handler)
+            return handler
+
+        return decorator
+
+    def mount(self, dotted_path: str, routes: Iterable[Tuple[str, str]]) -> None:
+        """
+        Mount a handler by dotted path on several routes, importing it lazily.
+
+        Args:
+            dotted_path: e.g. ``functions.user.handler.handler``
+            routes: (method, template) pairs served by the handler
+        """
+        handler = LazyHandler(dotted_path)
+        for method, template in routes:
+            self.add(method, template, handler)
+
+    def preload(self) -> None:
+        """Import every lazily mounted handler (e.g. during a warmup)."""
+        handlers = list(self._static.values())
+        handlers.extend(handler for routes in self._dynamic.values() for _, handler in routes)
+        for handler in handlers:
+            if isinstance(handler, LazyHandler):
+                handler.load()
+
+    def resolve(self, method: str, path: str) -> Optional[Tuple[Handler, Dict[str, str]]]:
+        """
+        Find the handler and path parameters for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+
+        Returns:
+            (handler, path parameters), or None if no route matches
+        """
+        handler = self._static.get((method.upper(), path))
+        if handler is not None:
+            return handler, {}
+
+        for pattern, handler in self._dynamic.get(method.upper(), ()):
+            match = pattern.match(path)
+            if match:
+                return handler, match.groupdict()
+
+        return None
+
+    def path_exists(self, path: str) -> bool:
+        """Check whether any method is registered for a path."""
+        return path in self._static_paths or any(p.match(path) for p in self._templates)
+
+    def dispatch(self, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        """
+        Route an API Gateway proxy event to its handler.
+
+        Extracted path parameters are merged into ``pathParameters`` before
+        the handler runs.
+
+        Args:
+            event: API Gateway event
+            context: Lambda context
+
+        Returns:
+            Handler response, or a 404/405 response when nothing matches
+        """
+        method = event.get("httpMethod") or ""
+        path = event.get("path") or "/"
+        resolved = self.resolve(method, path)
+
+        if resolved is None:
+            if self.path_exists(path):
+                return create_response(405, {"error": "Method not allowed"})
+            return create_response(404, {"error": "Not found"})
+
+        handler, params = resolved
+        if params:
+            event = {**event, "pathParameters": {**(event.get("pathParameters") or {}), **params}}
+        return handler(event, context)
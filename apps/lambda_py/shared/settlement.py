@@ -0,0 +1,394 @@
+"""End-of-hand settlement: rank advancement, tribute and coins.
+
+Seats 0 and 2 form team 0, seats 1 and 3 team 1. The team of the first
+player out wins the hand and moves its level (``2`` up to ``A``, stored as
+an index into :data:`shared.deal.RANKS`) up by the partner's finish:
+
+* partner second (双上): three levels
+* partner third: two levels
+* partner last: one level
+
+A team already at ``A`` that wins with its partner not last wins the game.
+
+Tribute (进贡) for the next hand follows from the finish order: when both
+losers finished last (双下) each of them pays one card to a winner,
+otherwise the last player pays the first. A giver pays their highest card
+except the heart of the level rank, which is wild; the larger tribute goes
+to the first player out, and the player who paid it leads the next hand.
+Givers holding both big jokers between them refuse the tribute (抗贡) and
+the first player out leads.
+Every receiver returns a card of rank ten or below (还贡).
+
+Coins move ``base_coins`` per level won from each loser to each winner, and
+a player's career ``rank`` on the ``Users`` table grows by the levels their
+team won. All of it is computed in memory from the finish order, so the
+whole settlement is committed with a single
+:meth:`shared.game_store.GameStore.settle_hand` transaction. The same
+functions re-settle archived games in bulk (:func:`resettle`).
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .deal import BIG_JOKER_CODES, NUM_PLAYERS, RANKS, SMALL_JOKER_CODES, SUITS
+from .game_store import GameStore
+from .history import GameLog, Transfer, iter_states
+
+BASE_COINS = int(os.environ.get("SETTLEMENT_BASE_COINS", "10"))
+
+ACE = len(RANKS) - 1
+TEN = RANKS.index("10")
+HEARTS = SUITS.index("♥")
+JOKER_CODES = SMALL_JOKER_CODES + BIG_JOKER_CODES
+# Levels won by the winning team, by the partner's finishing position
+LEVELS_BY_PARTNER_FINISH = {1: 3, 2: 2, 3: 1}
+
+STATUS_SETTLED = "SETTLED"
+STATUS_FINISHED = "FINISHED"
+
+
+def team_of(seat: int) -> int:
+    """Team of a seat (partners sit opposite each other)."""
+    return seat % 2
+
+
+@dataclass
+class HandResult:
+    """How a hand ended.
+
+    ``seats`` holds the user ID per seat, None for AI players, and
+    ``levels`` each team's level index before the hand.
+    """
+
+    hand_id: str
+    seats: List[Optional[str]]
+    finish_order: List[int]
+    levels: Tuple[int, int] = (0, 0)
+
+
+@dataclass
+class Settlement:
+    """Computed outcome of a hand."""
+
+    hand_id: str
+    winning_team: int
+    levels_won: int
+    levels: Tuple[int, int]
+    game_over: bool
+    finish_order: List[int]
+    tribute_givers: List[int]
+    tribute_receivers: List[int]
+    rank_deltas: Dict[str, int] = field(default_factory=dict)
+    coin_deltas: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def level(self) -> int:
+        """Level index the next hand is played at (the winners')."""
+        return self.levels[self.winning_team]
+
+    def player_deltas(self) -> Dict[str, Dict[str, int]]:
+        """Numeric ``User`` deltas per user ID."""
+        return {
+            user_id: {"rank": self.rank_deltas.get(user_id, 0), "coins": coins}
+            for user_id, coins in self.coin_deltas.items()
+        }
+
+    def room_attributes(self, season: str, region: str) -> Dict[str, Any]:
+        """
+        Room attributes recording the settlement.
+
+        ``last_result`` is the record the leaderboard consumes from the
+        Rooms stream.
+
+        Args:
+            season: Leaderboard season
+            region: Leaderboard region
+
+        Returns:
+            Attributes to set on the room
+        """
+        return {
+            "status": STATUS_FINISHED if self.game_over else STATUS_SETTLED,
+            "levels": list(self.levels),
+            "level": self.level,
+            "finish_order": self.finish_order,
+            "tribute": {"givers": self.tribute_givers, "receivers": self.tribute_receivers},
+            "last_result": {
+                "hand_id": self.hand_id,
+                "season": season,
+                "region": region,
+                "scores": {
+                    user_id: delta for user_id, delta in self.rank_deltas.items() if delta
+                },
+            },
+        }
+
+
+def settle(result: HandResult, base_coins: int = BASE_COINS) -> Settlement:
+    """
+    Compute the outcome of a finished hand.
+
+    Args:
+        result: Finish order, seats and levels before the hand
+        base_coins: Coins per level won
+
+    Returns:
+        Settlement
+
+    Raises:
+        ValueError: If the finish order is not a permutation of the seats
+    """
+    order = list(result.finish_order)
+    if sorted(order) != list(range(NUM_PLAYERS)):
+        raise ValueError(f"Invalid finish order for hand {result.hand_id}: {order}")
+
+    first = order[0]
+    winners = team_of(first)
+    partner_finish = order.index((first + 2) % NUM_PLAYERS)
+    levels_won = LEVELS_BY_PARTNER_FINISH[partner_finish]
+
+    levels = list(result.levels)
+    game_over = levels[winners] == ACE and partner_finish < NUM_PLAYERS - 1
+    levels[winners] = min(ACE, levels[winners] + levels_won)
+
+    if partner_finish == 1:
+        givers, receivers = order[2:], order[:2]
+    else:
+        givers, receivers = order[-1:], order[:1]
+
+    settlement = Settlement(
+        hand_id=result.hand_id,
+        winning_team=winners,
+        levels_won=levels_won,
+        levels=(levels[0], levels[1]),
+        game_over=game_over,
+        finish_order=order,
+        tribute_givers=[] if game_over else givers,
+        tribute_receivers=[] if game_over else receivers,
+    )
+    for seat, user_id in enumerate(result.seats):
+        if user_id is None:
+            continue
+        won = team_of(seat) == winners
+        settlement.rank_deltas[user_id] = levels_won if won else 0
+        settlement.coin_deltas[user_id] = (1 if won else -1) * levels_won * base_coins
+    return settlement
+
+
+def card_strength(code: int, level: int) -> int:
+    """
+    Strength of a card when the level rank is ``level``.
+
+    Level cards rank above aces and below the jokers.
+
+    Args:
+        code: Card code
+        level: Level index into ``RANKS``
+
+    Returns:
+        Comparable strength
+    """
+    if code in BIG_JOKER_CODES:
+        return ACE + 3
+    if code in SMALL_JOKER_CODES:
+        return ACE + 2
+    rank = code % 13
+    return ACE + 1 if rank == level else rank
+
+
+def is_wild(code: int, level: int) -> bool:
+    """Whether a card is the heart of the level rank."""
+    return code not in JOKER_CODES and code % 13 == level and (code % 52) // 13 == HEARTS
+
+
+@dataclass
+class Exchange:
+    """One tribute card and the card returned for it."""
+
+    giver: int
+    receiver: int
+    card: int
+    returned: int
+
+
+@dataclass
+class TributeOutcome:
+    """Hands after tribute, the exchanges made and who leads."""
+
+    cards: List[bytes]
+    exchanges: List[Exchange]
+    leader: int
+    refused: bool = False
+
+    @property
+    def transfers(self) -> List[Transfer]:
+        """Card moves in the order they were made, for :attr:`HandLog.tribute`."""
+        return [
+            transfer
+            for e in self.exchanges
+            for transfer in (
+                Transfer(giver=e.giver, receiver=e.receiver, card=e.card),
+                Transfer(giver=e.receiver, receiver=e.giver, card=e.returned),
+            )
+        ]
+
+
+def pay_tribute(
+    cards: Sequence[bytes],
+    givers: Sequence[int],
+    receivers: Sequence[int],
+    level: int,
+) -> TributeOutcome:
+    """
+    Exchange tribute cards in freshly dealt hands.
+
+    Args:
+        cards: Dealt hands per seat
+        givers: Paying seats (from :attr:`Settlement.tribute_givers`)
+        receivers: Receiving seats, first player out first
+        level: Level index of the new hand
+
+    Returns:
+        Tribute outcome; ``cards`` is a new list and ``leader`` the giver of
+        the larger tribute (the first player out when tribute is refused)
+
+    Raises:
+        ValueError: If givers and receivers do not pair up
+    """
+    if len(givers) != len(receivers) or not receivers:
+        raise ValueError("Tribute needs one receiver per giver")
+
+    hands = [bytearray(hand) for hand in cards]
+    jokers = sum(code in BIG_JOKER_CODES for seat in givers for code in hands[seat])
+    if jokers == len(BIG_JOKER_CODES):
+        return TributeOutcome(cards=list(cards), exchanges=[], leader=receivers[0], refused=True)
+
+    def strength(code: int) -> int:
+        return card_strength(code, level)
+
+    tributes = [
+        (max((c for c in hands[seat] if not is_wild(c, level)), key=strength), seat)
+        for seat in givers
+    ]
+    # The larger tribute goes to the first player out; ties keep finish order
+    tributes.sort(key=lambda tribute: -strength(tribute[0]))
+
+    exchanges = []
+    for (card, giver), receiver in zip(tributes, receivers):
+        hands[giver].remove(card)
+        hands[receiver].append(card)
+        low = [c for c in hands[receiver] if strength(c) <= TEN and c != card]
+        returned = min(low or [c for c in hands[receiver] if c != card], key=strength)
+        hands[receiver].remove(returned)
+        hands[giver].append(returned)
+        exchanges.append(Exchange(giver=giver, receiver=receiver, card=card, returned=returned))
+
+    return TributeOutcome(
+        cards=[bytes(hand) for hand in hands],
+        exchanges=exchanges,
+        leader=exchanges[0].giver,
+    )
+
+
+def commit_settlement(
+    store: GameStore,
+    room_id: str,
+    expected_version: int,
+    settlement: Settlement,
+    season: str,
+    region: str,
+) -> int:
+    """
+    Write a settlement for the room and its players in one transaction.
+
+    Args:
+        store: Game store
+        room_id: Room ID
+        expected_version: Room version the hand was settled from
+        settlement: Computed settlement
+        season: Leaderboard season
+        region: Leaderboard region
+
+    Returns:
+        New room version
+
+    Raises:
+        VersionConflictError: If the room moved on or a player is missing
+    """
+    return store.settle_hand(
+        room_id,
+        expected_version,
+        settlement.room_attributes(season, region),
+        settlement.player_deltas(),
+    )
+
+
+def finish_order(game: GameLog, hand: int) -> List[int]:
+    """
+    Replay an archived hand to get its finish order.
+
+    Seats still holding cards when the hand ended are ranked by cards left.
+
+    Args:
+        game: Archived game
+        hand: Hand index
+
+    Returns:
+        Seats from first to last out
+    """
+    states = iter_states(game, hand)
+    state = next(states)
+    for state in states:
+        pass
+    order = list(state.finished)
+    remaining = [seat for seat in range(NUM_PLAYERS) if seat not in order]
+    return order + sorted(remaining, key=lambda seat: (len(state.cards[seat]), seat))
+
+
+@dataclass
+class PlayerTotals:
+    """A player's totals over re-settled games."""
+
+    rank: int = 0
+    coins: int = 0
+    hands: int = 0
+
+
+def resettle(
+    games: Iterable[Tuple[GameLog, Sequence[Optional[str]]]],
+    base_coins: int = BASE_COINS,
+) -> Dict[str, PlayerTotals]:
+    """
+    Recompute rank and coins from complete game logs.
+
+    Every game starts with both teams at level ``2``; a won game starts a
+    new one at ``2`` within the same log.
+
+    Args:
+        games: Game logs with the user ID per seat
+        base_coins: Coins per level won
+
+    Returns:
+        Totals per user ID
+    """
+    totals: Dict[str, PlayerTotals] = {}
+    for game, seats in games:
+        levels = (0, 0)
+        for hand in range(len(game.hands)):
+            settlement = settle(
+                HandResult(
+                    hand_id=f"{game.game_id}#{hand}",
+                    seats=list(seats),
+                    finish_order=finish_order(game, hand),
+                    levels=levels,
+                ),
+                base_coins,
+            )
+            levels = (0, 0) if settlement.game_over else settlement.levels
+            for user_id, coins in settlement.coin_deltas.items():
+                player = totals.setdefault(user_id, PlayerTotals())
+                player.rank += settlement.rank_deltas[user_id]
+                player.coins += coins
+                player.hands += 1
+    return totals
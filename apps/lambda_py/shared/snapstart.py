@@ -0,0 +1,126 @@
+"""Lambda SnapStart runtime hooks.
+
+With SnapStart, module-level initialization runs once, the execution
+environment is snapshotted, and every new environment is restored from that
+snapshot. Work that can be shared should therefore happen before the
+snapshot, and anything that must be unique or fresh per environment must be
+redone after restore:
+
+* before snapshot: load botocore service models into the default session,
+  build pydantic validators by running registered warmups, and initialize
+  the JSON encoder/decoder
+* after restore: re-seed ``random`` (otherwise every restored environment
+  would continue the same PRNG sequence), drop pooled HTTP connections that
+  were open when the snapshot was taken, and run registered refresh hooks
+
+Card shuffling in :mod:`shared.deal` draws from ``secrets`` on demand and
+keeps no buffer between calls, so it is unaffected by snapshot duplication.
+
+Outside the Lambda runtime the ``snapshot_restore_py`` module is missing and
+the hooks are only recorded; :func:`run_before_snapshot` and
+:func:`run_after_restore` can be called directly in tests.
+"""
+
+import json
+import os
+import random
+from typing import Any, Callable, List
+
+import boto3
+
+try:
+    from snapshot_restore_py import register_after_restore, register_before_snapshot
+except ImportError:  # Only available in the Lambda Python runtime
+    register_after_restore = None
+    register_before_snapshot = None
+
+DEFAULT_SERVICE_MODELS = ("dynamodb", "apigatewaymanagementapi")
+
+_warmups: List[Callable[[], Any]] = []
+_refreshers: List[Callable[[], Any]] = []
+_clients: List[Any] = []
+
+
+def register_warmup(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Register a function to run before the snapshot (usable as a decorator).
+
+    Args:
+        func: Warmup function, e.g. validating a sample pydantic model
+
+    Returns:
+        The function unchanged
+    """
+    _warmups.append(func)
+    return func
+
+
+def register_refresh(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Register a function to run after restore (usable as a decorator).
+
+    Args:
+        func: Refresh function, e.g. re-fetching short-lived credentials
+
+    Returns:
+        The function unchanged
+    """
+    _refreshers.append(func)
+    return func
+
+
+def register_client(client: Any) -> Any:
+    """
+    Track a boto3 client or resource whose connections must be reset on restore.
+
+    Args:
+        client: boto3 client or resource
+
+    Returns:
+        The client unchanged
+    """
+    _clients.append(client)
+    return client
+
+
+def _http_session(client: Any) -> Any:
+    """Find the botocore HTTP session behind a client or resource."""
+    if hasattr(client, "meta") and hasattr(client.meta, "client"):
+        client = client.meta.client
+    endpoint = getattr(client, "_endpoint", None)
+    return getattr(endpoint, "http_session", None)
+
+
+def run_before_snapshot() -> None:
+    """Warm service models, JSON codecs and registered warmups."""
+    # Creating a client through the default session caches its service model
+    # and endpoint rules in that session's loader for later clients.
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+    session: Any = boto3.DEFAULT_SESSION
+    region = os.environ.get("AWS_REGION", "us-east-1")
+    for service in DEFAULT_SERVICE_MODELS:
+        session.client(service, region_name=region)
+
+    json.loads(json.dumps({"warm": [1, 2.0, "3", None, True]}))
+
+    for warmup in _warmups:
+        warmup()
+
+
+def run_after_restore() -> None:
+    """Re-seed RNGs, reset pooled connections and run registered refreshers."""
+    random.seed()
+
+    for client in _clients:
+        http_session = _http_session(client)
+        if http_session is not None:
+            http_session.close()
+
+    for refresh in _refreshers:
+        refresh()
+
+
+if register_before_snapshot is not None:
+    register_before_snapshot(run_before_snapshot)
+    register_after_restore(run_after_restore)
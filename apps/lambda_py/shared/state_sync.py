@@ -0,0 +1,199 @@
+"""Compact binary game-state sync messages.
+
+Every card play bumps a per-room version. Clients acknowledge the last
+version they applied and receive only the plays made since then, together
+with the current turn pointer and hand counts. When the client is too far
+behind (or on a previous hand) a full snapshot of the hand is sent instead.
+
+Messages are packed with ``struct`` and carry card codes from
+:mod:`shared.deal`, so a typical delta is a few dozen bytes.
+
+Layout (big-endian)::
+
+    header  B kind | I room version | I base version | B turn | 4B hand counts
+            | H play count
+    play    B seat | B card count | card codes...
+"""
+
+import struct
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .deal import CARDS_PER_PLAYER, NUM_PLAYERS
+
+KIND_SNAPSHOT = 0
+KIND_DELTA = 1
+
+_HEADER = struct.Struct(">BIIB4BH")
+_PLAY = struct.Struct(">BB")
+
+
+@dataclass
+class Play:
+    """A single play: a seat and the card codes it put down (empty for a pass)."""
+
+    seat: int
+    cards: bytes
+
+
+@dataclass
+class SyncMessage:
+    """Decoded sync message."""
+
+    kind: int
+    version: int
+    base_version: int
+    turn: int
+    hand_counts: Tuple[int, ...]
+    plays: List[Play]
+
+    @property
+    def is_snapshot(self) -> bool:
+        """Whether the message replaces the client state instead of patching it."""
+        return self.kind == KIND_SNAPSHOT
+
+
+@dataclass
+class RoomSync:
+    """
+    Versioned play log for one room's current hand.
+
+    Versions increase monotonically across hands; ``hand_base_version`` is
+    the version at which the current hand was dealt.
+    """
+
+    room_id: str
+    version: int = 0
+    hand_base_version: int = 0
+    turn: int = 0
+    hand_counts: List[int] = field(default_factory=lambda: [CARDS_PER_PLAYER] * NUM_PLAYERS)
+    plays: List[Play] = field(default_factory=list)
+
+    def start_hand(self, turn: int) -> int:
+        """
+        Reset the log for a newly dealt hand.
+
+        Args:
+            turn: Seat that leads the new hand
+
+        Returns:
+            New room version
+        """
+        self.version += 1
+        self.hand_base_version = self.version
+        self.turn = turn
+        self.hand_counts = [CARDS_PER_PLAYER] * NUM_PLAYERS
+        self.plays = []
+        return self.version
+
+    def record_play(self, seat: int, cards: bytes, next_turn: int) -> int:
+        """
+        Record a play (or a pass when ``cards`` is empty).
+
+        Args:
+            seat: Seat that played
+            cards: Card codes played
+            next_turn: Seat whose turn is next
+
+        Returns:
+            New room version
+        """
+        if len(cards) > self.hand_counts[seat]:
+            raise ValueError(f"Seat {seat} cannot play {len(cards)} cards")
+
+        self.plays.append(Play(seat=seat, cards=bytes(cards)))
+        self.hand_counts[seat] -= len(cards)
+        self.turn = next_turn
+        self.version += 1
+        return self.version
+
+    def encode_since(self, acked_version: Optional[int]) -> bytes:
+        """
+        Encode the changes a client needs after ``acked_version``.
+
+        Args:
+            acked_version: Last version the client applied, or None if unknown
+
+        Returns:
+            Encoded delta, or a full snapshot when a delta is not possible
+        """
+        if acked_version is None or not (
+            self.hand_base_version <= acked_version <= self.version
+        ):
+            return self.encode_snapshot()
+
+        return _encode(
+            KIND_DELTA,
+            self.version,
+            acked_version,
+            self.turn,
+            self.hand_counts,
+            self.plays[acked_version - self.hand_base_version:],
+        )
+
+    def encode_snapshot(self) -> bytes:
+        """
+        Encode the full state of the current hand.
+
+        Returns:
+            Encoded snapshot
+        """
+        return _encode(
+            KIND_SNAPSHOT,
+            self.version,
+            self.hand_base_version,
+            self.turn,
+            self.hand_counts,
+            self.plays,
+        )
+
+
+def _encode(
+    kind: int,
+    version: int,
+    base_version: int,
+    turn: int,
+    hand_counts: List[int],
+    plays: List[Play],
+) -> bytes:
+    """Pack a header followed by the plays."""
+    parts = [_HEADER.pack(kind, version, base_version, turn, *hand_counts, len(plays))]
+    for play in plays:
+        parts.append(_PLAY.pack(play.seat, len(play.cards)))
+        parts.append(play.cards)
+    return b"".join(parts)
+
+
+def decode(data: bytes) -> SyncMessage:
+    """
+    Decode a sync message.
+
+    Args:
+        data: Encoded message
+
+    Returns:
+        Decoded message
+    """
+    kind, version, base_version, turn, *rest = _HEADER.unpack_from(data)
+    hand_counts, play_count = tuple(rest[:NUM_PLAYERS]), rest[NUM_PLAYERS]
+
+    offset = _HEADER.size
+    plays: List[Play] = []
+    for _ in range(play_count):
+        seat, count = _PLAY.unpack_from(data, offset)
+        offset += _PLAY.size
+        plays.append(Play(seat=seat, cards=data[offset:offset + count]))
+        offset += count
+
+    if offset != len(data):
+        raise ValueError("Trailing bytes in sync message")
+
+    return SyncMessage(
+        kind=kind,
+        version=version,
+        base_version=base_version,
+        turn=turn,
+        hand_counts=hand_counts,
+        plays=plays,
+    )
+
@@ -0,0 +1,280 @@
+"""Timer wheel for room deadlines, stored in DynamoDB and swept in bulk.
+
+Turn timeouts (30 s) and AI-fill timeouts (10 s) are written as items in a
+``Timers`` table whose partition key is the deadline in whole epoch seconds
+(``bucket``) and whose sort key identifies the timer (``timer_id``). A
+single scheduler polls the wheel once per second: it queries every bucket
+between its cursor and now, then claims each due timer with a conditional
+``DeleteItem``. Only the caller whose delete succeeds fires the timer, so a
+deadline fires once even when sweeps overlap.
+
+Each sweep re-reads the last ``grace_seconds`` buckets behind the cursor,
+so timers written just as their second was swept are still picked up. The
+cursor is persisted in the table (``bucket`` 0), so a cold scheduler
+resumes where the previous one stopped, looking back at most
+``max_lag_seconds``.
+
+Timers are cancelled implicitly: each carries a ``token`` (the room's turn
+number for turn timeouts) and the handler ignores timers whose token no
+longer matches the room. Deleting a superseded timer with :meth:`cancel`
+only saves the wasted claim.
+"""
+
+import functools
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from . import aws
+from .fetch import fetch
+
+dynamodb = aws.dynamodb()
+
+KIND_TURN = "turn"
+KIND_AI_FILL = "ai_fill"
+
+TURN_TIMEOUT_SECONDS = int(os.environ.get("TURN_TIMEOUT_SECONDS", "30"))
+AI_FILL_TIMEOUT_SECONDS = int(os.environ.get("AI_FILL_TIMEOUT_SECONDS", "10"))
+
+DEFAULT_GRACE_SECONDS = 2
+DEFAULT_MAX_LAG_SECONDS = 300
+# Timer items outlive their deadline this long before DynamoDB TTL removes them
+TIMER_TTL_SECONDS = 24 * 3600
+
+_CURSOR_KEY = {"bucket": 0, "timer_id": "cursor"}
+
+
+@dataclass(frozen=True)
+class Timer:
+    """A pending room deadline."""
+
+    room_id: str
+    kind: str
+    deadline: int
+    token: int = 0
+    seat: Optional[int] = None
+
+    @property
+    def timer_id(self) -> str:
+        """Sort key: one turn timer per room, one AI-fill timer per seat."""
+        if self.seat is None:
+            return f"{self.room_id}#{self.kind}"
+        return f"{self.room_id}#{self.kind}#{self.seat}"
+
+    def to_item(self) -> Dict[str, Any]:
+        """Timers table item for this timer."""
+        item: Dict[str, Any] = {
+            "bucket": self.deadline,
+            "timer_id": self.timer_id,
+            "room_id": self.room_id,
+            "kind": self.kind,
+            "token": self.token,
+            "expires_at": self.deadline + TIMER_TTL_SECONDS,
+        }
+        if self.seat is not None:
+            item["seat"] = self.seat
+        return item
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "Timer":
+        """Build a timer from a Timers table item."""
+        return cls(
+            room_id=item["room_id"],
+            kind=item["kind"],
+            deadline=int(item["bucket"]),
+            token=int(item.get("token", 0)),
+            seat=int(item["seat"]) if item.get("seat") is not None else None,
+        )
+
+
+def turn_timer(room_id: str, turn_id: int, started_at: float) -> Timer:
+    """
+    Build the timeout for a turn.
+
+    Args:
+        room_id: Room ID
+        turn_id: Room turn number the timeout belongs to
+        started_at: Epoch seconds the turn started
+
+    Returns:
+        Timer due ``TURN_TIMEOUT_SECONDS`` after the turn started
+    """
+    deadline = int(started_at + TURN_TIMEOUT_SECONDS)
+    return Timer(room_id=room_id, kind=KIND_TURN, deadline=deadline, token=turn_id)
+
+
+def ai_fill_timer(room_id: str, seat: int, emptied_at: float) -> Timer:
+    """
+    Build the AI-fill timeout for an empty seat.
+
+    Args:
+        room_id: Room ID
+        seat: Empty seat
+        emptied_at: Epoch seconds the seat became empty
+
+    Returns:
+        Timer due ``AI_FILL_TIMEOUT_SECONDS`` after the seat emptied
+    """
+    deadline = int(emptied_at + AI_FILL_TIMEOUT_SECONDS)
+    return Timer(room_id=room_id, kind=KIND_AI_FILL, deadline=deadline, seat=seat)
+
+
+class TimerWheel:
+    """Second-granularity timer wheel in a DynamoDB table."""
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        grace_seconds: int = DEFAULT_GRACE_SECONDS,
+        max_lag_seconds: int = DEFAULT_MAX_LAG_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the wheel.
+
+        Args:
+            table_name: Table name (defaults to ``TIMERS_TABLE_NAME``)
+            grace_seconds: Buckets behind the cursor re-read on every sweep
+            max_lag_seconds: Oldest bucket a sweep reads
+            clock: Epoch-seconds clock
+        """
+        self.table = dynamodb.Table(table_name or os.environ.get("TIMERS_TABLE_NAME", "Timers"))
+        self.grace_seconds = grace_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.clock = clock
+        self._cursor: Optional[int] = None
+
+    def schedule(self, timer: Timer) -> None:
+        """
+        Add a timer, replacing any timer with the same ID in its bucket.
+
+        Args:
+            timer: Timer to schedule
+        """
+        self.table.put_item(Item=timer.to_item())
+
+    def schedule_many(self, timers: List[Timer]) -> None:
+        """
+        Add several timers in batched writes.
+
+        Args:
+            timers: Timers to schedule
+        """
+        with self.table.batch_writer(overwrite_by_pkeys=["bucket", "timer_id"]) as batch:
+            for timer in timers:
+                batch.put_item(Item=timer.to_item())
+
+    def cancel(self, timer: Timer) -> None:
+        """
+        Remove a pending timer.
+
+        Args:
+            timer: Timer to remove
+        """
+        self.table.delete_item(Key={"bucket": timer.deadline, "timer_id": timer.timer_id})
+
+    def claim(self, timer: Timer) -> bool:
+        """
+        Take ownership of a due timer.
+
+        Args:
+            timer: Due timer
+
+        Returns:
+            True if this caller deleted the timer and must fire it
+        """
+        try:
+            self.table.delete_item(
+                Key={"bucket": timer.deadline, "timer_id": timer.timer_id},
+                ConditionExpression="attribute_exists(timer_id) AND #token = :token",
+                ExpressionAttributeNames={"#token": "token"},
+                ExpressionAttributeValues={":token": timer.token},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def _load_cursor(self, now: int) -> int:
+        """Last swept second, from memory or the table."""
+        if self._cursor is None:
+            item = self.table.get_item(Key=_CURSOR_KEY, ConsistentRead=True).get("Item")
+            self._cursor = int(item["position"]) if item else now - 1
+        return max(self._cursor, now - self.max_lag_seconds)
+
+    def _save_cursor(self, position: int) -> None:
+        """Persist the cursor if no other sweep has moved it further."""
+        self._cursor = position
+        try:
+            self.table.update_item(
+                Key=_CURSOR_KEY,
+                UpdateExpression="SET #position = :position",
+                ConditionExpression="attribute_not_exists(#position) OR #position < :position",
+                ExpressionAttributeNames={"#position": "position"},
+                ExpressionAttributeValues={":position": position},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def _query_bucket(self, bucket: int) -> List[Dict[str, Any]]:
+        """Read every timer in one bucket."""
+        query: Dict[str, Any] = {"KeyConditionExpression": Key("bucket").eq(bucket)}
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = self.table.query(**query)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            query["ExclusiveStartKey"] = last_key
+
+    def due(self, now: Optional[float] = None) -> List[Timer]:
+        """
+        List timers due by ``now`` without claiming them.
+
+        Args:
+            now: Epoch seconds (defaults to the clock)
+
+        Returns:
+            Due timers, oldest first
+        """
+        current = int(self.clock() if now is None else now)
+        start = max(1, self._load_cursor(current) + 1 - self.grace_seconds)
+        buckets = range(start, current + 1)
+
+        result = fetch(
+            queries={
+                str(bucket): functools.partial(self._query_bucket, bucket)
+                for bucket in buckets
+            }
+        )
+        return [
+            Timer.from_item(item) for bucket in buckets for item in result[str(bucket)]
+        ]
+
+    def sweep(self, now: Optional[float] = None) -> List[Timer]:
+        """
+        Claim every timer due by ``now`` and advance the cursor.
+
+        Args:
+            now: Epoch seconds (defaults to the clock)
+
+        Returns:
+            Timers this caller claimed and must fire
+        """
+        current = int(self.clock() if now is None else now)
+        timers = self.due(current)
+        claims = fetch(
+            queries={
+                f"{timer.deadline}#{timer.timer_id}": functools.partial(self.claim, timer)
+                for timer in timers
+            }
+        )
+        self._save_cursor(current)
+        return [timer for timer in timers if claims[f"{timer.deadline}#{timer.timer_id}"]]
@@ -1,20 +1,161 @@
 """Shared utilities for Lambda functions."""
 
-from typing import Any, Dict, Optional
+import base64
+import gzip
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+
+
+def get_header(event: Optional[Dict[str, Any]], name: str) -> Optional[str]:
+    """
+    Look up a request header case-insensitively.
+
+    Args:
+        event: API Gateway event
+        name: Header name
+
+    Returns:
+        Header value or None
+    """
+    headers = (event or {}).get("headers") or {}
+    name = name.lower()
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+def encoding_qualities(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an ``Accept-Encoding`` header into each listed coding's quality.
+
+    Args:
+        accept_encoding: Header value
+
+    Returns:
+        Quality per lower-case coding, including refused (``q=0``) ones
+    """
+    qualities: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.strip().lower()] = quality
+    return qualities
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """
+    Parse an ``Accept-Encoding`` header into the encodings the client allows.
+
+    Args:
+        accept_encoding: Header value
+
+    Returns:
+        Lower-case encodings with a non-zero quality
+    """
+    return [coding for coding, q in encoding_qualities(accept_encoding).items() if q > 0]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content-coding for a compressible body.
+
+    Brotli (when installed) is preferred over gzip. A coding the header
+    refuses with ``q=0`` is never picked, even when ``*`` allows others.
+
+    Args:
+        accept_encoding: ``Accept-Encoding`` header value
+
+    Returns:
+        ``br``, ``gzip`` or None for an uncompressed body
+    """
+    qualities = encoding_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if qualities.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def compute_etag(payload: Union[str, bytes]) -> str:
+    """
+    Strong ETag for a serialized body.
+
+    Args:
+        payload: Serialized response body
+
+    Returns:
+        Quoted ETag value
+    """
+    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """
+    ETag of a content-coded representation, e.g. ``"abc"`` -> ``"abc-gzip"``.
+
+    Args:
+        etag: Quoted ETag of the identity body
+        coding: Content-coding applied to the body
+
+    Returns:
+        Quoted ETag distinct per coding
+    """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
 
 
 def create_response(
     status_code: int,
     body: Any,
     headers: Optional[Dict[str, str]] = None,
+    event: Optional[Dict[str, Any]] = None,
+    etag: Union[bool, str, None] = None,
+    cache_control: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Create a standardized API Gateway response.
     
+    When the request ``event`` is given, a 200 response whose ETag matches
+    ``If-None-Match`` becomes an empty 304, and bodies of at least
+    ``COMPRESSION_MIN_BYTES`` are brotli- or gzip-encoded if the client's
+    ``Accept-Encoding`` allows it (base64 with ``isBase64Encoded``). Each
+    coding gets its own ETag (``"<tag>-gzip"``), and ``Vary:
+    Accept-Encoding`` is sent.
+
     Args:
         status_code: HTTP status code
         body: Response body (will be JSON serialized)
         headers: Optional additional headers
+        event: Request event, for conditional and compressed responses
+        etag: ``True`` to hash the serialized body, or an ETag derived from
+            a stored version
+        cache_control: ``Cache-Control`` header value
         
     Returns:
         API Gateway response dictionary
@@ -28,11 +169,52 @@ def create_response(
     
     if headers:
         default_headers.update(headers)
+
+    payload = json.dumps(body)
+
+    if cache_control:
+        default_headers["Cache-Control"] = cache_control
+
+    encoding = None
+    if event is not None:
+        default_headers["Vary"] = "Accept-Encoding"
+        if len(payload) >= COMPRESSION_MIN_BYTES:
+            encoding = negotiate_encoding(get_header(event, "Accept-Encoding"))
+
+    etag_value = None
+    if etag:
+        etag_value = compute_etag(payload) if etag is True else etag
+        if not etag_value.startswith(('"', 'W/"')):
+            etag_value = f'"{etag_value}"'
+        # A strong ETag names one representation, so each coding gets its own
+        sent_etag = coded_etag(etag_value, encoding) if encoding else etag_value
+        default_headers["ETag"] = sent_etag
+
+        if status_code == 200 and etag_matches(get_header(event, "If-None-Match"), sent_etag):
+            return {"statusCode": 304, "headers": default_headers, "body": ""}
+
+    if encoding is not None:
+        data = payload.encode("utf-8")
+        if encoding == "br":
+            compressed = brotli.compress(data, quality=4)
+        else:
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+
+        if len(compressed) < len(data):
+            default_headers["Content-Encoding"] = encoding
+            return {
+                "statusCode": status_code,
+                "headers": default_headers,
+                "body": base64.b64encode(compressed).decode("ascii"),
+                "isBase64Encoded": True,
+            }
+        if etag_value:
+            default_headers["ETag"] = etag_value
     
     return {
         "statusCode": status_code,
         "headers": default_headers,
-        "body": json.dumps(body),
+        "body": payload,
     }
 
 
@@ -0,0 +1,137 @@
+"""Keep-warm and health-check short-circuit for Lambda handlers.
+
+Keep-warm pings and health checks are not real traffic, so they should not
+emit request logs, traces or a cold-start metric. :func:`warmup_handler`
+is applied outside the powertools decorators and answers these events
+directly. The first warmup in a container also pre-initializes everything
+registered with :func:`shared.snapstart.register_warmup` (lazily created
+clients, pydantic validators), so the next real request finds them ready.
+
+Recognized events:
+
+* ``{"warmup": true}`` (direct invoke or scheduled rule with a constant input)
+* EventBridge ``Scheduled Event`` notifications
+* ``GET /health`` or ``GET /warmup`` through API Gateway
+
+The response reports container init timings: ``mark("imports")`` and
+``mark("clients")`` in a handler module record how long imports and
+module-level client construction took. Marks are only recorded until the
+first invocation, so a module imported lazily later (a handler mounted in
+the app bundle) does not overwrite them with time the container sat idle.
+"""
+
+import functools
+import os
+import time
+from typing import Any, Callable, Dict
+
+from . import snapstart
+from .utils import create_response
+
+HEALTH_PATHS = ("/health", "/warmup")
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+def _process_start() -> float:
+    """Process start on the ``time.monotonic`` clock (falls back to now)."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        started_ago = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        return time.monotonic() - max(0.0, started_ago)
+    except (OSError, ValueError, IndexError):
+        return time.monotonic()
+
+
+_last_mark = _process_start()
+_init_timings: Dict[str, float] = {}
+_warmed = False
+_invoked = False
+
+
+def mark(phase: str) -> None:
+    """
+    Record the time since the previous mark (or process start) for a phase.
+
+    Ignored once the container has handled its first invocation.
+
+    Args:
+        phase: Phase name, e.g. ``imports`` or ``clients``
+    """
+    global _last_mark
+    if _invoked:
+        return
+    now = time.monotonic()
+    _init_timings[f"{phase}Ms"] = round((now - _last_mark) * 1000, 2)
+    _last_mark = now
+
+
+def is_warmup_event(event: Any) -> bool:
+    """
+    Check whether an event is a keep-warm ping or health check.
+
+    Args:
+        event: Lambda event
+
+    Returns:
+        True for warmup and health-check events
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get("warmup") is True:
+        return True
+    if event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event":
+        return True
+    return event.get("httpMethod") == "GET" and event.get("path") in HEALTH_PATHS
+
+
+def warm() -> Dict[str, Any]:
+    """
+    Pre-initialize the container once and report init timings.
+
+    Returns:
+        Warmup report
+    """
+    global _warmed
+    first = not _warmed
+    warmup_ms = 0.0
+
+    if first:
+        start = time.monotonic()
+        snapstart.run_before_snapshot()
+        warmup_ms = round((time.monotonic() - start) * 1000, 2)
+        _warmed = True
+
+    return {
+        "warm": True,
+        "firstWarmup": first,
+        "initTimings": dict(_init_timings),
+        "warmupMs": warmup_ms,
+    }
+
+
+def warmup_handler(handler: Handler) -> Handler:
+    """
+    Answer warmup and health events before the wrapped handler runs.
+
+    Apply as the outermost decorator so powertools never sees these events.
+
+    Args:
+        handler: Lambda handler
+
+    Returns:
+        Wrapped handler
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        global _invoked
+        _invoked = True
+        if is_warmup_event(event):
+            return create_response(200, warm())
+        return handler(event, context)
+
+    return wrapper
@@ -31,6 +31,50 @@ def dynamodb_table(aws_credentials):
         yield table
 
 
+@pytest.fixture(scope="function")
+def connections_table(aws_credentials):
+    """Create a mock WebSocket connections table with a room index."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="Connections",
+            KeySchema=[{"AttributeName": "connection_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "connection_id", "AttributeType": "S"},
+                {"AttributeName": "room_id", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "room_id-index",
+                    "KeySchema": [{"AttributeName": "room_id", "KeyType": "HASH"}],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture(scope="function")
+def game_tables(aws_credentials):
+    """Create mock Rooms and Users tables for the game store."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        rooms = dynamodb.create_table(
+            TableName="Rooms",
+            KeySchema=[{"AttributeName": "room_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "room_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        users = dynamodb.create_table(
+            TableName="Users",
+            KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield rooms, users
+
+
 @pytest.fixture
 def lambda_context():
     """Create a mock Lambda context."""
@@ -52,3 +96,106 @@ def lambda_context():
             return 30000
     
     return MockLambdaContext()
+
+
+@pytest.fixture(scope="function")
+def rate_limit_table(aws_credentials):
+    """Create a mock rate-limit counter table."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="RateLimits",
+            KeySchema=[{"AttributeName": "key", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "key", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture(scope="function")
+def leaderboard_table(aws_credentials):
+    """Create a mock leaderboard table."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="Leaderboard",
+            KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture(scope="function")
+def history_store(aws_credentials):
+    """Create a mock game-history bucket and offset index table."""
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="guandan-history")
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="GameHistory",
+            KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "game_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture(scope="function")
+def scheduler_tables(aws_credentials):
+    """Create mock Rooms and timer-wheel tables for the scheduler."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        rooms = dynamodb.create_table(
+            TableName="Rooms",
+            KeySchema=[{"AttributeName": "room_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "room_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        timers = dynamodb.create_table(
+            TableName="Timers",
+            KeySchema=[
+                {"AttributeName": "bucket", "KeyType": "HASH"},
+                {"AttributeName": "timer_id", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "bucket", "AttributeType": "N"},
+                {"AttributeName": "timer_id", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield rooms, timers
+
+
+@pytest.fixture(scope="function")
+def matchmaking_tables(aws_credentials):
+    """Create mock Rooms and matchmaking ticket tables."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        rooms = dynamodb.create_table(
+            TableName="Rooms",
+            KeySchema=[{"AttributeName": "room_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "room_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        tickets = dynamodb.create_table(
+            TableName="MatchQueue",
+            KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "user_id", "AttributeType": "S"},
+                {"AttributeName": "queue", "AttributeType": "S"},
+                {"AttributeName": "enqueued_at", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "queue-enqueued_at-index",
+                    "KeySchema": [
+                        {"AttributeName": "queue", "KeyType": "HASH"},
+                        {"AttributeName": "enqueued_at", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield rooms, tickets
@@ -1,17 +1,109 @@
-"""Integration test fixtures for LocalStack."""
+"""Integration test fixtures for LocalStack.
+
+Tables are created once per session and per pytest-xdist worker, with the
+worker ID and a run token in their names, so parallel workers (``pytest -n
+auto``) and concurrent runs never share one. DynamoDB waiters replace fixed
+sleeps, and tests get an emptied table instead of a recreated one.
+"""
 
 import os
 import time
+import uuid
+from typing import Any, Dict, List
 
 import boto3
 import pytest
 
+READY_TIMEOUT_SECONDS = 30
+WAITER_CONFIG = {"Delay": 1, "MaxAttempts": 30}
+
+USERS_KEY_SCHEMA = [{"AttributeName": "user_id", "KeyType": "HASH"}]
+USERS_ATTRIBUTES = [{"AttributeName": "user_id", "AttributeType": "S"}]
+
+
+def worker_table_name(base_name: str, run_id: str) -> str:
+    """
+    Name of a table owned by the current xdist worker.
+
+    Args:
+        base_name: Table name used in production (e.g. ``Users``)
+        run_id: Token shared by all workers of one test run
+
+    Returns:
+        Unique table name, e.g. ``Users-gw1-3f2a9c1d``
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"{base_name}-{worker}-{run_id}"
+
+
+def create_table(
+    client: Any,
+    table_name: str,
+    key_schema: List[Dict[str, str]],
+    attribute_definitions: List[Dict[str, str]],
+    **kwargs: Any,
+) -> None:
+    """
+    Create an on-demand table and wait until it exists.
+
+    Args:
+        client: DynamoDB client
+        table_name: Table to create
+        key_schema: Key schema
+        attribute_definitions: Key attribute definitions
+        **kwargs: Extra ``CreateTable`` parameters (e.g. indexes)
+    """
+    client.create_table(
+        TableName=table_name,
+        KeySchema=key_schema,
+        AttributeDefinitions=attribute_definitions,
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs,
+    )
+    client.get_waiter("table_exists").wait(TableName=table_name, WaiterConfig=WAITER_CONFIG)
+
+
+def delete_table(client: Any, table_name: str) -> None:
+    """Delete a table if it exists and wait until it is gone."""
+    try:
+        client.delete_table(TableName=table_name)
+    except client.exceptions.ResourceNotFoundException:
+        return
+    client.get_waiter("table_not_exists").wait(TableName=table_name, WaiterConfig=WAITER_CONFIG)
+
+
+def truncate_table(table: Any) -> int:
+    """
+    Delete every item of a table, keeping the table.
+
+    Args:
+        table: DynamoDB Table resource
+
+    Returns:
+        Number of items deleted
+    """
+    key_names = [key["AttributeName"] for key in table.key_schema]
+    scan: Dict[str, Any] = {
+        "ProjectionExpression": ", ".join(f"#k{i}" for i in range(len(key_names))),
+        "ExpressionAttributeNames": {f"#k{i}": name for i, name in enumerate(key_names)},
+    }
+    deleted = 0
+    with table.batch_writer() as batch:
+        while True:
+            response = table.scan(**scan)
+            for item in response.get("Items", []):
+                batch.delete_item(Key={name: item[name] for name in key_names})
+                deleted += 1
+            if "LastEvaluatedKey" not in response:
+                return deleted
+            scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
 
 @pytest.fixture(scope="session")
 def localstack_endpoint():
     """Get LocalStack endpoint."""
     endpoint = os.environ.get("LOCALSTACK_ENDPOINT", "http://localhost:4566")
-    
+
     # Wait for LocalStack to be ready
     dynamodb = boto3.client(
         "dynamodb",
@@ -20,67 +112,70 @@ def localstack_endpoint():
         aws_access_key_id="test",
         aws_secret_access_key="test",
     )
-    
-    max_attempts = 30
-    for _ in range(max_attempts):
+
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    delay = 0.05
+    while True:
         try:
-            dynamodb.list_tables()
+            dynamodb.list_tables(Limit=1)
             print("✅ LocalStack is ready")
             break
         except Exception:
-            time.sleep(1)
-    else:
-        raise RuntimeError("LocalStack not ready after 30 seconds")
-    
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"LocalStack not ready after {READY_TIMEOUT_SECONDS} seconds")
+            time.sleep(delay)
+            delay = min(1.0, delay * 2)
+
     return endpoint
 
 
 @pytest.fixture(scope="session")
-def dynamodb_table_localstack(localstack_endpoint):
-    """Create DynamoDB table in LocalStack."""
-    dynamodb = boto3.client(
-        "dynamodb",
-        endpoint_url=localstack_endpoint,
+def dynamodb_localstack(localstack_endpoint):
+    """DynamoDB client and resource for LocalStack."""
+    session = boto3.Session(
         region_name="us-east-1",
         aws_access_key_id="test",
         aws_secret_access_key="test",
     )
-    
-    table_name = "Users"
-    
-    # Delete table if exists
-    try:
-        dynamodb.delete_table(TableName=table_name)
-        time.sleep(2)
-    except dynamodb.exceptions.ResourceNotFoundException:
-        pass
-    
-    # Create table
-    dynamodb.create_table(
-        TableName=table_name,
-        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
-        BillingMode="PAY_PER_REQUEST",
-    )
-    
-    # Wait for table to be active
-    time.sleep(2)
-    
+    client = session.client("dynamodb", endpoint_url=localstack_endpoint)
+    resource = session.resource("dynamodb", endpoint_url=localstack_endpoint)
+    return client, resource
+
+
+@pytest.fixture(scope="session")
+def run_id():
+    """Token naming this test run's tables."""
+    return uuid.uuid4().hex[:8]
+
+
+@pytest.fixture(scope="session")
+def users_table_session(dynamodb_localstack, run_id):
+    """Create this worker's Users table once for the session."""
+    client, resource = dynamodb_localstack
+    table_name = worker_table_name("Users", run_id)
+
+    create_table(client, table_name, USERS_KEY_SCHEMA, USERS_ATTRIBUTES)
     print(f"✅ Created {table_name} table in LocalStack")
-    
-    yield table_name
-    
-    # Cleanup
-    try:
-        dynamodb.delete_table(TableName=table_name)
-    except Exception:
-        pass
+
+    yield resource.Table(table_name)
+
+    delete_table(client, table_name)
+
+
+@pytest.fixture
+def dynamodb_table_localstack(users_table_session, monkeypatch):
+    """Point the user function at this worker's empty Users table."""
+    monkeypatch.setenv("USERS_TABLE_NAME", users_table_session.name)
+
+    yield users_table_session.name
+
+    truncate_table(users_table_session)
 
 
 @pytest.fixture
 def lambda_context_localstack():
     """Create a mock Lambda context for LocalStack tests."""
-    
+
     class MockLambdaContext:
         def __init__(self):
             self.function_name = "test-function-localstack"
@@ -93,8 +188,8 @@ def lambda_context_localstack():
             self.log_group_name = "/aws/lambda/test-function"
             self.log_stream_name = "2024/01/01/[$LATEST]test"
             self.aws_request_id = self.request_id
-        
+
         def get_remaining_time_in_millis(self):
             return 30000
-    
+
     return MockLambdaContext()
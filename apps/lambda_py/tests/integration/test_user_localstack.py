@@ -5,11 +5,12 @@ import os
 
 import pytest
 
-# Set environment variables for LocalStack
-os.environ["USERS_TABLE_NAME"] = "Users"
+# Set environment variables for LocalStack (the Users table name comes from
+# the dynamodb_table_localstack fixture)
 os.environ["LOCALSTACK_ENDPOINT"] = "http://localhost:4566"
 
 from functions.user.handler import handler
+from tests.integration.conftest import truncate_table
 
 
 def test_create_and_get_user_localstack(
@@ -74,3 +75,14 @@ def test_user_not_found_localstack(
     assert response["statusCode"] == 404
     body = json.loads(response["body"])
     assert body["error"] == "User not found"
+
+
+def test_truncate_table_empties_the_worker_table(dynamodb_table_localstack, users_table_session):
+    """Test truncating the per-worker table deletes every item and keeps the table."""
+    assert users_table_session.name.startswith("Users-")
+    with users_table_session.batch_writer() as batch:
+        for i in range(30):
+            batch.put_item(Item={"user_id": f"truncate-{i}", "username": f"user{i}"})
+
+    assert truncate_table(users_table_session) == 30
+    assert users_table_session.scan(Select="COUNT")["Count"] == 0
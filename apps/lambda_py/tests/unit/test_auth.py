@@ -0,0 +1,169 @@
+"""Unit tests for shared JWT verification."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from shared.auth import AuthError, JWKSCache, TokenVerifier, require_auth
+
+ISSUER = "https://issuer.example.com"
+
+
+def make_key(kid):
+    """Generate an RSA key pair and its public JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    """Key pair published in the stub JWKS."""
+    return make_key("key-1")
+
+
+@pytest.fixture
+def jwks_server(signing_key):
+    """Local HTTP server publishing the JWKS; yields (url, request counter)."""
+    _, jwk = signing_key
+    requests = []
+
+    class JWKSHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            requests.append(self.path)
+            body = json.dumps({"keys": [jwk]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), JWKSHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json", requests
+    server.shutdown()
+    server.server_close()
+
+
+def issue(private_key, kid="key-1", expires_in=900, **claims):
+    """Sign a token with the given key."""
+    payload = {"sub": "user-1", "iss": ISSUER, "exp": int(time.time()) + expires_in, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verify_fetches_jwks_once_and_caches_tokens(jwks_server, signing_key):
+    """Test repeat tokens skip verification and the JWKS is fetched once."""
+    url, requests = jwks_server
+    verifier = TokenVerifier(JWKSCache(url), issuer=ISSUER)
+    token = issue(signing_key[0])
+
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(issue(signing_key[0], sub="user-2"))["sub"] == "user-2"
+
+    assert requests == ["/.well-known/jwks.json"]
+    assert (verifier.hits, verifier.misses) == (1, 2)
+
+
+def test_rejects_bad_tokens(jwks_server, signing_key):
+    """Test expired, foreign-issuer and forged tokens are rejected."""
+    url, _ = jwks_server
+    verifier = TokenVerifier(JWKSCache(url), issuer=ISSUER)
+    forger, _ = make_key("key-1")
+
+    with pytest.raises(AuthError):
+        verifier.verify(issue(signing_key[0], expires_in=-60))
+    with pytest.raises(AuthError):
+        verifier.verify(issue(signing_key[0], iss="https://evil.example.com"))
+    with pytest.raises(AuthError):
+        verifier.verify(issue(forger))
+    with pytest.raises(AuthError):
+        verifier.verify("not-a-token")
+
+
+def test_lru_is_bounded(signing_key):
+    """Test the verified-token cache evicts the least recently used token."""
+    _, jwk = signing_key
+    verifier = TokenVerifier(JWKSCache("stub", fetch=lambda url: {"keys": [jwk]}), cache_size=2)
+    tokens = [issue(signing_key[0], sub=f"user-{i}") for i in range(3)]
+
+    for token in tokens:
+        verifier.verify(token)
+    verifier.verify(tokens[0])
+
+    assert len(verifier._verified) == 2
+    assert verifier.misses == 4
+
+
+def test_stale_keys_served_while_refreshing(signing_key):
+    """Test stale keys are used while one background refresh runs."""
+    _, jwk = signing_key
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        if len(calls) > 1:
+            started.set()
+            release.wait(5)
+        return {"keys": [jwk]}
+
+    cache = JWKSCache("stub", ttl=0, stale_ttl=60, fetch=fetch)
+    cache.get_key("key-1")
+
+    assert cache.get_key("key-1") is not None
+    assert started.wait(5)
+    assert cache.get_key("key-1") is not None
+    release.set()
+
+    assert len(calls) == 2
+
+
+def test_unknown_kid_refresh_is_rate_limited(signing_key):
+    """Test bogus key IDs cannot force a JWKS fetch on every request."""
+    _, jwk = signing_key
+    calls = []
+    cache = JWKSCache("stub", fetch=lambda url: calls.append(url) or {"keys": [jwk]})
+    cache.get_key("key-1")
+
+    with pytest.raises(AuthError):
+        cache.get_key("rotated-key")
+
+    assert len(calls) == 1
+
+
+def test_require_auth_decorator(signing_key):
+    """Test the decorator rejects missing tokens and passes claims through."""
+    _, jwk = signing_key
+    verifier = TokenVerifier(JWKSCache("stub", fetch=lambda url: {"keys": [jwk]}))
+
+    @require_auth(verifier, enabled=True)
+    def handler(event, context):
+        return event["requestContext"]["authorizer"]["claims"]
+
+    assert handler({"headers": {}}, None)["statusCode"] == 401
+    assert handler({"headers": {"Authorization": "Basic abc"}}, None)["statusCode"] == 401
+
+    token = issue(signing_key[0])
+    assert handler({"headers": {"authorization": f"Bearer {token}"}}, None)["sub"] == "user-1"
+
+
+def test_require_auth_disabled_by_default(monkeypatch):
+    """Test the decorator is a no-op unless AUTH_REQUIRED is set."""
+    monkeypatch.delenv("AUTH_REQUIRED", raising=False)
+
+    def handler(event, context):
+        return {}
+
+    assert require_auth()(handler) is handler
@@ -0,0 +1,96 @@
+"""Unit tests for shared shuffle-and-deal module."""
+
+import random
+
+import pytest
+
+from shared.deal import (
+    CARDS_PER_PLAYER,
+    DECK_SIZE,
+    RandomBuffer,
+    deal,
+    deal_hands,
+    decode_card,
+    position_bias,
+    shuffle_deck,
+    shuffle_many,
+)
+
+
+def test_shuffle_deck_is_permutation():
+    """Test a shuffled deck contains every card exactly once."""
+    deck = shuffle_deck()
+
+    assert len(deck) == DECK_SIZE
+    assert sorted(deck) == list(range(DECK_SIZE))
+
+
+def test_shuffle_many_produces_distinct_decks():
+    """Test bulk shuffling yields independent permutations."""
+    decks = list(shuffle_many(50))
+
+    assert len(decks) == 50
+    assert all(sorted(deck) == list(range(DECK_SIZE)) for deck in decks)
+    assert len(set(decks)) == 50
+
+
+def test_deal_four_hands():
+    """Test dealing gives four disjoint 27-card hands."""
+    hands = deal()
+
+    assert len(hands) == 4
+    assert all(len(hand) == CARDS_PER_PLAYER for hand in hands)
+    assert sorted(b"".join(hands)) == list(range(DECK_SIZE))
+
+
+def test_deal_hands_rejects_short_deck():
+    """Test dealing a deck of the wrong size fails."""
+    with pytest.raises(ValueError):
+        deal_hands(bytes(range(100)))
+
+
+def test_random_buffer_bounds():
+    """Test bounded draws stay in range and refill past the buffer end."""
+    rng = RandomBuffer(size=4)
+    values = [rng.below(7) for _ in range(1000)]
+
+    assert min(values) >= 0
+    assert max(values) < 7
+    assert set(values) == set(range(7))
+
+
+def test_decode_card():
+    """Test compact card codes decode to rank and suit."""
+    assert decode_card(0) == ("2", "♠")
+    assert decode_card(12) == ("A", "♠")
+    assert decode_card(13 + 52) == ("2", "♥")
+    assert decode_card(104) == ("SMALL_JOKER", "JOKER")
+    assert decode_card(107) == ("BIG_JOKER", "JOKER")
+
+    with pytest.raises(ValueError):
+        decode_card(DECK_SIZE)
+
+
+def test_position_bias_accepts_fair_shuffle():
+    """Test the verifier does not flag CSPRNG shuffles."""
+    decks = b"".join(shuffle_many(5000))
+    result = position_bias(decks, 5000)
+
+    assert result["dof"] == 107 * 107
+    assert result["p_value"] > 1e-6
+
+
+def test_position_bias_flags_biased_shuffle():
+    """Test the verifier rejects a classic naive-swap shuffle."""
+    rand = random.Random(42)
+    decks = []
+    for _ in range(5000):
+        cards = list(range(DECK_SIZE))
+        for i in range(DECK_SIZE):
+            j = rand.randrange(DECK_SIZE)
+            cards[i], cards[j] = cards[j], cards[i]
+        decks.append(bytes(cards))
+
+    result = position_bias(b"".join(decks), 5000)
+
+    assert result["p_value"] < 1e-6
@@ -0,0 +1,73 @@
+"""Unit tests for the dependencies declared for the deployed bundles."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Runs in a fresh interpreter: third-party modules outside the locked
+# closure of [project].dependencies (what scripts/build.py installs) are
+# hidden, as they are in a built bundle.
+IMPORT_HANDLERS = r"""
+import importlib
+import importlib.metadata as metadata
+import sys
+import tomllib
+from pathlib import Path
+
+from packaging.utils import canonicalize_name
+
+root = Path(sys.argv[1])
+project = tomllib.loads((root / "pyproject.toml").read_text())["project"]
+locked = {
+    package["name"]: package
+    for package in tomllib.loads((root / "uv.lock").read_text())["package"]
+}
+
+seen = set()
+pending = [{"name": canonicalize_name(project["name"])}]
+while pending:
+    dependency = pending.pop()
+    key = (dependency["name"], tuple(dependency.get("extra", [])))
+    if key in seen:
+        continue
+    seen.add(key)
+    package = locked[dependency["name"]]
+    pending += package.get("dependencies", [])
+    for extra in dependency.get("extra", []):
+        pending += package.get("optional-dependencies", {}).get(extra, [])
+allowed = {name for name, _ in seen}
+
+owners = metadata.packages_distributions()
+
+
+class HideUndeclared:
+    def find_spec(self, fullname, path=None, target=None):
+        top = fullname.partition(".")[0]
+        dists = {canonicalize_name(dist) for dist in owners.get(top, [])}
+        if dists and not dists & allowed and top not in ("functions", "shared"):
+            raise ModuleNotFoundError(f"{top} is not a declared dependency", name=top)
+        return None
+
+
+sys.meta_path.insert(0, HideUndeclared())
+sys.path.insert(0, str(root))
+for handler in sorted((root / "functions").glob("*/handler.py")):
+    importlib.import_module(f"functions.{handler.parent.name}.handler")
+    print(handler.parent.name)
+"""
+
+
+def test_handlers_import_with_declared_dependencies_only():
+    """Test every handler imports when only declared dependencies are installed."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_HANDLERS, str(ROOT)],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env={"AWS_DEFAULT_REGION": "us-east-1", "PATH": ""},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "user" in result.stdout.split()
@@ -0,0 +1,84 @@
+"""Unit tests for shared concurrent fetch helper."""
+
+import threading
+
+import pytest
+from moto import mock_aws
+from pydantic import BaseModel
+
+from shared import fetch as fetch_module
+from shared.fetch import FetchTimeoutError, Get, fetch, time_budget
+
+
+class Player(BaseModel):
+    """Minimal player model for typed results."""
+
+    user_id: str
+    username: str
+
+
+@mock_aws
+def test_fetch_room_players_and_connections(game_tables, lambda_context):
+    """Test items across tables and queries come back by name."""
+    rooms, users = game_tables
+    rooms.put_item(Item={"room_id": "room-1", "version": 1})
+    for i in range(4):
+        users.put_item(Item={"user_id": f"p{i}", "username": f"player{i}"})
+
+    gets = {"room": Get("Rooms", {"room_id": "room-1"})}
+    gets.update({f"p{i}": Get("Users", {"user_id": f"p{i}"}, model=Player) for i in range(4)})
+    gets["missing"] = Get("Users", {"user_id": "nobody"})
+
+    queries = {"connections": lambda: ["conn-1", "conn-2"]}
+    result = fetch(gets, queries=queries, context=lambda_context)
+
+    assert result["room"]["version"] == 1
+    assert isinstance(result["p2"], Player)
+    assert result["p2"].username == "player2"
+    assert result["missing"] is None
+    assert result["connections"] == ["conn-1", "conn-2"]
+
+
+@mock_aws
+def test_fetch_chunks_and_dedupes_keys(game_tables, monkeypatch):
+    """Test more than 100 keys are split into several batches and duplicates merged."""
+    _, users = game_tables
+    with users.batch_writer() as batch:
+        for i in range(150):
+            batch.put_item(Item={"user_id": f"u{i}", "username": f"user{i}"})
+
+    monkeypatch.setattr(fetch_module, "BATCH_GET_LIMIT", 100)
+    gets = {f"u{i}": Get("Users", {"user_id": f"u{i}"}) for i in range(150)}
+    gets["again"] = Get("Users", {"user_id": "u0"})
+
+    chunks, _ = fetch_module._chunk_gets(gets)
+    result = fetch(gets)
+
+    assert [len(chunk["Users"]["Keys"]) for chunk in chunks] == [100, 50]
+    assert result["u149"]["username"] == "user149"
+    assert result["again"] == result["u0"]
+
+
+def test_fetch_times_out():
+    """Test slow reads raise once the time budget is spent."""
+    release = threading.Event()
+    try:
+        with pytest.raises(FetchTimeoutError):
+            fetch(queries={"slow": lambda: release.wait(5)}, timeout=0.05)
+    finally:
+        release.set()
+
+
+def test_fetch_propagates_errors():
+    """Test a failing read surfaces its exception."""
+
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fetch(queries={"broken": broken}, timeout=1)
+
+
+def test_time_budget_uses_context(lambda_context):
+    """Test the budget is remaining time minus the safety margin."""
+    assert time_budget(lambda_context, safety_margin_ms=1000) == 29.0
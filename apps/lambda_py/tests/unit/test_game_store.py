@@ -0,0 +1,126 @@
+"""Unit tests for shared optimistic-concurrency game store."""
+
+import threading
+
+import pytest
+from moto import mock_aws
+
+from shared.game_store import GameStore, RoomNotFoundError, VersionConflictError
+
+
+def make_store():
+    """Create a store with no backoff delay."""
+    return GameStore(rooms_table_name="Rooms", players_table_name="Users", base_delay=0)
+
+
+@mock_aws
+def test_create_room_rejects_duplicate(game_tables):
+    """Test creating an existing room fails."""
+    store = make_store()
+    room = store.create_room("room-1", {"status": "waiting"})
+
+    assert room["version"] == 1
+    with pytest.raises(VersionConflictError):
+        store.create_room("room-1", {"status": "waiting"})
+
+
+@mock_aws
+def test_put_room_if_version_detects_stale_write(game_tables):
+    """Test a write based on an old version is rejected."""
+    store = make_store()
+    room = store.create_room("room-1", {"turn": 0})
+    store.put_room_if_version({**room, "turn": 1}, expected_version=1)
+
+    with pytest.raises(VersionConflictError):
+        store.put_room_if_version({**room, "turn": 2}, expected_version=1)
+
+    assert store.get_room("room-1")["turn"] == 1
+
+
+@mock_aws
+def test_update_room_retries_on_conflict(game_tables):
+    """Test update_room re-reads and retries after losing a race."""
+    store = make_store()
+    store.create_room("room-1", {"turn": 0})
+    raced = []
+
+    def mutate(room):
+        if not raced:
+            # Simulate another writer advancing the room mid-update
+            raced.append(True)
+            store.put_room_if_version({**room, "turn": 5}, int(room["version"]))
+        return {**room, "turn": room["turn"] + 1}
+
+    room = store.update_room("room-1", mutate)
+
+    assert room["turn"] == 6
+    assert room["version"] == 3
+    assert store.conflicts == 1
+
+
+@mock_aws
+def test_update_room_gives_up(game_tables):
+    """Test update_room raises after exhausting its attempts."""
+    store = GameStore(rooms_table_name="Rooms", max_attempts=2, base_delay=0)
+    store.create_room("room-1", {"turn": 0})
+
+    def always_race(room):
+        store.put_room_if_version(dict(room), int(room["version"]))
+        return room
+
+    with pytest.raises(VersionConflictError):
+        store.update_room("room-1", always_race)
+
+
+@mock_aws
+def test_update_missing_room(game_tables):
+    """Test updating a missing room raises."""
+    with pytest.raises(RoomNotFoundError):
+        make_store().update_room("missing", lambda room: room)
+
+
+@mock_aws
+def test_concurrent_updates_do_not_lose_writes(game_tables):
+    """Test concurrent increments from several threads are all applied."""
+    store = GameStore(rooms_table_name="Rooms", max_attempts=50, base_delay=0.001)
+    store.create_room("room-1", {"counter": 0})
+
+    def worker():
+        for _ in range(5):
+            store.update_room("room-1", lambda room: {**room, "counter": room["counter"] + 1})
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    room = store.get_room("room-1")
+    assert room["counter"] == 20
+    assert room["version"] == 21
+
+
+@mock_aws
+def test_settle_hand_is_atomic(game_tables):
+    """Test settlement updates the room and players together or not at all."""
+    _, users = game_tables
+    store = make_store()
+    store.create_room("room-1", {"status": "playing"})
+    for user_id in ("p1", "p2", "p3", "p4"):
+        users.put_item(Item={"user_id": user_id, "coins": 100})
+
+    deltas = {"p1": {"coins": 20}, "p2": {"coins": 20}, "p3": {"coins": -20}, "p4": {"coins": -20}}
+    version = store.settle_hand("room-1", 1, {"status": "settled"}, deltas, {"p1": {"level": "5"}})
+
+    assert version == 2
+    assert store.get_room("room-1")["status"] == "settled"
+    assert users.get_item(Key={"user_id": "p1"})["Item"]["coins"] == 120
+    assert users.get_item(Key={"user_id": "p1"})["Item"]["level"] == "5"
+    assert users.get_item(Key={"user_id": "p3"})["Item"]["coins"] == 80
+
+    # Stale version: nothing is applied
+    with pytest.raises(VersionConflictError):
+        store.settle_hand("room-1", 1, {"status": "again"}, deltas)
+
+    assert store.get_room("room-1")["status"] == "settled"
+    assert users.get_item(Key={"user_id": "p1"})["Item"]["coins"] == 120
@@ -0,0 +1,227 @@
+"""Unit tests for the game-history archive and replay."""
+
+import json
+import random
+from itertools import islice
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from functions.history import handler as history_fn
+from shared import history as history_module
+from shared.deal import DECK_SIZE, NUM_PLAYERS
+from shared.history import (
+    GameArchiver,
+    GameHistory,
+    GameLog,
+    GameNotFoundError,
+    HandLog,
+    Transfer,
+    decode_game,
+    encode_game,
+    game_from_dict,
+    game_to_dict,
+    iter_states,
+)
+from shared.state_sync import Play
+
+
+def play_hand(rng, deck, leader, tribute=()):
+    """Play out a hand with random legal-looking plays and passes."""
+    hand = HandLog(deck=deck, leader=leader, tribute=list(tribute))
+    held = [list(deck[seat * 27:(seat + 1) * 27]) for seat in range(NUM_PLAYERS)]
+    for transfer in tribute:
+        held[transfer.giver].remove(transfer.card)
+        held[transfer.receiver].insert(0, transfer.card)
+    seat = leader
+    while sum(1 for cards in held if cards) > 1:
+        if held[seat]:
+            if rng.random() < 0.3:
+                hand.plays.append(Play(seat=seat, cards=b""))
+            else:
+                count = min(len(held[seat]), rng.randint(1, 4))
+                cards, held[seat] = held[seat][:count], held[seat][count:]
+                hand.plays.append(Play(seat=seat, cards=bytes(cards)))
+        seat = (seat + 1) % NUM_PLAYERS
+        while not held[seat]:
+            seat = (seat + 1) % NUM_PLAYERS
+    return hand
+
+
+def make_game(game_id, hands=3, seed=0):
+    """Build a completed game of several hands."""
+    rng = random.Random(seed)
+    return GameLog(
+        game_id=game_id,
+        room_id="room-1",
+        hands=[
+            play_hand(rng, bytes(rng.sample(range(DECK_SIZE), DECK_SIZE)), rng.randrange(4))
+            for _ in range(hands)
+        ],
+    )
+
+
+def test_encode_decode_round_trip():
+    """Test a game decodes to the same hands and plays."""
+    game = make_game("g1")
+    blob, frames = encode_game(game, snapshot_interval=8)
+
+    decoded = decode_game("g1", "room-1", blob, frames)
+
+    assert decoded == game
+    assert len(frames) > len(game.hands)
+
+
+@mock_aws
+def test_tribute_cards_are_replayed(history_store):
+    """Test cards passed in tribute can be played by their new holder."""
+    deck = bytes(random.Random(1).sample(range(DECK_SIZE), DECK_SIZE))
+    tribute = [Transfer(giver=3, receiver=0, card=deck[81]), Transfer(0, 3, deck[0])]
+    hand = play_hand(random.Random(2), deck, leader=3, tribute=tribute)
+    game = GameLog(game_id="g1", room_id="room-1", hands=[hand])
+    archiver = GameArchiver(snapshot_interval=8)
+    archiver.add(game)
+    archiver.flush()
+
+    start = next(iter_states(game, 0))
+    blob, frames = encode_game(game, snapshot_interval=8)
+
+    assert deck[81] in start.cards[0] and deck[81] not in start.cards[3]
+    assert any(deck[81] in play.cards for play in hand.plays if play.seat == 0)
+    assert decode_game("g1", "room-1", blob, frames) == game
+    assert game_from_dict(json.loads(json.dumps(game_to_dict(game)))) == game
+    history = GameHistory()
+    for move, expected in enumerate(iter_states(game, 0)):
+        assert history.replay("g1", 0, move).cards == expected.cards
+
+
+def test_encoded_game_is_compact():
+    """Test the archive is smaller than the JSON message it came from."""
+    game = make_game("g1", hands=5)
+    blob, _ = encode_game(game)
+
+    assert len(blob) < len(json.dumps(game_to_dict(game))) / 2
+
+
+@mock_aws
+def test_replay_matches_full_replay_at_every_move(history_store):
+    """Test snapshot-based replay agrees with replaying from move zero."""
+    game = make_game("g1", hands=2)
+    archiver = GameArchiver(snapshot_interval=8)
+    archiver.add(game)
+    archiver.flush()
+    history = GameHistory()
+
+    for hand in range(2):
+        for move, expected in enumerate(iter_states(game, hand)):
+            state = history.replay("g1", hand, move)
+            assert state.move == move
+            assert state.cards == expected.cards
+            assert state.turn == expected.turn
+            assert state.finished == expected.finished
+
+
+@mock_aws
+def test_replay_reads_one_frame(history_store):
+    """Test replay issues a single ranged GetObject for its frame."""
+    archiver = GameArchiver(snapshot_interval=8)
+    archiver.add(make_game("g1"))
+    archiver.flush()
+    index = history_store.get_item(Key={"game_id": "g1"})["Item"]
+    frame = [f for f in index["frames"] if int(f[0]) == 1 and int(f[1]) == 8][0]
+
+    ranges = []
+
+    def record_range(params, **kwargs):
+        ranges.append(params["Range"])
+
+    events = history_module.s3.meta.events
+    events.register("provide-client-params.s3.GetObject", record_range)
+    try:
+        state = GameHistory().replay("g1", 1, 10)
+    finally:
+        events.unregister("provide-client-params.s3.GetObject", record_range)
+
+    assert state.move == 10
+    assert ranges == [f"bytes={int(frame[2])}-{int(frame[2]) + int(frame[3]) - 1}"]
+
+
+@mock_aws
+def test_batched_games_share_one_object(history_store):
+    """Test a flush writes all buffered games to one object and indexes each."""
+    archiver = GameArchiver()
+    for i in range(5):
+        archiver.add(make_game(f"g{i}", seed=i))
+    key = archiver.flush()
+
+    objects = boto3.client("s3", region_name="us-east-1").list_objects_v2(
+        Bucket="guandan-history"
+    )
+    history = GameHistory()
+
+    assert objects["KeyCount"] == 1
+    assert archiver.pending == 0
+    for i in range(5):
+        assert history.get_index(f"g{i}")["key"] == key
+        assert history.load_game(f"g{i}") == make_game(f"g{i}", seed=i)
+
+
+@mock_aws
+def test_replay_errors(history_store):
+    """Test unknown games and out-of-range moves are rejected."""
+    archiver = GameArchiver()
+    archiver.add(make_game("g1", hands=1))
+    archiver.flush()
+    history = GameHistory()
+
+    with pytest.raises(GameNotFoundError):
+        history.replay("missing", 0)
+    with pytest.raises(ValueError):
+        history.replay("g1", 5)
+    with pytest.raises(ValueError):
+        history.replay("g1", 0, 10_000)
+
+
+@mock_aws
+def test_sqs_batch_and_replay_route(lambda_context, history_store):
+    """Test the handler archives queued games and serves replays."""
+    game = make_game("g1")
+    records = [
+        {"messageId": "m1", "body": json.dumps(game_to_dict(game))},
+        {"messageId": "m2", "body": "not json"},
+    ]
+
+    response = history_fn.handler({"Records": records}, lambda_context)
+    replay = history_fn.handler(
+        {
+            "httpMethod": "GET",
+            "path": "/games/g1/replay",
+            "headers": {},
+            "pathParameters": {"gameId": "g1"},
+            "queryStringParameters": {"hand": "0", "move": "4"},
+            "body": None,
+        },
+        lambda_context,
+    )
+    body = json.loads(replay["body"])
+    expected = next(islice(iter_states(game, 0), 4, None))
+
+    assert response == {"batchItemFailures": []}
+    assert replay["statusCode"] == 200
+    assert body["move"] == 4
+    assert body["handCounts"] == [len(cards) for cards in expected.cards]
+
+
+@mock_aws
+def test_game_with_foreign_cards_is_rejected(lambda_context, history_store):
+    """Test a move log playing cards the seat does not hold is dropped."""
+    game = make_game("bad", hands=1)
+    game.hands[0].plays.insert(0, Play(seat=game.hands[0].leader, cards=bytes([200])))
+    records = [{"messageId": "m1", "body": json.dumps(game_to_dict(game))}]
+
+    response = history_fn.handler({"Records": records}, lambda_context)
+
+    assert response == {"batchItemFailures": []}
+    with pytest.raises(GameNotFoundError):
+        GameHistory().get_index("bad")
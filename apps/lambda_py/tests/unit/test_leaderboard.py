@@ -0,0 +1,126 @@
+"""Unit tests for the leaderboard stream consumer and route."""
+
+import json
+import os
+
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_aws
+
+os.environ["LEADERBOARD_TABLE_NAME"] = "Leaderboard"
+
+from functions.leaderboard import handler as leaderboard_fn
+from shared.leaderboard import Leaderboard, shard_key
+
+serializer = TypeSerializer()
+
+
+def stream_record(room_id, new_result, old_result=None, event_name="MODIFY"):
+    """Build a Rooms stream record as DynamoDB Streams delivers it."""
+    def image(result):
+        item = {"room_id": room_id, "version": 3}
+        if result is not None:
+            item["last_result"] = result
+        return {key: serializer.serialize(value) for key, value in item.items()}
+
+    return {
+        "eventID": f"{room_id}-{new_result['hand_id']}",
+        "eventName": event_name,
+        "eventSource": "aws:dynamodb",
+        "dynamodb": {
+            "Keys": {"room_id": {"S": room_id}},
+            "NewImage": image(new_result),
+            "OldImage": image(old_result),
+            "StreamViewType": "NEW_AND_OLD_IMAGES",
+        },
+    }
+
+
+def hand(hand_id, scores, season="s1", region="global"):
+    """Settled-hand result as written to a room's last_result."""
+    return {"hand_id": hand_id, "season": season, "region": region, "scores": scores}
+
+
+def leaderboard_event(**params):
+    """GET /leaderboard API Gateway event."""
+    return {
+        "httpMethod": "GET",
+        "path": "/leaderboard",
+        "headers": {},
+        "queryStringParameters": params or None,
+        "pathParameters": None,
+        "body": None,
+    }
+
+
+@mock_aws
+def test_stream_builds_top_n(lambda_context, leaderboard_table):
+    """Test replayed stream records produce a ranked board."""
+    records = [
+        stream_record("r1", hand("h1", {"a": 3, "b": 1, "c": -1, "d": -3})),
+        stream_record("r2", hand("h2", {"a": 1, "b": 3, "e": 2, "f": 0})),
+        stream_record("r1", hand("h3", {"b": 2, "c": 1}), old_result=hand("h1", {})),
+    ]
+
+    summary = leaderboard_fn.handler({"Records": records}, lambda_context)
+    response = leaderboard_fn.handler(leaderboard_event(season="s1", limit="3"), lambda_context)
+    body = json.loads(response["body"])
+
+    assert summary == {"recorded": 3, "duplicates": 0, "boards": 1}
+    assert response["statusCode"] == 200
+    assert [(e["userId"], e["score"]) for e in body["entries"]] == [("b", 6), ("a", 4), ("e", 2)]
+    assert body["entries"][0]["rank"] == 1
+
+
+@mock_aws
+def test_redelivered_records_are_applied_once(lambda_context, leaderboard_table):
+    """Test a retried batch does not double-count scores."""
+    records = [stream_record("r1", hand("h1", {"a": 3, "b": -3}))]
+
+    leaderboard_fn.handler({"Records": records}, lambda_context)
+    summary = leaderboard_fn.handler({"Records": records}, lambda_context)
+    response = leaderboard_fn.handler(leaderboard_event(season="s1"), lambda_context)
+    body = json.loads(response["body"])
+
+    assert summary["duplicates"] == 1
+    assert [(e["userId"], e["score"]) for e in body["entries"]] == [("a", 3), ("b", -3)]
+
+
+@mock_aws
+def test_unchanged_result_is_ignored(lambda_context, leaderboard_table):
+    """Test room updates that keep the same last_result are skipped."""
+    result = hand("h1", {"a": 3})
+    records = [
+        stream_record("r1", result, old_result=result),
+        stream_record("r1", result, event_name="REMOVE"),
+    ]
+
+    summary = leaderboard_fn.handler({"Records": records}, lambda_context)
+
+    assert summary == {"recorded": 0, "duplicates": 0, "boards": 0}
+
+
+@mock_aws
+def test_scores_are_spread_over_shards(leaderboard_table):
+    """Test a player's points land on several shards and sum correctly."""
+    board = Leaderboard(shards=4)
+    for i in range(40):
+        board.record_hand(f"h{i}", "s1", "global", {"hot": 1})
+
+    shards = [
+        leaderboard_table.get_item(Key={"pk": shard_key("s1", "global", "hot", s)}).get("Item")
+        for s in range(4)
+    ]
+
+    assert sum(1 for item in shards if item) > 1
+    assert board.player_totals("s1", "global", ["hot"]) == {"hot": 40}
+
+
+@mock_aws
+def test_empty_board_and_conditional_get(lambda_context, leaderboard_table):
+    """Test an empty board returns no entries and honours If-None-Match."""
+    first = leaderboard_fn.handler(leaderboard_event(), lambda_context)
+    assert json.loads(first["body"])["entries"] == []
+
+    event = leaderboard_event()
+    event["headers"] = {"If-None-Match": first["headers"]["ETag"]}
+    assert leaderboard_fn.handler(event, lambda_context)["statusCode"] == 304
@@ -0,0 +1,119 @@
+"""Unit tests for shared logging configuration."""
+
+import io
+import json
+import uuid
+
+import pytest
+
+from shared import logs
+from shared.logs import buffered_logging, create_logger
+
+
+@pytest.fixture
+def log_stream():
+    """Fresh logger writing JSON lines to an in-memory stream."""
+    stream = io.StringIO()
+    return create_logger(f"test-logs-{uuid.uuid4()}", stream=stream), stream
+
+
+def lines(stream):
+    """Decode the JSON log lines written so far."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_fast_request_discards_details(log_stream):
+    """Test INFO lines of a fast, successful request are never written."""
+    logger, stream = log_stream
+
+    @buffered_logging(logger, slow_ms=1000, sample_rate=0)
+    def handler(event, context):
+        logger.info("Processing request", extra={"path": "/hello"})
+        return {"statusCode": 200}
+
+    handler({}, None)
+
+    assert lines(stream) == []
+
+
+def test_error_log_flushes_details_in_order(log_stream):
+    """Test an ERROR record writes the buffered lines before itself."""
+    logger, stream = log_stream
+
+    @buffered_logging(logger, slow_ms=1000, sample_rate=0)
+    def handler(event, context):
+        logger.info("Processing request")
+        logger.error("Failed")
+        logger.info("After error")
+        return {"statusCode": 200}
+
+    handler({}, None)
+
+    assert [line["message"] for line in lines(stream)] == [
+        "Processing request",
+        "Failed",
+        "After error",
+    ]
+
+
+def test_server_error_and_slow_requests_flush(log_stream):
+    """Test 5xx responses and slow requests keep their detail."""
+    logger, stream = log_stream
+
+    @buffered_logging(logger, slow_ms=1000, sample_rate=0)
+    def failing(event, context):
+        logger.info("Processing request", extra={"path": "/users"})
+        return {"statusCode": 500}
+
+    @buffered_logging(logger, slow_ms=-1, sample_rate=0)
+    def slow(event, context):
+        logger.info("Slow request")
+        return {"statusCode": 200}
+
+    failing({}, None)
+    slow({}, None)
+
+    written = lines(stream)
+    assert [line["message"] for line in written] == ["Processing request", "Slow request"]
+    assert written[0]["path"] == "/users"
+
+
+def test_exception_flushes_and_propagates(log_stream):
+    """Test an uncaught exception writes the buffered lines."""
+    logger, stream = log_stream
+
+    @buffered_logging(logger, slow_ms=1000, sample_rate=0)
+    def handler(event, context):
+        logger.info("Processing request")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        handler({}, None)
+
+    assert [line["message"] for line in lines(stream)] == ["Processing request"]
+
+
+def test_sampled_request_writes_immediately(log_stream):
+    """Test sampled requests are not buffered."""
+    logger, stream = log_stream
+
+    @buffered_logging(logger, slow_ms=1000, sample_rate=1)
+    def handler(event, context):
+        logger.info("Sampled")
+        return {"statusCode": 200}
+
+    handler({}, None)
+
+    assert [line["message"] for line in lines(stream)] == ["Sampled"]
+
+
+def test_static_keys_are_cached(monkeypatch):
+    """Test static fields are read from the environment once."""
+    monkeypatch.setattr(logs, "_static_keys", None)
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_VERSION", "7")
+    keys = logs.static_log_keys()
+
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_VERSION", "8")
+
+    assert logs.static_log_keys() is keys
+    assert keys["function_version"] == "7"
@@ -0,0 +1,227 @@
+"""Unit tests for the matchmaking queue, store and function."""
+
+import json
+
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from functions.matchmaking import handler as matchmaking_fn
+from shared.matchmaking import MatchmakingStore, MatchQueue, Ticket
+
+NOW = 1_800_000_000.0
+
+
+def ticket(user_id, skill, latency_ms=40, waited=0.0):
+    """Ticket queued ``waited`` seconds before NOW."""
+    return Ticket(user_id=user_id, skill=skill, latency_ms=latency_ms, enqueued_at=NOW - waited)
+
+
+def api_event(method, path, body=None, user_id=None, caller=None):
+    """API Gateway event for the matchmaking routes, verified as ``caller`` if given."""
+    event = {
+        "httpMethod": method,
+        "path": path,
+        "headers": {},
+        "pathParameters": {"userId": user_id} if user_id else None,
+        "queryStringParameters": None,
+        "body": json.dumps(body) if body is not None else None,
+    }
+    if caller:
+        event["requestContext"] = {"authorizer": {"claims": {"sub": caller}}}
+    return event
+
+
+def reset_matchmaker():
+    """Empty the function's in-memory queue between tests."""
+    matchmaking_fn.queue = MatchQueue()
+    matchmaking_fn._watermark = 0
+
+
+def test_rooms_form_within_a_bucket():
+    """Test four close players form a room and distant ones wait."""
+    queue = MatchQueue()
+    for i in range(4):
+        queue.add(ticket(f"close{i}", 1510 + i))
+    queue.add(ticket("far", 2500))
+
+    rooms = queue.tick(NOW)
+
+    assert [sorted(t.user_id for t in room) for room in rooms] == [
+        [f"close{i}" for i in range(4)]
+    ]
+    assert len(queue) == 1 and "far" in queue
+
+
+def test_partners_are_closest_in_skill():
+    """Test the anchor is matched with the nearest skills in range."""
+    queue = MatchQueue(skill_width=1000)
+    queue.add(ticket("anchor", 1500, waited=5))
+    for user_id, skill in (("a", 1490), ("b", 1800), ("c", 1520), ("d", 1505), ("e", 1100)):
+        queue.add(ticket(user_id, skill))
+
+    (room,) = queue.tick(NOW)
+
+    assert room[0].user_id == "anchor"
+    assert {t.user_id for t in room[1:]} == {"a", "c", "d"}
+
+
+def test_search_widens_with_wait():
+    """Test players in neighbouring buckets match only after waiting."""
+    queue = MatchQueue(skill_width=100, widen_seconds=10)
+    queue.add(ticket("anchor", 1450))
+    for i, skill in enumerate((1550, 1560, 1570)):
+        queue.add(ticket(f"n{i}", skill))
+
+    assert queue.tick(NOW) == []
+    assert len(queue.tick(NOW + 10)) == 1
+    assert len(queue) == 0
+
+
+def test_latency_buckets_keep_regions_apart():
+    """Test similar skills with very different latency are not matched early."""
+    queue = MatchQueue(latency_width=50)
+    for i in range(2):
+        queue.add(ticket(f"near{i}", 1500, latency_ms=20))
+        queue.add(ticket(f"far{i}", 1500, latency_ms=220))
+
+    assert queue.tick(NOW) == []
+
+
+def test_re_adding_replaces_ticket():
+    """Test re-queueing a player keeps one ticket in the right bucket."""
+    queue = MatchQueue()
+    queue.add(ticket("p", 1000))
+    queue.add(ticket("p", 2000))
+
+    assert len(queue) == 1
+    assert queue.remove("p").skill == 2000
+    assert queue.remove("p") is None
+
+
+@mock_aws
+def test_store_commits_room_and_marks_tickets(matchmaking_tables):
+    """Test a committed room flips its tickets to matched and drops them from the index."""
+    rooms, _ = matchmaking_tables
+    store = MatchmakingStore()
+    tickets = [ticket(f"p{i}", 1500 + i, waited=i) for i in range(4)]
+    for t in tickets:
+        store.enqueue(t)
+
+    loaded = store.load_since(0)
+    room_id, gone = store.commit_room(loaded, NOW)
+
+    assert [t.user_id for t in loaded] == ["p3", "p2", "p1", "p0"]
+    assert gone == []
+    assert store.get("p0")["status"] == "matched"
+    assert store.get("p0")["room_id"] == room_id
+    assert store.load_since(0) == []
+    room = rooms.get_item(Key={"room_id": room_id})["Item"]
+    assert [seat["user_id"] for seat in room["seats"]] == ["p3", "p2", "p1", "p0"]
+    assert room["skill_spread"] == 3
+
+
+@mock_aws
+def test_store_rejects_room_with_departed_player(matchmaking_tables):
+    """Test a player who left the queue blocks the room and is reported."""
+    rooms, _ = matchmaking_tables
+    store = MatchmakingStore()
+    tickets = [ticket(f"p{i}", 1500) for i in range(4)]
+    for t in tickets:
+        store.enqueue(t)
+    store.cancel("p2")
+
+    room_id, gone = store.commit_room(tickets, NOW)
+
+    assert room_id is None
+    assert gone == ["p2"]
+    assert store.get("p0")["status"] == "queued"
+    assert rooms.scan()["Count"] == 0
+
+
+@mock_aws
+def test_queue_api_and_tick(lambda_context, matchmaking_tables):
+    """Test players queued through the API are matched by a tick."""
+    reset_matchmaker()
+    for i in range(5):
+        response = matchmaking_fn.handler(
+            api_event("POST", "/matchmaking", {"userId": f"u{i}", "skill": 1500 + i}),
+            lambda_context,
+        )
+        assert response["statusCode"] == 202
+    matchmaking_fn.handler(api_event("DELETE", "/matchmaking/u4", user_id="u4"), lambda_context)
+
+    totals = matchmaking_fn.handler({"tick": True, "runSeconds": 0}, lambda_context)
+    status = json.loads(
+        matchmaking_fn.handler(
+            api_event("GET", "/matchmaking/u0", user_id="u0"), lambda_context
+        )["body"]
+    )
+
+    assert totals["rooms"] == 1
+    assert totals["waiting"] == 0
+    assert status["status"] == "matched"
+    assert status["roomId"]
+
+
+@mock_aws
+def test_failed_commit_requeues_players(lambda_context, matchmaking_tables, monkeypatch):
+    """Test a room whose write fails goes back to the queue without stopping the tick."""
+    reset_matchmaker()
+    for i in range(8):
+        skill = 1000 + i if i < 4 else 2000 + i
+        matchmaking_fn.handler(
+            api_event("POST", "/matchmaking", {"userId": f"u{i}", "skill": skill}),
+            lambda_context,
+        )
+    original = matchmaking_fn.store.commit_room
+
+    def conflict_for_low_skill(tickets, now):
+        if tickets[0].skill < 1500:
+            raise ClientError(
+                {"Error": {"Code": "TransactionCanceledException", "Message": "Conflict"}},
+                "TransactWriteItems",
+            )
+        return original(tickets, now)
+
+    monkeypatch.setattr(matchmaking_fn.store, "commit_room", conflict_for_low_skill)
+    first = matchmaking_fn.run_tick(NOW)
+    monkeypatch.setattr(matchmaking_fn.store, "commit_room", original)
+    second = matchmaking_fn.run_tick(NOW + 2)
+
+    assert (first["rooms"], first["failed"], first["waiting"]) == (1, 1, 4)
+    assert (second["rooms"], second["waiting"]) == (1, 0)
+    assert MatchmakingStore().get("u0")["status"] == "matched"
+
+
+@mock_aws
+def test_invalid_request_is_rejected(lambda_context, matchmaking_tables):
+    """Test out-of-range fields are reported as validation errors."""
+    response = matchmaking_fn.handler(
+        api_event("POST", "/matchmaking", {"userId": "u", "latencyMs": -5}), lambda_context
+    )
+
+    assert response["statusCode"] == 400
+
+
+@mock_aws
+def test_callers_act_only_for_themselves(lambda_context, matchmaking_tables):
+    """Test a verified caller cannot queue, read or cancel another player's ticket."""
+    reset_matchmaker()
+    own = matchmaking_fn.handler(
+        api_event("POST", "/matchmaking", {"skill": 1200}, caller="alice"), lambda_context
+    )
+    spoofed = matchmaking_fn.handler(
+        api_event("POST", "/matchmaking", {"userId": "bob"}, caller="alice"), lambda_context
+    )
+    read = matchmaking_fn.handler(
+        api_event("GET", "/matchmaking/alice", user_id="alice", caller="mallory"), lambda_context
+    )
+    cancel = matchmaking_fn.handler(
+        api_event("DELETE", "/matchmaking/alice", user_id="alice", caller="mallory"),
+        lambda_context,
+    )
+
+    assert json.loads(own["body"])["userId"] == "alice"
+    assert [spoofed["statusCode"], read["statusCode"], cancel["statusCode"]] == [403] * 3
+    assert MatchmakingStore().get("alice")["status"] == "queued"
+    assert MatchmakingStore().get("bob") is None
@@ -0,0 +1,49 @@
+"""Unit tests for shared allocation profiling."""
+
+import tracemalloc
+from unittest.mock import MagicMock
+
+from shared.memprofile import memory_profile, profile_call
+
+
+def allocating_handler(event, context):
+    """Handler retaining roughly 1 MB."""
+    event["retained"] = [bytes(1024) for _ in range(1024)]
+    return {"statusCode": 200}
+
+
+def test_disabled_returns_handler_unchanged():
+    """Test the decorator adds no wrapper when sampling is off."""
+    assert memory_profile(MagicMock(), sample_rate=0)(allocating_handler) is allocating_handler
+
+
+def test_disabled_by_default(monkeypatch):
+    """Test profiling is off unless the env var sets a sample rate."""
+    monkeypatch.delenv("MEMORY_PROFILE_SAMPLE_RATE", raising=False)
+    assert memory_profile(MagicMock())(allocating_handler) is allocating_handler
+
+
+def test_profile_call_reports_peak_and_sites():
+    """Test the peak and the allocating line are reported."""
+    response, fields = profile_call(allocating_handler, {}, None)
+
+    assert response == {"statusCode": 200}
+    assert fields["memory_peak_kb"] >= 1024
+    assert fields["memory_retained_kb"] >= 1024
+    assert "test_memprofile.py" in fields["memory_top_sites"][0]["site"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_sampled_invocation_logs_profile(monkeypatch):
+    """Test a sampled invocation logs structured profile fields."""
+    monkeypatch.setenv("MEMORY_PROFILE_TOP", "3")
+    logger = MagicMock()
+    handler = memory_profile(logger, sample_rate=1)(allocating_handler)
+
+    assert handler({}, None) == {"statusCode": 200}
+
+    message = logger.info.call_args.args[0]
+    fields = logger.info.call_args.kwargs["extra"]
+    assert message == "Memory profile"
+    assert len(fields["memory_top_sites"]) <= 3
+    assert fields["memory_peak_kb"] >= 1024
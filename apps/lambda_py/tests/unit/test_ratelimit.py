@@ -0,0 +1,123 @@
+"""Unit tests for shared rate limiting."""
+
+from shared.ratelimit import RateLimiter, caller_identity, rate_limit
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now=1_000_020.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_local_bucket_limits_burst(rate_limit_table):
+    """Test the local bucket rejects requests beyond the burst."""
+    clock = FakeClock()
+    limiter = RateLimiter(limit=60, burst=3, sync_every=100, clock=clock)
+
+    assert [limiter.allow("ip:1") for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 1  # refills one token at 1 per second
+    assert limiter.allow("ip:1")
+    assert limiter.allow("ip:2")
+
+
+def test_syncs_in_batches(rate_limit_table):
+    """Test usage is written with one ADD per sync_every requests."""
+    limiter = RateLimiter(limit=100, sync_every=5, clock=FakeClock())
+
+    for _ in range(12):
+        assert limiter.allow("ip:1")
+
+    assert limiter.syncs == 2
+    item = rate_limit_table.scan()["Items"][0]
+    assert item["count"] == 10
+    assert item["key"] == "ip:1#1000020"
+
+
+def test_global_counter_blocks_across_containers(rate_limit_table):
+    """Test a caller exhausting the window in other containers is blocked here."""
+    clock = FakeClock()
+    other = RateLimiter(limit=10, sync_every=1, clock=clock)
+    local = RateLimiter(limit=10, sync_every=1, clock=clock)
+
+    for _ in range(9):
+        assert other.allow("user:a")
+
+    assert local.allow("user:a")  # 10th request: the shared count reaches the limit
+    assert not local.allow("user:a")
+    assert local.retry_after("user:a") == 60
+
+    clock.now += 60
+    assert local.allow("user:a")
+
+
+def test_sync_failure_keeps_usage(rate_limit_table):
+    """Test requests are still limited locally when the table is unavailable."""
+    limiter = RateLimiter(limit=5, sync_every=1, clock=FakeClock(), table_name="Missing")
+
+    assert [limiter.allow("ip:1") for _ in range(6)] == [True] * 5 + [False]
+    assert limiter.syncs == 0
+    assert limiter.sync_errors == 1  # retried only after the backoff
+
+
+def test_sparse_caller_syncs_in_batches(rate_limit_table):
+    """Test a caller far under its limit writes once per sync_every requests."""
+    clock = FakeClock(1_000_020.0)
+    limiter = RateLimiter(limit=30, sync_every=10, clock=clock)
+    writes = []
+    original = limiter.table.update_item
+
+    def record_write(**kwargs):
+        writes.append(kwargs)
+        return original(**kwargs)
+
+    limiter.table.update_item = record_write
+
+    for _ in range(20):
+        assert limiter.allow("ip:1")
+        clock.now += 2
+
+    assert len(writes) == 2
+    assert rate_limit_table.scan()["Items"][0]["count"] == 20
+
+
+def test_caller_near_limit_syncs_every_request(rate_limit_table):
+    """Test syncs tighten once known usage reaches near_limit of the limit."""
+    limiter = RateLimiter(limit=10, sync_every=5, near_limit=0.8, clock=FakeClock())
+
+    for _ in range(9):
+        assert limiter.allow("ip:1")
+
+    # Batch at 5, then every request from the 8th (8 >= 0.8 * 10)
+    assert limiter.syncs == 3
+
+
+def test_decorator_returns_429(rate_limit_table):
+    """Test the decorator rejects callers over the limit with Retry-After."""
+    limiter = RateLimiter(limit=1, clock=FakeClock())
+    handler = rate_limit(limiter)(lambda event, context: {"statusCode": 201})
+    event = {"requestContext": {"identity": {"sourceIp": "10.0.0.1"}}}
+
+    assert handler(event, None)["statusCode"] == 201
+    response = handler(event, None)
+
+    assert response["statusCode"] == 429
+    assert int(response["headers"]["Retry-After"]) >= 1
+
+
+def test_caller_identity_prefers_claims():
+    """Test authenticated callers are limited by user, not IP."""
+    event = {
+        "requestContext": {
+            "identity": {"sourceIp": "10.0.0.1"},
+            "authorizer": {"claims": {"sub": "user-1"}},
+        }
+    }
+
+    assert caller_identity(event) == "user:user-1"
+    anonymous = {"requestContext": {"identity": {"sourceIp": "10.0.0.1"}}}
+    assert caller_identity(anonymous) == "ip:10.0.0.1"
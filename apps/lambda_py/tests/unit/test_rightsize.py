@@ -0,0 +1,78 @@
+"""Unit tests for the memory right-sizing script."""
+
+import pytest
+
+from scripts import rightsize
+
+# 20 ms of I/O plus 30 ms of CPU at a full vCPU, observed at 512 and 1024 MB
+REPORT_LINES = [
+    "2024-01-01T00:00:00.000Z\tREPORT RequestId: 1f0c Duration: 123.70 ms\t"
+    "Billed Duration: 124 ms\tMemory Size: 512 MB\tMax Memory Used: 90 MB\t"
+    "Init Duration: 412.30 ms",
+    "REPORT RequestId: 2a9d Duration: 123.70 ms Billed Duration: 124 ms "
+    "Memory Size: 512 MB Max Memory Used: 84 MB",
+    "REPORT RequestId: 3b8e Duration: 71.80 ms Billed Duration: 72 ms "
+    "Memory Size: 1024 MB Max Memory Used: 88 MB",
+]
+
+
+def recommended_memory(reports, headroom=1.2, max_duration_ms=None):
+    """Run the script's model and recommendation over parsed reports."""
+    io_ms, cpu_ms = rightsize.fit_model(reports, None)
+    estimates = [
+        rightsize.estimate(memory, io_ms, cpu_ms, "x86_64")
+        for memory in rightsize.CANDIDATE_SIZES
+    ]
+    floor_mb = max(r.max_used_mb for r in reports) * headroom
+    best = rightsize.recommend(estimates, floor_mb, 0.05, max_duration_ms)
+    return best.memory_mb if best else None
+
+
+def test_parse_report_reads_fields_behind_prefixes():
+    """Test REPORT fields are parsed with or without a timestamp prefix."""
+    cold, warm, _ = (rightsize.parse_report(line) for line in REPORT_LINES)
+
+    assert cold == rightsize.Report(
+        duration_ms=123.7, memory_mb=512, max_used_mb=90, init_ms=412.3
+    )
+    assert warm.init_ms is None and warm.max_used_mb == 84
+
+
+def test_parse_report_skips_other_lines():
+    """Test non-REPORT lines and truncated REPORT lines are ignored."""
+    assert rightsize.parse_report("START RequestId: 1f0c Version: $LATEST") is None
+    assert rightsize.parse_report("REPORT RequestId: 1f0c Duration: 12.00 ms") is None
+
+
+def test_fit_model_splits_io_and_cpu_across_sizes():
+    """Test durations at two memory sizes recover the I/O and CPU parts."""
+    reports = [rightsize.parse_report(line) for line in REPORT_LINES]
+
+    io_ms, cpu_ms = rightsize.fit_model(reports, None)
+
+    assert io_ms == pytest.approx(20, abs=0.5)
+    assert cpu_ms == pytest.approx(30, abs=0.5)
+
+
+def test_fit_model_uses_benchmark_for_one_size():
+    """Test one memory size is split with the benchmark CPU time, or all CPU without it."""
+    reports = [rightsize.Report(duration_ms=50.0, memory_mb=1769, max_used_mb=80)]
+
+    assert rightsize.fit_model(reports, 30.0) == pytest.approx((20.0, 30.0))
+    assert rightsize.fit_model(reports, None) == pytest.approx((0.0, 50.0))
+
+
+@pytest.mark.parametrize(
+    "headroom, max_duration_ms, expected",
+    [
+        (1.2, None, 256),
+        (5.6, None, 640),
+        (1.2, 60, 1769),
+        (40.0, None, None),
+    ],
+)
+def test_recommend_memory(headroom, max_duration_ms, expected):
+    """Test the fastest size within 5% of the cheapest is recommended above the floor."""
+    reports = [rightsize.parse_report(line) for line in REPORT_LINES]
+
+    assert recommended_memory(reports, headroom, max_duration_ms) == expected
@@ -0,0 +1,89 @@
+"""Unit tests for shared router and the single-deployment entry point."""
+
+import json
+
+from moto import mock_aws
+
+from functions.app.handler import handler as app_handler
+from shared.router import LazyHandler, Router, compile_template
+
+
+def make_event(method, path, body=None):
+    """Build an API Gateway proxy event."""
+    return {
+        "httpMethod": method,
+        "path": path,
+        "headers": {},
+        "queryStringParameters": None,
+        "pathParameters": None,
+        "body": json.dumps(body) if body is not None else None,
+    }
+
+
+def echo(event, context):
+    """Return the path parameters the router passed in."""
+    return {"statusCode": 200, "body": json.dumps(event.get("pathParameters"))}
+
+
+def test_compile_template():
+    """Test templates compile to patterns with named parameters."""
+    pattern, names = compile_template("/rooms/{roomId}/seats/{seat}")
+
+    assert names == ["roomId", "seat"]
+    assert pattern.match("/rooms/r1/seats/2").groupdict() == {"roomId": "r1", "seat": "2"}
+    assert pattern.match("/rooms/r1/seats") is None
+
+
+def test_resolve_static_and_dynamic():
+    """Test static and templated routes resolve with parameters."""
+    router = Router()
+    router.add("GET", "/rooms", echo)
+    router.add("GET", "/rooms/{roomId}", echo)
+    router.add("GET", "/files/{proxy+}", echo)
+
+    assert router.resolve("GET", "/rooms") == (echo, {})
+    assert router.resolve("GET", "/rooms/abc") == (echo, {"roomId": "abc"})
+    assert router.resolve("GET", "/files/a/b.txt") == (echo, {"proxy": "a/b.txt"})
+    assert router.resolve("POST", "/rooms") is None
+
+
+def test_dispatch_not_found_and_method_not_allowed():
+    """Test unknown paths return 404 and known paths with other methods 405."""
+    router = Router()
+    router.add("GET", "/rooms/{roomId}", echo)
+
+    assert router.dispatch(make_event("GET", "/nope"), None)["statusCode"] == 404
+    assert router.dispatch(make_event("DELETE", "/rooms/1"), None)["statusCode"] == 405
+
+    response = router.dispatch(make_event("GET", "/rooms/1"), None)
+    assert json.loads(response["body"]) == {"roomId": "1"}
+
+
+def test_lazy_handler_imports_on_first_call():
+    """Test mounted handlers are imported by dotted path."""
+    lazy = LazyHandler("json.dumps")
+
+    assert lazy.load() is json.dumps
+
+
+def test_app_routes_hello(lambda_context):
+    """Test the bundled entry point serves hello."""
+    response = app_handler(make_event("GET", "/hello"), lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["message"] == "Hello, World!"
+
+
+@mock_aws
+def test_app_routes_user(lambda_context, dynamodb_table):
+    """Test the bundled entry point serves user routes with path parameters."""
+    created = app_handler(
+        make_event("POST", "/users", {"username": "app", "email": "app@example.com"}),
+        lambda_context,
+    )
+    user_id = json.loads(created["body"])["user_id"]
+
+    response = app_handler(make_event("GET", f"/users/{user_id}"), lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["username"] == "app"
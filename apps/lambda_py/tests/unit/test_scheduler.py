@@ -0,0 +1,151 @@
+"""Unit tests for the timer wheel and the timeout scheduler."""
+
+from moto import mock_aws
+
+from functions.scheduler import handler as scheduler
+from shared.timers import (
+    KIND_TURN,
+    TURN_TIMEOUT_SECONDS,
+    Timer,
+    TimerWheel,
+    ai_fill_timer,
+    turn_timer,
+)
+
+NOW = 1_800_000_000
+
+
+def playing_room(turn=0, turn_id=5, finished=None):
+    """Room in the middle of a hand."""
+    return {
+        "status": "PLAYING",
+        "seats": [{"user_id": f"u{seat}"} for seat in range(4)],
+        "turn": turn,
+        "turn_id": turn_id,
+        "finished": finished or [],
+    }
+
+
+def start_at(wheel):
+    """Place a wheel's cursor a minute before NOW."""
+    wheel._cursor = None
+    wheel._save_cursor(NOW - 60)
+    return wheel
+
+
+def fresh_wheel():
+    """New wheel with its cursor a minute before NOW."""
+    return start_at(TimerWheel())
+
+
+@mock_aws
+def test_sweep_claims_due_timers_once(scheduler_tables):
+    """Test due timers are returned by one sweep only, and future ones wait."""
+    wheel = fresh_wheel()
+    due = [turn_timer(f"r{i}", 1, NOW - 40 + i) for i in range(5)]
+    later = turn_timer("later", 1, NOW)
+    wheel.schedule_many(due + [later])
+
+    first = wheel.sweep(NOW)
+    second = TimerWheel().sweep(NOW)
+
+    assert sorted(t.room_id for t in first) == [f"r{i}" for i in range(5)]
+    assert second == []
+    assert wheel.sweep(NOW + TURN_TIMEOUT_SECONDS) == [later]
+
+
+@mock_aws
+def test_claim_is_exclusive(scheduler_tables):
+    """Test two claimers of the same timer cannot both win."""
+    wheel = fresh_wheel()
+    timer = turn_timer("r1", 3, NOW - 30)
+    wheel.schedule(timer)
+
+    assert wheel.claim(timer) is True
+    assert wheel.claim(timer) is False
+
+
+@mock_aws
+def test_late_timer_in_swept_bucket_is_picked_up(scheduler_tables):
+    """Test a timer written into a just-swept second fires on the next sweep."""
+    wheel = fresh_wheel()
+    wheel.sweep(NOW)
+    wheel.schedule(Timer(room_id="r1", kind=KIND_TURN, deadline=NOW, token=1))
+
+    assert [t.room_id for t in wheel.sweep(NOW + 1)] == ["r1"]
+
+
+@mock_aws
+def test_cursor_survives_cold_start(scheduler_tables):
+    """Test a new wheel resumes from the persisted cursor."""
+    fresh_wheel().sweep(NOW)
+    TimerWheel().schedule(turn_timer("old", 1, NOW - 200))
+
+    assert TimerWheel(grace_seconds=0).sweep(NOW + 1) == []
+
+
+@mock_aws
+def test_turn_timeout_auto_passes(scheduler_tables):
+    """Test an expired turn passes to the next unfinished seat and re-arms."""
+    rooms, _ = scheduler_tables
+    rooms.put_item(Item={"room_id": "r1", "version": 1, **playing_room(turn=0, finished=[1])})
+    start_at(scheduler.wheel)
+    scheduler.wheel.schedule(turn_timer("r1", 5, NOW - TURN_TIMEOUT_SECONDS))
+
+    summary = scheduler.run_sweep(NOW)
+    room = rooms.get_item(Key={"room_id": "r1"})["Item"]
+
+    assert summary == {"claimed": 1, "fired": 1, "retried": 0}
+    assert room["turn"] == 2
+    assert room["turn_id"] == 6
+    assert room["last_action"] == {"type": "AUTO_PASS", "seat": 0}
+    assert [t.token for t in scheduler.wheel.due(NOW + TURN_TIMEOUT_SECONDS)] == [6]
+
+
+@mock_aws
+def test_stale_turn_timer_is_ignored(scheduler_tables):
+    """Test a timer for a turn that was already played does nothing."""
+    rooms, _ = scheduler_tables
+    rooms.put_item(Item={"room_id": "r1", "version": 1, **playing_room(turn_id=7)})
+    start_at(scheduler.wheel)
+    scheduler.wheel.schedule(turn_timer("r1", 5, NOW - TURN_TIMEOUT_SECONDS))
+
+    summary = scheduler.run_sweep(NOW)
+
+    assert summary == {"claimed": 1, "fired": 0, "retried": 0}
+    assert rooms.get_item(Key={"room_id": "r1"})["Item"]["version"] == 1
+
+
+@mock_aws
+def test_ai_fill_fills_only_empty_seats(scheduler_tables):
+    """Test AI-fill timers for one room are applied in a single write."""
+    rooms, _ = scheduler_tables
+    rooms.put_item(
+        Item={
+            "room_id": "r1",
+            "version": 1,
+            "status": "WAITING",
+            "seats": [{"user_id": "host"}, None, {"user_id": "joined"}, None],
+        }
+    )
+    start_at(scheduler.wheel)
+    scheduler.wheel.schedule_many([ai_fill_timer("r1", seat, NOW - 10) for seat in (1, 2, 3)])
+
+    summary = scheduler.run_sweep(NOW)
+    room = rooms.get_item(Key={"room_id": "r1"})["Item"]
+
+    assert summary == {"claimed": 3, "fired": 2, "retried": 0}
+    assert room["version"] == 2
+    assert room["seats"][2] == {"user_id": "joined"}
+    assert room["seats"][1]["is_ai"] and room["seats"][3]["is_ai"]
+    assert room["seats"][3]["nickname"] == "AI玩家4"
+
+
+@mock_aws
+def test_handler_runs_single_sweep(lambda_context, scheduler_tables):
+    """Test the handler sweeps once when asked for a zero-second run."""
+    scheduler.wheel._cursor = None
+    result = scheduler.handler({"runSeconds": 0}, lambda_context)
+
+    assert result["sweeps"] == 1
+    assert result["fired"] == 0
@@ -0,0 +1,210 @@
+"""Unit tests for end-of-hand settlement and the re-settle script."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from moto import mock_aws
+
+from shared.deal import CARDS_PER_PLAYER, DECK_SIZE, RANKS
+from shared.game_store import GameStore, VersionConflictError
+from shared.history import GameLog, HandLog, pass_cards
+from shared.settlement import (
+    ACE,
+    HandResult,
+    PlayerTotals,
+    commit_settlement,
+    finish_order,
+    pay_tribute,
+    resettle,
+    settle,
+)
+from shared.state_sync import Play
+
+SEATS = ["u0", "u1", "u2", "u3"]
+LEVEL_5 = RANKS.index("5")
+# Card codes (suit * 13 + rank): spades, hearts, clubs, diamonds
+HEART_5 = 13 + LEVEL_5
+SPADE_K = RANKS.index("K")
+SPADE_3 = RANKS.index("3")
+SMALL_JOKER, BIG_JOKER = 104, 106
+
+
+def load_script(name):
+    """Import a module from scripts/."""
+    path = Path(__file__).resolve().parents[2] / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def result(order, levels=(0, 0), seats=SEATS):
+    """Hand result for a finish order."""
+    return HandResult(hand_id="h1", seats=list(seats), finish_order=order, levels=levels)
+
+
+@pytest.mark.parametrize(
+    "order, levels_won, givers, receivers",
+    [
+        ([0, 2, 1, 3], 3, [1, 3], [0, 2]),
+        ([1, 0, 3, 2], 2, [2], [1]),
+        ([2, 1, 3, 0], 1, [0], [2]),
+    ],
+)
+def test_levels_and_tribute_follow_partner_finish(order, levels_won, givers, receivers):
+    """Test the partner's finish sets the levels won and who pays tribute."""
+    before = (2, 4)
+    settlement = settle(result(order, levels=before))
+
+    winners = settlement.winning_team
+    assert settlement.levels_won == levels_won
+    assert settlement.levels[winners] == before[winners] + levels_won
+    assert settlement.levels[1 - winners] == before[1 - winners]
+    assert settlement.tribute_givers == givers
+    assert settlement.tribute_receivers == receivers
+
+
+def test_coins_are_zero_sum_and_skip_ai_seats():
+    """Test coins move from losers to winners and AI seats get nothing."""
+    settlement = settle(result([0, 1, 2, 3], seats=["u0", None, "u2", "u3"]), base_coins=10)
+
+    assert settlement.coin_deltas == {"u0": 20, "u2": 20, "u3": -20}
+    assert settlement.player_deltas()["u3"] == {"rank": 0, "coins": -20}
+    assert settlement.room_attributes("s1", "eu")["last_result"]["scores"] == {"u0": 2, "u2": 2}
+
+
+def test_level_stops_at_ace_and_wins_game():
+    """Test levels cap at A and winning at A ends the game without tribute."""
+    near = settle(result([0, 2, 1, 3], levels=(ACE - 1, 0)))
+    won = settle(result([0, 1, 2, 3], levels=(ACE, 0)))
+    last_partner = settle(result([0, 1, 3, 2], levels=(ACE, 0)))
+
+    assert near.levels == (ACE, 0) and not near.game_over
+    assert won.game_over and won.tribute_givers == []
+    assert won.room_attributes("s", "r")["status"] == "FINISHED"
+    assert not last_partner.game_over
+
+
+def test_invalid_finish_order_is_rejected():
+    """Test a finish order that is not the four seats is rejected."""
+    with pytest.raises(ValueError):
+        settle(result([0, 0, 1, 2]))
+
+
+def test_tribute_pays_highest_non_wild_card():
+    """Test the wild heart is kept and a low card comes back."""
+    cards = [
+        bytes([SPADE_3, 30, 31]),
+        bytes([SPADE_3 + 26, 40, 41]),
+        bytes([50, 51, 39]),
+        bytes([HEART_5, SPADE_K, SPADE_3 + 39]),
+    ]
+
+    outcome = pay_tribute(cards, givers=[3], receivers=[0], level=LEVEL_5)
+
+    (exchange,) = outcome.exchanges
+    assert exchange.card == SPADE_K
+    assert exchange.returned == SPADE_3
+    assert HEART_5 in outcome.cards[3] and SPADE_K in outcome.cards[0]
+    assert outcome.leader == 3
+    replayed = list(cards)
+    pass_cards(replayed, outcome.transfers)
+    assert [sorted(hand) for hand in replayed] == [sorted(hand) for hand in outcome.cards]
+
+
+def test_double_tribute_gives_larger_card_to_first():
+    """Test the larger tribute goes to the first player out and its giver leads."""
+    cards = [
+        bytes([SPADE_3, 1]),
+        bytes([SPADE_K, 2]),
+        bytes([SPADE_3 + 13, 3]),
+        bytes([SMALL_JOKER, 4]),
+    ]
+
+    outcome = pay_tribute(cards, givers=[1, 3], receivers=[0, 2], level=0)
+
+    assert [(e.giver, e.receiver, e.card) for e in outcome.exchanges] == [
+        (3, 0, SMALL_JOKER),
+        (1, 2, SPADE_K),
+    ]
+    assert outcome.leader == 3
+
+
+def test_two_big_jokers_refuse_tribute():
+    """Test givers holding both big jokers keep their cards."""
+    cards = [bytes([1]), bytes([BIG_JOKER]), bytes([2]), bytes([BIG_JOKER + 1])]
+
+    outcome = pay_tribute(cards, givers=[1, 3], receivers=[0, 2], level=0)
+
+    assert outcome.refused
+    assert outcome.exchanges == []
+    assert outcome.cards == cards
+    assert outcome.leader == 0
+
+
+@mock_aws
+def test_commit_settlement_is_one_transaction(game_tables):
+    """Test the room and all players are settled together or not at all."""
+    rooms, users = game_tables
+    store = GameStore()
+    store.create_room("r1", {"status": "PLAYING"})
+    for user_id in SEATS:
+        users.put_item(Item={"user_id": user_id, "coins": 100})
+    settlement = settle(result([1, 3, 0, 2]))
+
+    version = commit_settlement(store, "r1", 1, settlement, "s1", "global")
+
+    room = rooms.get_item(Key={"room_id": "r1"})["Item"]
+    assert version == 2
+    assert room["status"] == "SETTLED"
+    assert room["last_result"]["scores"] == {"u1": 3, "u3": 3}
+    assert users.get_item(Key={"user_id": "u1"})["Item"]["coins"] == 130
+    assert users.get_item(Key={"user_id": "u1"})["Item"]["rank"] == 3
+    assert users.get_item(Key={"user_id": "u0"})["Item"]["coins"] == 70
+
+    with pytest.raises(VersionConflictError):
+        commit_settlement(store, "r1", 1, settlement, "s1", "global")
+    assert users.get_item(Key={"user_id": "u1"})["Item"]["coins"] == 130
+
+
+def played_out(order):
+    """Hand in which seats empty their hands in ``order`` (the last keeps its cards)."""
+    deck = bytes(range(DECK_SIZE))
+    return HandLog(
+        deck=deck,
+        leader=order[0],
+        plays=[
+            Play(seat=seat, cards=deck[seat * CARDS_PER_PLAYER:(seat + 1) * CARDS_PER_PLAYER])
+            for seat in order[:3]
+        ],
+    )
+
+
+def test_resettle_replays_games():
+    """Test archived games are replayed and levels carry over between hands."""
+    game = GameLog("g1", "r1", [played_out([0, 2, 1, 3]), played_out([1, 0, 2, 3])])
+
+    assert finish_order(game, 0) == [0, 2, 1, 3]
+    totals = resettle([(game, SEATS)], base_coins=10)
+
+    assert totals["u0"].rank == 3 and totals["u0"].coins == 30 - 10
+    assert totals["u1"].rank == 1 and totals["u1"].coins == -30 + 10
+    assert totals["u3"].hands == 2
+
+
+@mock_aws
+def test_resettle_script_sets_only_counters(game_tables):
+    """Test re-settled totals replace rank and coins of existing users only."""
+    _, users = game_tables
+    users.put_item(Item={"user_id": "u0", "username": "zhang", "rank": 99, "coins": 5})
+    resettle_script = load_script("resettle")
+
+    missing = resettle_script.write_totals(
+        users, {"u0": PlayerTotals(rank=3, coins=20, hands=2), "ghost": PlayerTotals(rank=1)}
+    )
+
+    assert missing == ["ghost"]
+    item = users.get_item(Key={"user_id": "u0"})["Item"]
+    assert (item["rank"], item["coins"], item["username"]) == (3, 20, "zhang")
+    assert "Item" not in users.get_item(Key={"user_id": "ghost"})
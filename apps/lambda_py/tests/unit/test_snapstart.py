@@ -0,0 +1,72 @@
+"""Unit tests for shared SnapStart hooks."""
+
+import random
+
+import boto3
+
+from shared import aws, snapstart
+
+
+def test_before_snapshot_runs_warmups(monkeypatch):
+    """Test registered warmups run before the snapshot."""
+    calls = []
+    monkeypatch.setattr(snapstart, "_warmups", [])
+    snapstart.register_warmup(lambda: calls.append("warm"))
+
+    snapstart.run_before_snapshot()
+
+    assert calls == ["warm"]
+
+
+def test_after_restore_reseeds_random(monkeypatch):
+    """Test restored environments do not continue the snapshot's PRNG sequence."""
+    monkeypatch.setattr(snapstart, "_clients", [])
+    monkeypatch.setattr(snapstart, "_refreshers", [])
+
+    random.seed(1234)
+    snapshot_state = random.getstate()
+    expected = random.random()
+
+    random.setstate(snapshot_state)
+    snapstart.run_after_restore()
+
+    assert random.random() != expected
+
+
+def test_after_restore_resets_connections_and_refreshes(monkeypatch):
+    """Test pooled connections are dropped and refresh hooks run after restore."""
+    closed = []
+    refreshed = []
+    client = boto3.client("dynamodb", region_name="us-east-1")
+    monkeypatch.setattr(client._endpoint.http_session, "close", lambda: closed.append(True))
+    monkeypatch.setattr(snapstart, "_clients", [])
+    monkeypatch.setattr(snapstart, "_refreshers", [])
+
+    snapstart.register_client(client)
+    snapstart.register_refresh(lambda: refreshed.append(True))
+    snapstart.run_after_restore()
+
+    assert closed == [True]
+    assert refreshed == [True]
+
+
+def test_user_handler_registers_warmup():
+    """Test the user handler's pydantic warmup is registered and runs."""
+    from functions.user.handler import warm_models
+
+    assert warm_models in snapstart._warmups
+    warm_models()
+
+
+def test_shared_modules_use_one_registered_resource():
+    """Test shared modules and handlers share the DynamoDB resource reset on restore."""
+    from functions.user import handler as user
+    from functions.ws import handler as ws
+    from shared import game_store, history, leaderboard
+
+    resource = aws.dynamodb()
+
+    assert resource is aws.dynamodb()
+    assert all(m.dynamodb is resource for m in (user, ws, game_store, history, leaderboard))
+    assert resource in snapstart._clients
+    assert history.s3 is aws.s3() and history.s3 in snapstart._clients
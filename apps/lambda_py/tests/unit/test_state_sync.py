@@ -0,0 +1,78 @@
+"""Unit tests for shared state-sync codec."""
+
+import pytest
+
+from shared.state_sync import KIND_DELTA, RoomSync, decode
+
+
+def make_room():
+    """Create a room with a hand in progress."""
+    room = RoomSync(room_id="room-1")
+    room.start_hand(turn=0)
+    room.record_play(0, bytes([3]), next_turn=1)
+    room.record_play(1, bytes([10, 62]), next_turn=2)
+    room.record_play(2, b"", next_turn=3)
+    return room
+
+
+def test_delta_contains_only_new_plays():
+    """Test a delta carries plays after the acknowledged version."""
+    room = make_room()
+    message = decode(room.encode_since(room.version - 2))
+
+    assert message.kind == KIND_DELTA
+    assert message.version == room.version
+    assert message.turn == 3
+    assert message.hand_counts == (26, 25, 27, 27)
+    assert [(play.seat, play.cards) for play in message.plays] == [
+        (1, bytes([10, 62])),
+        (2, b""),
+    ]
+
+
+def test_delta_when_up_to_date_is_empty():
+    """Test a client at the current version gets a header-only delta."""
+    room = make_room()
+    message = decode(room.encode_since(room.version))
+
+    assert not message.is_snapshot
+    assert message.plays == []
+
+
+@pytest.mark.parametrize("acked", [None, 0, 999])
+def test_snapshot_fallback(acked):
+    """Test unknown, stale or future versions fall back to a snapshot."""
+    room = make_room()
+    message = decode(room.encode_since(acked))
+
+    assert message.is_snapshot
+    assert len(message.plays) == 3
+
+
+def test_new_hand_invalidates_old_versions():
+    """Test versions from a previous hand require a snapshot."""
+    room = make_room()
+    old_version = room.version
+    room.start_hand(turn=2)
+
+    message = decode(room.encode_since(old_version))
+
+    assert message.is_snapshot
+    assert message.plays == []
+    assert message.hand_counts == (27, 27, 27, 27)
+
+
+def test_record_play_rejects_too_many_cards():
+    """Test a seat cannot play more cards than it holds."""
+    room = RoomSync(room_id="room-1")
+    room.start_hand(turn=0)
+
+    with pytest.raises(ValueError):
+        room.record_play(0, bytes(range(28)), next_turn=1)
+
+
+def test_decode_rejects_trailing_bytes():
+    """Test malformed messages are rejected."""
+    with pytest.raises(ValueError):
+        decode(make_room().encode_snapshot() + b"\x00")
+
@@ -3,6 +3,7 @@
 import json
 import os
 
+import boto3
 import pytest
 from moto import mock_aws
 
@@ -158,3 +159,62 @@ def test_method_not_allowed(lambda_context, dynamodb_table):
     assert response["statusCode"] == 405
     body = json.loads(response["body"])
     assert body["error"] == "Method not allowed"
+
+
+@mock_aws
+def test_get_user_not_modified(lambda_context, dynamodb_table):
+    """Test a matching If-None-Match returns 304 without a body."""
+    create_event = {
+        "httpMethod": "POST",
+        "path": "/users",
+        "headers": {},
+        "queryStringParameters": None,
+        "pathParameters": None,
+        "body": json.dumps({"username": "etaguser", "email": "etag@example.com"}),
+    }
+    user_id = json.loads(handler(create_event, lambda_context)["body"])["user_id"]
+
+    get_event = {
+        "httpMethod": "GET",
+        "path": f"/users/{user_id}",
+        "headers": {},
+        "queryStringParameters": None,
+        "pathParameters": {"userId": user_id},
+        "body": None,
+    }
+    first = handler(get_event, lambda_context)
+    etag = first["headers"]["ETag"]
+
+    get_event["headers"] = {"if-none-match": etag}
+    second = handler(get_event, lambda_context)
+
+    assert second["statusCode"] == 304
+    assert second["body"] == ""
+    assert second["headers"]["ETag"] == etag
+    assert "Cache-Control" in second["headers"]
+
+
+@mock_aws
+def test_table_follows_env_at_call_time(lambda_context, dynamodb_table, monkeypatch):
+    """Test the handler writes to whichever table USERS_TABLE_NAME names when called."""
+    other = boto3.resource("dynamodb", region_name="us-east-1").create_table(
+        TableName="Users-gw1",
+        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    monkeypatch.setenv("USERS_TABLE_NAME", "Users-gw1")
+    event = {
+        "httpMethod": "POST",
+        "path": "/users",
+        "headers": {},
+        "queryStringParameters": None,
+        "pathParameters": None,
+        "body": json.dumps({"username": "worker", "email": "worker@example.com"}),
+    }
+
+    response = handler(event, lambda_context)
+
+    assert response["statusCode"] == 201
+    assert other.scan(Select="COUNT")["Count"] == 1
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 0
@@ -0,0 +1,91 @@
+"""Unit tests for the SQS user batch Lambda function."""
+
+import json
+import os
+
+from moto import mock_aws
+
+os.environ["USERS_TABLE_NAME"] = "Users"
+
+from functions.user_batch import handler as batch
+
+
+def sqs_record(message_id, body):
+    """Build an SQS record."""
+    return {
+        "messageId": message_id,
+        "receiptHandle": f"handle-{message_id}",
+        "body": body if isinstance(body, str) else json.dumps(body),
+        "eventSource": "aws:sqs",
+    }
+
+
+@mock_aws
+def test_batch_creates_users(lambda_context, dynamodb_table):
+    """Test every valid record is stored and no failures are reported."""
+    records = [
+        sqs_record(f"m-{i}", {"username": f"user{i}", "email": f"user{i}@example.com"})
+        for i in range(30)
+    ]
+
+    response = batch.handler({"Records": records}, lambda_context)
+
+    assert response == {"batchItemFailures": []}
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 30
+
+
+@mock_aws
+def test_invalid_records_are_dropped_not_retried(lambda_context, dynamodb_table):
+    """Test validation failures are not reported for retry."""
+    records = [
+        sqs_record("ok", {"username": "good", "email": "good@example.com"}),
+        sqs_record("bad-email", {"username": "bad", "email": "not-an-email"}),
+        sqs_record("bad-json", "{"),
+    ]
+
+    response = batch.handler({"Records": records}, lambda_context)
+
+    assert response == {"batchItemFailures": []}
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 1
+
+
+@mock_aws
+def test_redelivery_keeps_the_stored_user(lambda_context, dynamodb_table):
+    """Test a redelivered message succeeds without overwriting the user."""
+    record = sqs_record("m-1", {"username": "once", "email": "once@example.com"})
+
+    batch.handler({"Records": [record]}, lambda_context)
+    (item,) = dynamodb_table.scan()["Items"]
+    dynamodb_table.update_item(
+        Key={"user_id": item["user_id"]},
+        UpdateExpression="SET coins = :coins",
+        ExpressionAttributeValues={":coins": 40},
+    )
+    response = batch.handler({"Records": [record]}, lambda_context)
+
+    assert response == {"batchItemFailures": []}
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 1
+    assert dynamodb_table.get_item(Key={"user_id": item["user_id"]})["Item"]["coins"] == 40
+    assert batch.write_user(("m-1", batch.parse_record(record))) == batch.DUPLICATE
+
+
+@mock_aws
+def test_write_failures_are_reported(lambda_context, dynamodb_table, monkeypatch):
+    """Test records whose write failed are returned as batchItemFailures."""
+    records = [
+        sqs_record(f"m-{i}", {"username": f"user{i}", "email": f"user{i}@example.com"})
+        for i in range(30)
+    ]
+    original = batch.write_user
+
+    def fail_from_25(record):
+        if int(record[0].split("-")[1]) >= 25:
+            return batch.FAILED
+        return original(record)
+
+    monkeypatch.setattr(batch, "write_user", fail_from_25)
+    response = batch.handler({"Records": records}, lambda_context)
+
+    failed = [failure["itemIdentifier"] for failure in response["batchItemFailures"]]
+    assert failed == [f"m-{i}" for i in range(25, 30)]
+    assert dynamodb_table.scan(Select="COUNT")["Count"] == 25
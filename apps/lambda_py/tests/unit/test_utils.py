@@ -0,0 +1,102 @@
+"""Unit tests for shared response utilities."""
+
+import base64
+import gzip
+import json
+
+from shared.utils import (
+    accepted_encodings,
+    create_response,
+    etag_matches,
+    negotiate_encoding,
+)
+
+LARGE_BODY = {"history": [{"seat": i % 4, "cards": list(range(20))} for i in range(100)]}
+
+
+def test_plain_response_unchanged():
+    """Test responses without a request event keep the original shape."""
+    response = create_response(200, {"ok": True})
+
+    assert response == {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json.dumps({"ok": True}),
+    }
+
+
+def test_etag_and_conditional_get():
+    """Test the body hash ETag and If-None-Match handling."""
+    first = create_response(200, {"name": "a"}, event={"headers": {}}, etag=True)
+    etag = first["headers"]["ETag"]
+
+    matching = {"headers": {"If-None-Match": f'W/{etag}, "other"'}}
+    not_modified = create_response(200, {"name": "a"}, event=matching, etag=True)
+    changed = create_response(200, {"name": "b"}, event=matching, etag=True)
+
+    assert not_modified["statusCode"] == 304
+    assert not_modified["body"] == ""
+    assert changed["statusCode"] == 200
+    assert changed["headers"]["ETag"] != etag
+
+
+def test_version_etag_and_cache_control():
+    """Test an ETag from a stored version is quoted and Cache-Control is set."""
+    response = create_response(200, {}, etag="v7", cache_control="private, max-age=60")
+
+    assert response["headers"]["ETag"] == '"v7"'
+    assert response["headers"]["Cache-Control"] == "private, max-age=60"
+
+
+def test_gzip_large_bodies_when_accepted():
+    """Test large bodies are gzip-encoded as base64."""
+    event = {"headers": {"accept-encoding": "gzip, deflate"}}
+    response = create_response(200, LARGE_BODY, event=event)
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(base64.b64decode(response["body"]))) == LARGE_BODY
+
+
+def test_etag_differs_per_coding():
+    """Test identity and gzip bodies carry distinct strong ETags and revalidate separately."""
+    gzipped = {"headers": {"Accept-Encoding": "gzip"}}
+    plain = {"headers": {"Accept-Encoding": "identity"}}
+    coded = create_response(200, LARGE_BODY, event=gzipped, etag=True)
+    identity = create_response(200, LARGE_BODY, event=plain, etag=True)
+    coded_tag = coded["headers"]["ETag"]
+
+    revalidated = create_response(
+        200, LARGE_BODY, event={"headers": {**gzipped["headers"], "If-None-Match": coded_tag}},
+        etag=True,
+    )
+    cross = create_response(
+        200, LARGE_BODY, event={"headers": {**plain["headers"], "If-None-Match": coded_tag}},
+        etag=True,
+    )
+
+    assert coded_tag == identity["headers"]["ETag"][:-1] + '-gzip"'
+    assert identity["headers"]["Vary"] == "Accept-Encoding"
+    assert revalidated["statusCode"] == 304
+    assert cross["statusCode"] == 200
+
+
+def test_no_compression_for_small_or_unaccepted():
+    """Test small bodies and clients without gzip get plain JSON."""
+    small = create_response(200, {"ok": True}, event={"headers": {"Accept-Encoding": "gzip"}})
+    refused = create_response(200, LARGE_BODY, event={"headers": {"Accept-Encoding": "gzip;q=0"}})
+
+    assert "isBase64Encoded" not in small
+    assert "isBase64Encoded" not in refused
+    assert json.loads(refused["body"]) == LARGE_BODY
+
+
+def test_header_parsing():
+    """Test Accept-Encoding qualities and If-None-Match wildcards."""
+    assert accepted_encodings("br;q=0.5, gzip;q=0, identity") == ["br", "identity"]
+    assert negotiate_encoding("gzip;q=0, *") in (None, "br")
+    assert negotiate_encoding("br;q=0, gzip;q=0, *") is None
+    assert negotiate_encoding("br;q=0, *") == "gzip"
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,110 @@
+"""Unit tests for shared warmup short-circuit."""
+
+import importlib
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared import snapstart, warmup
+
+
+@pytest.fixture
+def fresh_warmup(monkeypatch):
+    """Reset warmup state and the snapstart warmup registry."""
+    monkeypatch.setattr(warmup, "_warmed", False)
+    monkeypatch.setattr(warmup, "_invoked", False)
+    monkeypatch.setattr(warmup, "_init_timings", {})
+    monkeypatch.setattr(snapstart, "_warmups", [])
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"warmup": True},
+        {"source": "aws.events", "detail-type": "Scheduled Event"},
+        {"httpMethod": "GET", "path": "/health"},
+        {"httpMethod": "GET", "path": "/warmup"},
+    ],
+)
+def test_is_warmup_event(event):
+    """Test keep-warm pings and health checks are recognized."""
+    assert warmup.is_warmup_event(event)
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"httpMethod": "GET", "path": "/hello"},
+        {"httpMethod": "POST", "path": "/health"},
+        {"warmup": "yes"},
+        None,
+    ],
+)
+def test_is_not_warmup_event(event):
+    """Test ordinary requests are passed through."""
+    assert not warmup.is_warmup_event(event)
+
+
+def test_warmup_runs_hooks_once(fresh_warmup):
+    """Test registered warmups run on the first warmup only."""
+    calls = []
+    snapstart.register_warmup(lambda: calls.append("warm"))
+
+    first = warmup.warm()
+    second = warmup.warm()
+
+    assert calls == ["warm"]
+    assert first["firstWarmup"] is True
+    assert second["firstWarmup"] is False
+
+
+def test_warmup_handler_short_circuits(fresh_warmup):
+    """Test warmup events never reach the wrapped handler."""
+    inner = MagicMock(return_value={"statusCode": 204})
+    wrapped = warmup.warmup_handler(inner)
+
+    response = wrapped({"warmup": True}, None)
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body["warm"] is True
+    inner.assert_not_called()
+
+    assert wrapped({"httpMethod": "GET", "path": "/hello"}, None) == {"statusCode": 204}
+
+
+def test_hello_handler_reports_init_timings(fresh_warmup, monkeypatch):
+    """Test the hello handler answers a health check without a Lambda context."""
+    monkeypatch.delitem(sys.modules, "functions.hello.handler", raising=False)
+    handler = importlib.import_module("functions.hello.handler").handler
+
+    response = handler({"httpMethod": "GET", "path": "/health"}, None)
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert "importsMs" in body["initTimings"]
+    assert "clientsMs" in body["initTimings"]
+
+
+def test_marks_after_first_invocation_are_ignored(fresh_warmup):
+    """Test a handler module imported lazily after the first request keeps earlier marks."""
+    warmup.mark("imports")
+    recorded = dict(warmup._init_timings)
+
+    warmup.warmup_handler(MagicMock())({"httpMethod": "GET", "path": "/hello"}, None)
+    warmup.mark("imports")
+
+    assert warmup._init_timings == recorded
+
+
+def test_app_warmup_preloads_mounted_handlers(fresh_warmup):
+    """Test warming the app imports every mounted handler."""
+    from functions.app import handler as app
+
+    snapstart.register_warmup(app.router.preload)
+    app.handler({"warmup": True}, None)
+
+    loaded = app.router.resolve("GET", "/users/abc")[0]
+    assert loaded._handler is not None
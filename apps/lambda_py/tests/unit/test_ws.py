@@ -0,0 +1,158 @@
+"""Unit tests for WebSocket Lambda function."""
+
+import json
+import os
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+# Set environment variable before importing handler
+os.environ["CONNECTIONS_TABLE_NAME"] = "Connections"
+
+from functions.ws import handler as ws_handler
+from functions.ws.handler import handler
+
+ENDPOINT = "https://example.execute-api.us-east-1.amazonaws.com/test"
+
+
+class StubManagementClient:
+    """Records posts and raises GoneException for stale connections."""
+
+    def __init__(self, gone=()):
+        self.gone = set(gone)
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def post_to_connection(self, ConnectionId, Data):  # noqa: N803
+        if ConnectionId in self.gone:
+            raise ClientError(
+                {"Error": {"Code": "GoneException", "Message": "Gone"}},
+                "PostToConnection",
+            )
+        with self._lock:
+            self.posts.append((ConnectionId, Data))
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    """Install a stub management client for the test endpoint."""
+    client = StubManagementClient(gone={"conn-gone"})
+    monkeypatch.setitem(ws_handler._management_clients, ENDPOINT, client)
+    monkeypatch.setenv("WEBSOCKET_ENDPOINT", ENDPOINT)
+    return client
+
+
+def ws_event(route_key, connection_id, query=None, body=None):
+    """Build an API Gateway WebSocket event."""
+    return {
+        "requestContext": {
+            "routeKey": route_key,
+            "connectionId": connection_id,
+            "domainName": "example.execute-api.us-east-1.amazonaws.com",
+            "stage": "test",
+        },
+        "queryStringParameters": query,
+        "body": json.dumps(body) if body is not None else None,
+    }
+
+
+@mock_aws
+def test_connect_and_disconnect(lambda_context, connections_table):
+    """Test connections are stored on connect and removed on disconnect."""
+    event = ws_event("$connect", "conn-1", {"roomId": "room-1", "seat": "0"})
+    response = handler(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    item = connections_table.get_item(Key={"connection_id": "conn-1"})["Item"]
+    assert item["room_id"] == "room-1"
+    assert item["role"] == "player"
+
+    response = handler(ws_event("$disconnect", "conn-1"), lambda_context)
+
+    assert response["statusCode"] == 200
+    assert "Item" not in connections_table.get_item(Key={"connection_id": "conn-1"})
+
+
+@mock_aws
+def test_connect_missing_room(lambda_context, connections_table):
+    """Test connecting without a room ID is rejected."""
+    response = handler(ws_event("$connect", "conn-1"), lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+@mock_aws
+def test_broadcast_fans_out_and_prunes_gone(lambda_context, connections_table, stub_client):
+    """Test broadcast reaches seats and spectators and prunes gone connections."""
+    for seat in range(4):
+        handler(
+            ws_event("$connect", f"conn-{seat}", {"roomId": "room-1", "seat": str(seat)}),
+            lambda_context,
+        )
+    handler(ws_event("$connect", "conn-spectator", {"roomId": "room-1"}), lambda_context)
+    handler(ws_event("$connect", "conn-gone", {"roomId": "room-1"}), lambda_context)
+    handler(ws_event("$connect", "conn-other", {"roomId": "room-2"}), lambda_context)
+
+    event = ws_event(
+        "sync", "conn-0", body={"action": "broadcast", "roomId": "room-1", "state": {"turn": 2}}
+    )
+    response = handler(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"sent": 5, "gone": 1, "failed": 0}
+    recipients = {connection_id for connection_id, _ in stub_client.posts}
+    assert recipients == {"conn-0", "conn-1", "conn-2", "conn-3", "conn-spectator"}
+    assert all(json.loads(data) == {"turn": 2} for _, data in stub_client.posts)
+    assert "Item" not in connections_table.get_item(Key={"connection_id": "conn-gone"})
+
+
+@mock_aws
+def test_broadcast_is_limited_to_senders_room(lambda_context, connections_table, stub_client):
+    """Test only a player seated in the room can broadcast to it."""
+    handler(ws_event("$connect", "conn-0", {"roomId": "room-1", "seat": "0"}), lambda_context)
+    handler(ws_event("$connect", "conn-watch", {"roomId": "room-2"}), lambda_context)
+    handler(ws_event("$connect", "conn-victim", {"roomId": "room-2", "seat": "1"}), lambda_context)
+
+    responses = [
+        handler(
+            ws_event(
+                "sync", sender, body={"action": "broadcast", "roomId": "room-2", "state": {}}
+            ),
+            lambda_context,
+        )
+        for sender in ("conn-0", "conn-watch", "conn-unknown")
+    ]
+
+    assert [response["statusCode"] for response in responses] == [403] * 3
+    assert stub_client.posts == []
+
+
+@pytest.mark.parametrize("seat", ["north", "4", "-1"])
+@mock_aws
+def test_connect_invalid_seat(lambda_context, connections_table, seat):
+    """Test a seat that is not a table index is rejected without storing the connection."""
+    response = handler(
+        ws_event("$connect", "conn-1", {"roomId": "room-1", "seat": seat}), lambda_context
+    )
+
+    assert response["statusCode"] == 400
+    assert "Item" not in connections_table.get_item(Key={"connection_id": "conn-1"})
+
+
+@mock_aws
+def test_invalid_message(lambda_context, connections_table):
+    """Test messages without a broadcast action are rejected."""
+    response = handler(ws_event("$default", "conn-1", body={"action": "noop"}), lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+def test_management_client_is_reused():
+    """Test one management client is kept per endpoint."""
+    url = "https://reuse.example.com/prod"
+    try:
+        assert ws_handler.get_management_client(url) is ws_handler.get_management_client(url)
+    finally:
+        ws_handler._management_clients.pop(url, None)